@@ -10,6 +10,7 @@ from optimise.routing.constants import translate
 from datetime import timedelta
 from optimise.routing.core.parallel_routing import ParallelRoutingOptimizer
 from optimise.routing.defaults import USE_NEW_SOLVER
+from optimise.utils.retry_budget import budget_scope, current_budget, job_budget
 import logging
 import backoff
 
@@ -79,8 +80,20 @@ def get_optimization_instances(solution_routing: SolutionRouting):
 
     return get_optimisation_instances(request), errors
 
-@backoff.on_exception(backoff.expo, Exception, max_tries=5)
 def get_optimal_routes(solution_routing: SolutionRouting):
+    # one budget for every attempt, so pipeline retries cannot outlast the job
+    with budget_scope(job_budget()):
+        return _get_optimal_routes(solution_routing)
+
+
+@backoff.on_exception(
+    backoff.expo,
+    Exception,
+    max_tries=5,
+    max_time=lambda: current_budget().remaining(),
+    giveup=lambda e: not current_budget().retry(),
+)
+def _get_optimal_routes(solution_routing: SolutionRouting):
 
     instances, errors=get_optimization_instances(solution_routing)
     logger.info("getting instances.....OK")
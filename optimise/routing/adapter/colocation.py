@@ -0,0 +1,157 @@
+from dataclasses import dataclass, replace
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from optimise.routing.adapter.presolve import _select_nodes
+from optimise.routing.input.solver_input import SolverInput
+
+
+@dataclass(frozen=True)
+class MergeResult:
+    """
+    Outcome of the co-located order aggregation. ``solver_input`` has one node
+    per group; ``members[i]`` lists the original nodes node ``i`` stands for,
+    in the order they are visited.
+    """
+
+    solver_input: SolverInput
+    members: List[List[int]]
+
+    @property
+    def is_reduced(self) -> bool:
+        return any(len(nodes) > 1 for nodes in self.members)
+
+    def expand_routes(self, routes: Sequence[Sequence[int]]) -> List[List[int]]:
+        return [[member for node in route for member in self.members[node]] for route in routes]
+
+    def expand_tours(
+        self, tours: Sequence[Sequence[Tuple[int, int]]], service_durations: Sequence[int]
+    ) -> List[List[Tuple[int, int]]]:
+        """
+        Tours on the original nodes: the members of a merged node are served
+        back to back from its visit time, ``service_durations`` being those of
+        the original nodes.
+        """
+        expanded = []
+        for tour in tours:
+            stops = []
+            for node, time in tour:
+                for member in self.members[node]:
+                    stops.append((member, time))
+                    time += service_durations[member] if member < len(service_durations) else 0
+            expanded.append(stops)
+        return expanded
+
+
+def _unmerged(solver_input: SolverInput) -> MergeResult:
+    size = len(solver_input.time_matrix)
+    return MergeResult(solver_input=solver_input, members=[[node] for node in range(size)])
+
+
+def merge_colocated_nodes(solver_input: SolverInput) -> MergeResult:
+    """
+    Merge orders at the same location into a single node.
+
+    Orders are co-located when their rows and columns of the travel matrices
+    are identical and the travel between them is zero. They are merged when
+    they share the same allowed vehicles and their windows intersect widely
+    enough for the summed service: serving the members back to back from any
+    start time in the intersected window then meets every member's own window,
+    so routes found on the merged model load back on the original one.
+    Orders in a precedence constraint or with a preferred window are kept
+    apart, and nothing is merged when the load is distributed by stop count.
+    """
+    size = len(solver_input.time_matrix)
+    if size == 0 or not solver_input.time_windows or solver_input.distribute_load:
+        return _unmerged(solver_input)
+
+    depots = set(solver_input.starts) | set(solver_input.ends)
+    linked = {node for edge in solver_input.precedence_constraints for node in edge}
+    soft_windows = solver_input.soft_time_windows or []
+    time_matrix = np.asarray(solver_input.time_matrix)
+    distance_matrix = np.asarray(solver_input.distance_matrix)
+
+    locations: Dict[Tuple, List[int]] = {}
+    for node in range(size):
+        if node in depots or node in linked:
+            continue
+        if node < len(soft_windows) and soft_windows[node]:
+            continue
+        vehicles = solver_input.allowed_vehicles_by_node.get(node)
+        key = (
+            time_matrix[node].tobytes(),
+            time_matrix[:, node].tobytes(),
+            distance_matrix[node].tobytes(),
+            distance_matrix[:, node].tobytes(),
+            None if vehicles is None else tuple(sorted(vehicles)),
+        )
+        locations.setdefault(key, []).append(node)
+
+    tolerance = int(solver_input.time_window_tolerance)
+    service = list(solver_input.service_durations)
+    windows = list(solver_input.time_windows)
+    merged_into: Dict[int, List[int]] = {}
+    for nodes in locations.values():
+        if len(nodes) < 2:
+            continue
+        group: List[int] = []
+        start = end = total = 0
+        for node in sorted(nodes, key=lambda n: (windows[n][0], windows[n][1], n)):
+            node_start, node_end = windows[node]
+            node_service = service[node] if node < len(service) else 0
+            if group and max(start, node_start) <= min(end, node_end) - (total + node_service) + tolerance:
+                group.append(node)
+                start, end, total = max(start, node_start), min(end, node_end), total + node_service
+                continue
+            if len(group) > 1:
+                merged_into[group[0]] = group
+            group, start, end, total = [node], node_start, node_end, node_service
+        if len(group) > 1:
+            merged_into[group[0]] = group
+
+    if not merged_into:
+        return _unmerged(solver_input)
+
+    num_depots = solver_input.num_depots
+    if num_depots is None:
+        num_depots = len(set(solver_input.starts)) if solver_input.starts else 1
+    penalties = list(solver_input.penalties or [])
+    priorities = dict(solver_input.location_priorities)
+    absorbed = set()
+    for head, group in merged_into.items():
+        absorbed.update(group[1:])
+        windows[head] = (
+            max(windows[node][0] for node in group),
+            min(windows[node][1] for node in group),
+        )
+        service[head] = sum(service[node] for node in group if node < len(service))
+        if 0 <= head - num_depots < len(penalties):
+            penalties[head - num_depots] = sum(
+                penalties[node - num_depots]
+                for node in group
+                if 0 <= node - num_depots < len(penalties)
+            )
+        group_priorities = [priorities[node] for node in group if node in priorities]
+        if group_priorities:
+            priorities[head] = min(group_priorities)
+
+    kept_nodes = [node for node in range(size) if node not in absorbed]
+    merged = _select_nodes(
+        replace(
+            solver_input,
+            time_windows=windows,
+            service_durations=service,
+            penalties=penalties,
+            location_priorities=[
+                (node, priorities[node])
+                for node, _priority in solver_input.location_priorities
+                if node not in absorbed
+            ],
+        ),
+        kept_nodes,
+    )
+    return MergeResult(
+        solver_input=merged,
+        members=[merged_into.get(node, [node]) for node in kept_nodes],
+    )
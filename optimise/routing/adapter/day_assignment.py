@@ -0,0 +1,187 @@
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from optimise.routing.defaults import DAY_ASSIGNMENT_UTILISATION
+
+# Orders without a usable priority rank with the least important ones.
+LOWEST_PRIORITY = 5
+
+
+@dataclass(frozen=True)
+class DayPlan:
+    """
+    Outcome of the order-to-day assignment. ``days[order_id]`` is the day
+    offset an order is first routed on; orders missing from it (no worker
+    with their skill on a common day) stay eligible on every day of their
+    window. ``load`` and ``capacity`` hold the planned and available working time
+    per day offset and skill, in routing time units.
+    """
+
+    days: Dict[str, int] = field(default_factory=dict)
+    load: List[Dict[str, float]] = field(default_factory=list)
+    capacity: List[Dict[str, float]] = field(default_factory=list)
+
+
+def _priority(work_order: Any) -> int:
+    try:
+        return int(work_order.priority)
+    except (TypeError, ValueError):
+        return LOWEST_PRIORITY
+
+
+def _available_time(worker: Any, day_length: int) -> float:
+    # get_schedule lists the shift bounds, pause and blocked times of the day
+    blocked = sum(
+        duration for _start, duration, optional in worker.get_schedule() if not optional
+    )
+    return float(max(day_length - blocked, 0))
+
+
+def _start_coordinate(instance: Any, worker: Any) -> Optional[Tuple[float, float]]:
+    if instance.start_at == "home":
+        return worker.latitude, worker.longitude
+    if worker.depot:
+        return worker.depot["latitude"], worker.depot["longitude"]
+    return None
+
+
+def _dependency_groups(instance: Any, order_ids: List[str]) -> List[List[str]]:
+    # precedence ties orders to the same vehicle, hence to the same day
+    parent = {order_id: order_id for order_id in order_ids}
+
+    def find(order_id: str) -> str:
+        while parent[order_id] != order_id:
+            parent[order_id] = parent[parent[order_id]]
+            order_id = parent[order_id]
+        return order_id
+
+    for dependency in getattr(instance, "task_dependencies", None) or []:
+        before = str(dependency.get("task_id"))
+        for after in dependency.get("must_be_before") or []:
+            after = str(after)
+            if before in parent and after in parent:
+                parent[find(after)] = find(before)
+
+    groups: Dict[str, List[str]] = {}
+    for order_id in order_ids:
+        groups.setdefault(find(order_id), []).append(order_id)
+    return list(groups.values())
+
+
+def assign_orders_to_days(instance: Any) -> DayPlan:
+    """
+    Assign the pending orders of a multi-day horizon to days before routing.
+
+    Capacity of a (day, skill) pair is the working time of the workers on
+    shift that day with that skill, net of breaks and blocked times, scaled
+    by ``DAY_ASSIGNMENT_UTILISATION``. Orders are placed greedily, the least
+    flexible (fewest eligible days) and most important first. An order costs
+    its service time plus the travel from the nearest worker start or order
+    already placed on the same day and skill; among the days where it fits,
+    the one minimising that travel, the resulting utilisation and (for
+    important orders) the delay is chosen; when none has room left, the least
+    loaded day is. Orders linked by a task dependency are placed together.
+    """
+    horizon = instance.optimization_horizon or 1
+    dates = [instance.period_start + timedelta(days=day_i) for day_i in range(horizon)]
+    day_length = instance.horizon + 1
+
+    capacity: List[Dict[str, float]] = [{} for _ in dates]
+    starts: List[Dict[str, List[Tuple[float, float]]]] = [{} for _ in dates]
+    eligible_days: Dict[str, List[int]] = {}
+    orders: Dict[str, Any] = {}
+    current_date = instance.current_optimization_date
+    try:
+        for day_i, date in enumerate(dates):
+            instance.current_optimization_date = date
+            for worker in instance.workers:
+                available = _available_time(worker, day_length) * DAY_ASSIGNMENT_UTILISATION
+                coordinate = _start_coordinate(instance, worker)
+                for skill in worker.skills:
+                    capacity[day_i][skill] = capacity[day_i].get(skill, 0.0) + available
+                    if coordinate is not None:
+                        starts[day_i].setdefault(skill, []).append(coordinate)
+            for wo in instance._work_orders:
+                if wo.latitude is None or wo.longitude is None:
+                    continue
+                if wo.is_eligible and capacity[day_i].get(wo.skill, 0.0) > 0:
+                    orders[str(wo.id)] = wo
+                    eligible_days.setdefault(str(wo.id), []).append(day_i)
+    finally:
+        instance.current_optimization_date = current_date
+
+    load: List[Dict[str, float]] = [dict.fromkeys(day, 0.0) for day in capacity]
+    if not orders:
+        return DayPlan(load=load, capacity=capacity)
+
+    order_ids = list(orders)
+    position = {order_id: i for i, order_id in enumerate(order_ids)}
+    start_coordinates = sorted({c for day in starts for cs in day.values() for c in cs})
+    start_position = {c: len(order_ids) + i for i, c in enumerate(start_coordinates)}
+    coordinates = [(orders[o].latitude, orders[o].longitude) for o in order_ids] + start_coordinates
+    travel = np.asarray(instance.travel_times(coordinates), dtype=float)
+    # a detour is approximated by the round trip to the nearest anchor, halved
+    round_trip = (travel + travel.T) / 2.0
+    durations = np.array([float(orders[o].work_order_duration or 0) for o in order_ids])
+    reference = float(durations.mean()) if durations.size and durations.mean() > 0 else 1.0
+
+    # nearest[(day, skill)][i]: distance from order i to the closest anchor
+    nearest: Dict[Tuple[int, str], np.ndarray] = {}
+    for day_i, by_skill in enumerate(starts):
+        for skill, skill_starts in by_skill.items():
+            rows = [start_position[c] for c in skill_starts]
+            nearest[(day_i, skill)] = round_trip[rows, : len(order_ids)].min(axis=0)
+
+    groups = []
+    for members in _dependency_groups(instance, order_ids):
+        days = set(eligible_days[members[0]])
+        for member in members[1:]:
+            days &= set(eligible_days[member])
+        if days:
+            groups.append((members, sorted(days)))
+    groups.sort(
+        key=lambda group: (
+            len(group[1]),
+            min(_priority(orders[o]) for o in group[0]),
+            -sum(durations[position[o]] for o in group[0]),
+        )
+    )
+
+    planned: Dict[str, int] = {}
+    for members, days in groups:
+        urgency = max(LOWEST_PRIORITY - min(_priority(orders[o]) for o in members), 0)
+        indices = [position[o] for o in members]
+        skills = {orders[o].skill for o in members}
+        best: Optional[Tuple[bool, float, int, float]] = None
+        for day_i in days:
+            detour = sum(
+                float(nearest[(day_i, orders[o].skill)][position[o]])
+                if (day_i, orders[o].skill) in nearest
+                else 0.0
+                for o in members
+            )
+            demand = float(durations[indices].sum()) + detour
+            utilisation = max(
+                (load[day_i][skill] + demand) / capacity[day_i][skill] for skill in skills
+            )
+            overbooked = utilisation > 1.0
+            # when no day has room left, the least loaded day takes the order
+            if overbooked:
+                score = utilisation
+            else:
+                score = detour + reference * (utilisation + urgency * day_i / horizon)
+            if best is None or (overbooked, score) < best[:2]:
+                best = (overbooked, score, day_i, demand)
+        _overbooked, _score, day_i, demand = best
+        for o in members:
+            planned[o] = day_i
+            skill = orders[o].skill
+            load[day_i][skill] += demand / len(members)
+            key = (day_i, skill)
+            row = round_trip[position[o], : len(order_ids)]
+            nearest[key] = np.minimum(nearest[key], row) if key in nearest else row.copy()
+
+    return DayPlan(days=planned, load=load, capacity=capacity)
@@ -85,6 +85,23 @@ def instance_to_solver_input(instance: Any) -> SolverInput:
                     node = idx + num_depots
                     allowed_vehicles_by_node[node] = allowed_indices
 
+    if getattr(instance, "restrict_vehicles_by_skill", False):
+        if hasattr(instance, "work_orders") and hasattr(instance, "workers"):
+            workers = instance.workers
+            vehicles_by_skill: dict[str, list[int]] = {}
+            for idx, worker in enumerate(workers):
+                for skill in worker.skills:
+                    vehicles_by_skill.setdefault(skill, []).append(idx)
+            num_depots = getattr(instance, "nb_depots", len(set(instance.starts)) if instance.starts else 1)
+            for idx, wo in enumerate(instance.work_orders):
+                skilled = vehicles_by_skill.get(wo.skill, [])
+                if len(skilled) == len(workers):
+                    continue
+                node = idx + num_depots
+                if node in allowed_vehicles_by_node:
+                    skilled = [v for v in allowed_vehicles_by_node[node] if v in skilled]
+                allowed_vehicles_by_node[node] = skilled
+
     return SolverInput(
         time_matrix=instance.time_matrix,
         distance_matrix=instance.distance_matrix,
@@ -116,6 +133,14 @@ def instance_to_solver_input(instance: Any) -> SolverInput:
         local_search_metaheuristic=getattr(instance, "local_search_metaheuristic", None),
         time_limit_seconds=getattr(instance, "time_limit", None),
         no_improvement_limit=getattr(instance, "no_improvement_limit", None),
+        optimality_gap=getattr(instance, "optimality_gap", None),
+        # alternatives of a multi-day horizon would depend on the other days' choices
+        alternatives=(
+            int(getattr(instance, "alternatives", 0) or 0)
+            if (getattr(instance, "optimization_horizon", None) or 1) <= 1
+            else 0
+        ),
+        solver_backend=getattr(instance, "solver_backend", None),
         objective=getattr(instance, "optimization_target", None),
         num_depots=getattr(instance, "nb_depots", None),
         vehicle_penalty=getattr(instance, "vehicle_penalty", None),
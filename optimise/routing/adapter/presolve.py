@@ -0,0 +1,260 @@
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from optimise.routing.input.solver_input import SolverInput
+
+# Drop reasons, also used as translation keys in optimise.routing.constants.
+WINDOW_SHORTER_THAN_SERVICE = "PRESOLVE_WINDOW_SHORTER_THAN_SERVICE"
+NO_ELIGIBLE_WORKER = "PRESOLVE_NO_ELIGIBLE_WORKER"
+UNREACHABLE_IN_SHIFT = "PRESOLVE_UNREACHABLE_IN_SHIFT"
+CYCLIC_DEPENDENCY = "PRESOLVE_CYCLIC_DEPENDENCY"
+NO_COMMON_WORKER_FOR_DEPENDENCY = "PRESOLVE_NO_COMMON_WORKER_FOR_DEPENDENCY"
+DEPENDS_ON_DROPPED_TASK = "PRESOLVE_DEPENDS_ON_DROPPED_TASK"
+
+
+@dataclass(frozen=True)
+class DroppedNode:
+    node: int
+    reason: str
+
+
+@dataclass(frozen=True)
+class PresolveResult:
+    """
+    Outcome of the pre-solve analysis. ``solver_input`` only contains the kept
+    nodes; ``kept_nodes[i]`` is the original node index of node ``i``.
+    """
+
+    solver_input: SolverInput
+    kept_nodes: List[int]
+    dropped: List[DroppedNode] = field(default_factory=list)
+
+    def expand_routes(self, routes: Sequence[Sequence[int]]) -> List[List[int]]:
+        return [[self.kept_nodes[node] for node in route] for route in routes]
+
+    def expand_tours(
+        self, tours: Sequence[Sequence[Tuple[int, int]]]
+    ) -> List[List[Tuple[int, int]]]:
+        return [[(self.kept_nodes[node], time) for node, time in tour] for tour in tours]
+
+    def dropped_penalty(self, solver_input: SolverInput) -> int:
+        """
+        Drop penalties of the dropped orders in the original ``solver_input``:
+        what they add to the objective of a solution of the pruned problem.
+        """
+        num_depots = _num_depots(solver_input)
+        penalties = solver_input.penalties or []
+        return sum(
+            penalties[item.node - num_depots]
+            for item in self.dropped
+            if 0 <= item.node - num_depots < len(penalties)
+        )
+
+
+def _shift_bounds(solver_input: SolverInput, horizon: float) -> Tuple[np.ndarray, np.ndarray]:
+    # BreaksConstraint blocks the time before the shift and after it with
+    # mandatory breaks; service cannot overlap them.
+    day_end = solver_input.break_day_end if solver_input.break_day_end is not None else horizon
+    shift_start = np.zeros(solver_input.num_vehicles)
+    shift_end = np.full(solver_input.num_vehicles, float(horizon))
+    for vehicle, vehicle_breaks in enumerate(solver_input.breaks[: solver_input.num_vehicles]):
+        for item in vehicle_breaks:
+            start = item[0]
+            duration = item[1] if len(item) > 1 else 0
+            optional = item[2] if len(item) > 2 else True
+            if optional or duration <= 0:
+                continue
+            if start == 0:
+                shift_start[vehicle] = max(shift_start[vehicle], duration)
+            elif start + duration >= day_end:
+                shift_end[vehicle] = min(shift_end[vehicle], start)
+    return shift_start, shift_end
+
+
+def _cyclic_nodes(edges: List[Tuple[int, int]]) -> Set[int]:
+    # Strip sources then sinks: what remains lies on (or between) cycles.
+    remaining = set(edges)
+    changed = True
+    while changed and remaining:
+        changed = False
+        targets = {after for _, after in remaining}
+        sources = {before for before, _ in remaining}
+        pruned = {(b, a) for b, a in remaining if b not in targets or a not in sources}
+        if pruned:
+            remaining -= pruned
+            changed = True
+    return {node for edge in remaining for node in edge}
+
+
+def presolve_solver_input(solver_input: SolverInput) -> PresolveResult:
+    """
+    Remove orders that provably cannot be served and tighten the time windows
+    of the others using travel times from/to the depots.
+
+    Checks are necessary conditions of the model built by OrtoolsRoutingBuilder:
+    the service must fit in the order window (plus tolerance), at least one
+    allowed vehicle must be able to reach the order and come back within the
+    horizon and its shift, and ``precedence_constraints`` (same vehicle, ordered
+    cumuls) must be acyclic and satisfiable by a common vehicle. Dropping a
+    node also drops every node linked to it by a precedence constraint.
+    """
+    size = len(solver_input.time_matrix)
+    depots = set(solver_input.starts) | set(solver_input.ends)
+    orders = np.array([node for node in range(size) if node not in depots], dtype=np.int64)
+    if orders.size == 0 or not solver_input.time_windows or solver_input.num_vehicles <= 0:
+        return PresolveResult(solver_input=solver_input, kept_nodes=list(range(size)))
+
+    horizon = float(solver_input.horizon) if solver_input.horizon else np.inf
+    time_matrix = np.asarray(solver_input.time_matrix, dtype=float)
+    service = np.zeros(size)
+    durations = np.asarray(solver_input.service_durations[:size], dtype=float)
+    service[: len(durations)] = durations
+    windows = np.asarray(solver_input.time_windows, dtype=float)
+    starts = np.asarray(solver_input.starts, dtype=np.int64)
+    ends = np.asarray(solver_input.ends or solver_input.starts, dtype=np.int64)
+    tolerance = float(solver_input.time_window_tolerance)
+    break_tolerance = float(solver_input.break_time_tolerance)
+
+    window_start = windows[orders, 0]
+    latest = windows[orders, 1] - service[orders] + tolerance
+    order_service = service[orders]
+    reasons: Dict[int, str] = {}
+
+    for node in orders[window_start > latest]:
+        reasons[int(node)] = WINDOW_SHORTER_THAN_SERVICE
+
+    # vehicles x orders
+    allowed = np.ones((solver_input.num_vehicles, orders.size), dtype=bool)
+    for position, node in enumerate(orders):
+        vehicles = solver_input.allowed_vehicles_by_node.get(int(node))
+        if vehicles is not None:
+            allowed[:, position] = False
+            valid = [v for v in vehicles if 0 <= v < solver_input.num_vehicles]
+            allowed[valid, position] = True
+            if not valid:
+                reasons.setdefault(int(node), NO_ELIGIBLE_WORKER)
+
+    travel_in = time_matrix[np.ix_(starts, orders)]
+    travel_out = time_matrix[np.ix_(orders, ends)].T
+    arrival = np.maximum(window_start[None, :], travel_in)
+    latest_service = np.minimum(latest[None, :], horizon - order_service[None, :] - travel_out)
+    reachable = arrival <= latest_service
+
+    shift_start, shift_end = _shift_bounds(solver_input, horizon)
+    in_shift = np.maximum(arrival, shift_start[:, None] - break_tolerance) <= np.minimum(
+        latest_service, shift_end[:, None] + break_tolerance - order_service[None, :]
+    )
+    before_shift = arrival + order_service[None, :] <= break_tolerance
+    feasible = allowed & reachable & (in_shift | before_shift)
+
+    for position in np.flatnonzero(~feasible.any(axis=0)):
+        reasons.setdefault(int(orders[position]), UNREACHABLE_IN_SHIFT)
+
+    position_of = {int(node): position for position, node in enumerate(orders)}
+    edges = [
+        (before, after)
+        for before, after in solver_input.precedence_constraints
+        if before in position_of and after in position_of
+    ]
+    for node in _cyclic_nodes(edges):
+        reasons.setdefault(node, CYCLIC_DEPENDENCY)
+    for before, after in edges:
+        if not (feasible[:, position_of[before]] & feasible[:, position_of[after]]).any():
+            reasons.setdefault(before, NO_COMMON_WORKER_FOR_DEPENDENCY)
+            reasons.setdefault(after, NO_COMMON_WORKER_FOR_DEPENDENCY)
+
+    # Precedence ties both nodes to the same vehicle, so a dropped node forces
+    # the nodes it is linked to out as well.
+    neighbours: Dict[int, List[int]] = {}
+    for before, after in edges:
+        neighbours.setdefault(before, []).append(after)
+        neighbours.setdefault(after, []).append(before)
+    pending = list(reasons)
+    while pending:
+        node = pending.pop()
+        for other in neighbours.get(node, []):
+            if other not in reasons:
+                reasons[other] = DEPENDS_ON_DROPPED_TASK
+                pending.append(other)
+
+    tightened_start = np.where(feasible, arrival, np.inf).min(axis=0)
+    tightened_latest = np.where(feasible, latest_service, -np.inf).max(axis=0)
+    time_windows = list(solver_input.time_windows)
+    for position, node in enumerate(orders):
+        if int(node) in reasons:
+            continue
+        start = int(np.ceil(tightened_start[position]))
+        end = int(np.floor(tightened_latest[position] + order_service[position] - tolerance))
+        time_windows[node] = (max(int(windows[node, 0]), start), min(int(windows[node, 1]), end))
+
+    kept_nodes = [node for node in range(size) if node not in reasons]
+    dropped = [DroppedNode(node=node, reason=reason) for node, reason in sorted(reasons.items())]
+    pruned = _select_nodes(replace(solver_input, time_windows=time_windows), kept_nodes)
+    return PresolveResult(solver_input=pruned, kept_nodes=kept_nodes, dropped=dropped)
+
+
+def _num_depots(solver_input: SolverInput) -> int:
+    if solver_input.num_depots is not None:
+        return solver_input.num_depots
+    return len(set(solver_input.starts)) if solver_input.starts else 1
+
+
+def _select_nodes(solver_input: SolverInput, kept_nodes: List[int]) -> SolverInput:
+    size = len(solver_input.time_matrix)
+    if len(kept_nodes) == size:
+        return solver_input
+
+    new_index = {node: position for position, node in enumerate(kept_nodes)}
+    grid = np.ix_(kept_nodes, kept_nodes)
+    num_depots = _num_depots(solver_input)
+
+    def per_node(values: list) -> list:
+        if len(values) != size:
+            return values
+        return [values[node] for node in kept_nodes]
+
+    def submatrix(matrix: Optional[list]):
+        if matrix is None or len(matrix) != size:
+            return matrix
+        return np.asarray(matrix)[grid].tolist()
+
+    penalties = solver_input.penalties or []
+    kept_penalties = [
+        penalties[node - num_depots]
+        for node in kept_nodes
+        if 0 <= node - num_depots < len(penalties)
+    ]
+
+    return replace(
+        solver_input,
+        time_matrix=submatrix(solver_input.time_matrix),
+        distance_matrix=submatrix(solver_input.distance_matrix),
+        haversine_distance=submatrix(solver_input.haversine_distance),
+        time_windows=per_node(solver_input.time_windows),
+        service_durations=per_node(solver_input.service_durations),
+        soft_time_windows=per_node(solver_input.soft_time_windows),
+        starts=[new_index[node] for node in solver_input.starts],
+        ends=[new_index[node] for node in solver_input.ends],
+        penalties=kept_penalties if penalties else penalties,
+        location_priorities=[
+            (new_index[node], priority)
+            for node, priority in solver_input.location_priorities
+            if node in new_index
+        ],
+        precedence_constraints=[
+            (new_index[before], new_index[after])
+            for before, after in solver_input.precedence_constraints
+            if before in new_index and after in new_index
+        ],
+        allowed_vehicles_by_node={
+            new_index[node]: vehicles
+            for node, vehicles in solver_input.allowed_vehicles_by_node.items()
+            if node in new_index
+        },
+        initial_routes=[
+            [new_index[node] for node in route if node in new_index]
+            for route in solver_input.initial_routes
+        ],
+    )
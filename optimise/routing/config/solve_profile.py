@@ -14,6 +14,8 @@ class SolveProfile:
     log_search: bool = False
     search_workers: Optional[int] = None
     solution_limit: Optional[int] = None
+    optimality_gap: Optional[float] = None
+    alternatives: int = 0
 
     @staticmethod
     def from_solver_input(input_obj) -> "SolveProfile":
@@ -21,4 +23,6 @@ class SolveProfile:
             first_solution_strategy=input_obj.first_solution_strategy,
             local_search_metaheuristic=input_obj.local_search_metaheuristic,
             time_limit_seconds=input_obj.time_limit_seconds,
+            optimality_gap=input_obj.optimality_gap,
+            alternatives=getattr(input_obj, "alternatives", 0),
         )
@@ -24,6 +24,7 @@ messages_fr = {
     "order_priority_between": "La priorité de la commande doit être comprise entre 1 et 5. Valeurs obtenues pour (id,priority) : ({0},{1})",
     "missing_order_field": "Le champ 'order' est manquant: {0}",
     "error_processing_order": "Erreur de traitement de la commande: {0}, {1}",
+    "error_processing_worker": "Erreur de traitement du technicien: {0}, {1}",
     "must_start_datetime_conflict": "'must_start_datetime' ne peut pas être postérieur à 'latest_end_datetime'",
     "invalid_status_for_delete_routing_solution": "Suppression invalide due au paramètre 'status': {0}. Vous pouvez supprimer les solutions de routage avec le 'status' 'FINISHED' ou 'FAILED'.",
     "successfully_deleted_routing_solutions": "Solutions de routage supprimées avec succès: {0}",
@@ -41,6 +42,12 @@ messages_fr = {
     "optimizing_for_skill": "optimisation pour la compétence {0}",
     "invalid_time_unit": "Unité de temps invalide. 'from_unit': {0}, 'to_unit': {1}",
     "preprocessing_request": "Requête de prétraitement",
+    "PRESOLVE_WINDOW_SHORTER_THAN_SERVICE": "La plage horaire est plus courte que la durée d'intervention.",
+    "PRESOLVE_NO_ELIGIBLE_WORKER": "Aucun travailleur autorisé pour cette intervention.",
+    "PRESOLVE_UNREACHABLE_IN_SHIFT": "Aucun travailleur ne peut atteindre l'intervention et revenir pendant ses heures de travail.",
+    "PRESOLVE_CYCLIC_DEPENDENCY": "Les dépendances entre interventions forment un cycle.",
+    "PRESOLVE_NO_COMMON_WORKER_FOR_DEPENDENCY": "Aucun travailleur ne peut réaliser cette intervention et celle dont elle dépend.",
+    "PRESOLVE_DEPENDS_ON_DROPPED_TASK": "Dépend d'une intervention qui ne peut pas être planifiée.",
 }
 
 messages_en = {
@@ -69,6 +76,7 @@ messages_en = {
     "order_priority_between": "Order priority must be between 1 and 5. Got values for (id,priority): ({0},{1})",
     "missing_order_field": "Missing order field: {0}",
     "error_processing_order": "Error processing order: {0}, {1}",
+    "error_processing_worker": "Error processing worker: {0}, {1}",
     "must_start_datetime_conflict": "must_start_datetime cannot be later than latest_end_datetime",
     "invalid_status_for_delete_routing_solution": "Invalid remove by 'status' parameter: {0}. You can remove routing solutions with status 'FINISHED' or 'FAILED'.",
     "successfully_deleted_routing_solutions": "Successfully deleted {0} routing solutions.",
@@ -86,6 +94,12 @@ messages_en = {
     "optimizing_for_skill": "optimizing for skill {0}",
     "invalid_time_unit": "Invalid time unit. 'from_unit': {0}, 'to_unit': {1}",
     "preprocessing_request": "Preprocessing request",
+    "PRESOLVE_WINDOW_SHORTER_THAN_SERVICE": "Time window is shorter than the service duration.",
+    "PRESOLVE_NO_ELIGIBLE_WORKER": "No worker is allowed to serve this order.",
+    "PRESOLVE_UNREACHABLE_IN_SHIFT": "No worker can reach the order and return within its working hours.",
+    "PRESOLVE_CYCLIC_DEPENDENCY": "Task dependencies form a cycle.",
+    "PRESOLVE_NO_COMMON_WORKER_FOR_DEPENDENCY": "No single worker can serve this order and the order it depends on.",
+    "PRESOLVE_DEPENDS_ON_DROPPED_TASK": "Depends on an order that cannot be scheduled.",
 
 
 
@@ -1,4 +1,5 @@
 from optimise.routing.constraints.arc_cost import ArcCostConstraint
+from optimise.routing.constraints.arc_pruning import ArcPruningConstraint
 from optimise.routing.constraints.base import ConstraintContext, RoutingConstraint
 from optimise.routing.constraints.breaks import BreaksConstraint
 from optimise.routing.constraints.capacity import CapacityConstraint
@@ -14,6 +15,7 @@ from optimise.routing.constraints.zone_restrictions import ZoneRestrictionConstr
 
 __all__ = [
     "ArcCostConstraint",
+    "ArcPruningConstraint",
     "BreaksConstraint",
     "CapacityConstraint",
     "DistanceConstraint",
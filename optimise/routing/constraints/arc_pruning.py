@@ -0,0 +1,63 @@
+import numpy as np
+
+from optimise.routing.constraints.base import ConstraintContext, RoutingConstraint
+
+
+class ArcPruningConstraint(RoutingConstraint):
+    """
+    Remove order-to-order arcs that no solution can use from the next
+    variable domains:
+
+    - i -> j when starting i at its earliest time still reaches j after the
+      latest start of j (``tw_start[i] + service[i] + travel[i][j]``, the
+      Time transit, exceeds ``tw_end[j] - service[j] + tolerance``);
+    - i -> j when no vehicle is allowed to serve both orders.
+    """
+
+    def apply(self, context: ConstraintContext) -> None:
+        solver_input = context.solver_input
+        if not solver_input.time_windows and not solver_input.allowed_vehicles_by_node:
+            return
+
+        size = len(solver_input.time_matrix)
+        depots = set(solver_input.starts) | set(solver_input.ends)
+        orders = np.array([node for node in range(size) if node not in depots], dtype=np.int64)
+        if orders.size < 2:
+            return
+
+        infeasible = np.zeros((orders.size, orders.size), dtype=bool)
+
+        if solver_input.time_windows:
+            service = np.zeros(size)
+            durations = np.asarray(solver_input.service_durations[:size], dtype=float)
+            service[: len(durations)] = durations
+            windows = np.asarray(solver_input.time_windows[:size], dtype=float)
+            if len(windows) == size:
+                travel = np.asarray(solver_input.time_matrix, dtype=float)[np.ix_(orders, orders)]
+                earliest_leave = windows[orders, 0] + service[orders]
+                latest_start = (
+                    windows[orders, 1] - service[orders] + float(solver_input.time_window_tolerance)
+                )
+                infeasible |= earliest_leave[:, None] + travel > latest_start[None, :]
+
+        if solver_input.allowed_vehicles_by_node:
+            allowed = np.ones((solver_input.num_vehicles, orders.size), dtype=bool)
+            for position, node in enumerate(orders):
+                vehicles = solver_input.allowed_vehicles_by_node.get(int(node))
+                if vehicles is not None:
+                    allowed[:, position] = False
+                    allowed[[v for v in vehicles if 0 <= v < solver_input.num_vehicles], position] = True
+            shared = allowed.T.astype(np.int64) @ allowed.astype(np.int64)
+            infeasible |= shared == 0
+
+        np.fill_diagonal(infeasible, False)
+        if not infeasible.any():
+            return
+
+        manager = context.manager
+        routing = context.routing
+        indices = np.array([manager.NodeToIndex(int(node)) for node in orders], dtype=np.int64)
+        for row in np.flatnonzero(infeasible.any(axis=1)):
+            routing.NextVar(int(indices[row])).RemoveValues(
+                indices[infeasible[row]].tolist()
+            )
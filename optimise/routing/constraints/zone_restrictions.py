@@ -12,4 +12,8 @@ class ZoneRestrictionConstraint(RoutingConstraint):
 
         for node, allowed in solver_input.allowed_vehicles_by_node.items():
             index = manager.NodeToIndex(node)
+            if not allowed:
+                # OR-Tools treats an empty list as "any vehicle".
+                routing.ActiveVar(index).SetValue(0)
+                continue
             routing.SetAllowedVehiclesForIndex(list(allowed), index)
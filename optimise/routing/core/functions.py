@@ -23,6 +23,22 @@ import logging
 
 from itertools import product
 
+def get_strategy_combinations(type="fast"):
+    """
+    All (first_solution, local_search) pairs configured for a result type.
+
+    :param type: "fast", "optimized" (or "best") or "default".
+    :return: A set of (first_solution_strategy, local_search_metaheuristic) tuples.
+    :rtype: set
+    """
+    if type == 'best':
+        type = 'optimized'
+    if type == "optimized":
+        return set(itertools.product(OPTIMIZED_FIRST_SOLUTIONS, OPTIMIZED_METAHEURISTIC_SEARCH))
+    if type == "fast":
+        return set(itertools.product(FAST_FIRST_SOLUTIONS, FAST_METAHEURISTIC_SEARCH))
+    return set(itertools.product([DEFAULT_FIRST_SOLUTION_STRATEGY], [DEFAULT_LOCAL_SEARCH_METAHEURISTIC]))
+
 def get_optimizer_strategy(type="fast", history=None, deterministic=False, rng=None):
     """
     Returns a unique pair of strategies (first_solution, local_search) for an optimizer based on the given type.
@@ -47,17 +63,13 @@ def get_optimizer_strategy(type="fast", history=None, deterministic=False, rng=N
     if history is None or not history:
         history = {"fast": set(), "optimized": set(), "default": set()}
 
-    all_combinations = {
-        "optimized": set(itertools.product(OPTIMIZED_FIRST_SOLUTIONS, OPTIMIZED_METAHEURISTIC_SEARCH)),
-        "fast": set(itertools.product(FAST_FIRST_SOLUTIONS, FAST_METAHEURISTIC_SEARCH)),
-        "default": set(itertools.product([DEFAULT_FIRST_SOLUTION_STRATEGY], [DEFAULT_LOCAL_SEARCH_METAHEURISTIC]))
-    }
+    all_combinations = get_strategy_combinations(type)
 
-    available_combinations = all_combinations[type] - history[type]
+    available_combinations = all_combinations - history[type]
 
     if not available_combinations:
         history[type] = set()
-        available_combinations = all_combinations[type]
+        available_combinations = all_combinations
         logging.info(f"All combinations for {type} exhausted. History reset.")
 
     if deterministic:
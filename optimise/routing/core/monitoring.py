@@ -1,4 +1,5 @@
 from ortools.constraint_solver import pywrapcp
+import time
 from math import inf
 from collections import deque
 import numpy as np
@@ -74,3 +75,77 @@ class NoImprovementMonitor():
             self.routing.solver().FinishCurrentSearch()
 
 
+
+
+class OptimalityGapMonitor():
+    def __init__(self, routing: pywrapcp.RoutingModel, lower_bound: int, target_gap: float):
+        self.routing = routing
+        self.lower_bound = lower_bound
+        self.target_gap = target_gap
+        self.best_solution_value = inf
+        self.gap = None
+
+    def __call__(self):
+        current_solution_value = self.routing.CostVar().Max()
+        if current_solution_value < self.best_solution_value:
+            self.best_solution_value = current_solution_value
+            if current_solution_value <= 0:
+                self.gap = 0.0
+            else:
+                self.gap = max(0.0, (current_solution_value - self.lower_bound) / current_solution_value)
+        if self.gap is not None and self.gap <= self.target_gap:
+            print('optimality gap reached')
+            self.routing.solver().FinishCurrentSearch()
+
+
+class IncumbentMonitor():
+    def __init__(self, routing: pywrapcp.RoutingModel):
+        self.routing = routing
+        self.started_at = time.monotonic()
+        self.best_solution_value = inf
+        self.time_to_incumbent = None
+
+    def __call__(self):
+        current_solution_value = self.routing.CostVar().Max()
+        if current_solution_value < self.best_solution_value:
+            self.best_solution_value = current_solution_value
+            self.time_to_incumbent = time.monotonic() - self.started_at
+
+
+class SolutionPoolMonitor():
+    """
+    Keeps the ``capacity`` cheapest distinct solutions met during the search,
+    as ``{routes: objective}`` with the visited nodes of every vehicle.
+    Solutions costlier than ``max_cost_increase`` above the incumbent are not
+    read, so the pool costs little once the search settles.
+    """
+
+    def __init__(self, routing: pywrapcp.RoutingModel, manager: pywrapcp.RoutingIndexManager, capacity: int, max_cost_increase: float):
+        self.routing = routing
+        self.manager = manager
+        self.capacity = capacity
+        self.max_cost_increase = max_cost_increase
+        self.best_solution_value = inf
+        self.solutions = {}
+
+    def __call__(self):
+        current_solution_value = self.routing.CostVar().Max()
+        self.best_solution_value = min(self.best_solution_value, current_solution_value)
+        if current_solution_value > self.best_solution_value * (1 + self.max_cost_increase):
+            return
+        if len(self.solutions) >= self.capacity and current_solution_value >= max(self.solutions.values()):
+            return
+        routes = []
+        for vehicle in range(self.routing.vehicles()):
+            route = []
+            index = self.routing.NextVar(self.routing.Start(vehicle)).Value()
+            while not self.routing.IsEnd(index):
+                route.append(self.manager.IndexToNode(index))
+                index = self.routing.NextVar(index).Value()
+            routes.append(tuple(route))
+        routes = tuple(routes)
+        if routes in self.solutions:
+            return
+        self.solutions[routes] = current_solution_value
+        if len(self.solutions) > self.capacity:
+            del self.solutions[max(self.solutions, key=self.solutions.get)]
@@ -0,0 +1,151 @@
+import hashlib
+import os
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from diskcache import Cache
+
+from optimise.routing.defaults import ROUTE_TEMPLATE_MIN_SIMILARITY, ROUTE_TEMPLATES_DIR
+
+# Coordinates are compared at about one metre.
+COORDINATE_DIGITS = 5
+
+
+def order_key(work_order: Any) -> str:
+    """
+    Identity of an order across plans: its location and skill. Recurring
+    orders get new ids every week, their place does not change.
+    """
+    return (
+        f"{round(float(work_order.latitude), COORDINATE_DIGITS)},"
+        f"{round(float(work_order.longitude), COORDINATE_DIGITS)}|{work_order.skill}"
+    )
+
+
+def fleet_fingerprint(instance: Any) -> str:
+    """
+    Key of the day's fleet: the working workers with their start and end
+    places, and the weekday, since recurring plans repeat weekly.
+    """
+    parts = []
+    for worker in sorted(instance.workers, key=lambda w: str(w.id)):
+        places = []
+        for place in (instance.start_at, instance.end_at):
+            if place == "home":
+                places.append((worker.latitude, worker.longitude))
+            elif worker.depot:
+                places.append((worker.depot["latitude"], worker.depot["longitude"]))
+        coordinates = ";".join(
+            f"{round(float(lat), COORDINATE_DIGITS)},{round(float(lon), COORDINATE_DIGITS)}"
+            for lat, lon in places
+        )
+        parts.append(f"{worker.id}@{coordinates}")
+    parts.append(f"weekday={instance.current_optimization_date.weekday()}")
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def order_similarity(keys_a: Iterable[str], keys_b: Iterable[str]) -> float:
+    """
+    Jaccard similarity of two multisets of order keys.
+    """
+    count_a, count_b = Counter(keys_a), Counter(keys_b)
+    union = sum((count_a | count_b).values())
+    if union == 0:
+        return 1.0
+    return sum((count_a & count_b).values()) / union
+
+
+@dataclass(frozen=True)
+class RouteTemplate:
+    fingerprint: str
+    orders: List[str]
+    routes: Dict[str, List[str]] = field(default_factory=dict)
+    objective_value: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class RouteTemplateStore:
+    """
+    Best-known route sequences of recurring plans, one template per fleet
+    fingerprint. ``routes`` maps a worker id to the keys of the orders it
+    visits, in order. Templates live in a local diskcache shared by processes.
+    """
+
+    def __init__(self, cache: Optional[Cache] = None) -> None:
+        self._cache = cache
+
+    @property
+    def cache(self) -> Cache:
+        if self._cache is None:
+            base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+            cache_dir = ROUTE_TEMPLATES_DIR
+            if not os.path.isabs(cache_dir):
+                cache_dir = os.path.join(base_dir, cache_dir)
+            self._cache = Cache(cache_dir)
+        return self._cache
+
+    def match(
+        self,
+        fingerprint: str,
+        orders: List[str],
+        min_similarity: float = ROUTE_TEMPLATE_MIN_SIMILARITY,
+    ) -> Optional[RouteTemplate]:
+        stored = self.cache.get(fingerprint)
+        if stored is None:
+            return None
+        template = RouteTemplate(**stored)
+        if order_similarity(template.orders, orders) < min_similarity:
+            return None
+        return template
+
+    def record(self, template: RouteTemplate) -> bool:
+        """
+        Store ``template`` unless the stored one serves the same orders at a
+        lower cost. Returns whether it was stored.
+        """
+        with self.cache.transact():
+            stored = self.cache.get(template.fingerprint)
+            if (
+                stored is not None
+                and Counter(stored["orders"]) == Counter(template.orders)
+                and stored.get("objective_value") is not None
+                and template.objective_value is not None
+                and stored["objective_value"] <= template.objective_value
+            ):
+                return False
+            self.cache.set(template.fingerprint, template.to_dict())
+            return True
+
+
+def seed_routes(
+    template: RouteTemplate, worker_ids: List[Any], order_nodes: Dict[str, List[int]]
+) -> List[List[int]]:
+    """
+    Node sequences of the template for the current problem: ``worker_ids``
+    gives the vehicle order and ``order_nodes`` the nodes of each order key.
+    Orders that are gone are skipped; new orders are left out, for the search
+    to insert.
+    """
+    available: Dict[str, List[int]] = {key: list(nodes) for key, nodes in order_nodes.items()}
+    routes: List[List[int]] = []
+    for worker_id in worker_ids:
+        route = []
+        for key in template.routes.get(str(worker_id), []):
+            nodes = available.get(key)
+            if nodes:
+                route.append(nodes.pop(0))
+        routes.append(route)
+    return routes
+
+
+_store: Optional[RouteTemplateStore] = None
+
+
+def get_route_template_store() -> RouteTemplateStore:
+    global _store
+    if _store is None:
+        _store = RouteTemplateStore()
+    return _store
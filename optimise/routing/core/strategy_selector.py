@@ -0,0 +1,159 @@
+import math
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from diskcache import Cache
+
+from optimise.routing.defaults import STRATEGY_STATS_DIR
+from optimise.routing.input.solver_input import SolverInput
+
+# Share of the reward given to the objective quality; the rest rewards a
+# short time-to-incumbent.
+QUALITY_WEIGHT = 0.8
+
+
+@dataclass(frozen=True)
+class StrategyChoice:
+    context: str
+    first_solution_strategy: str
+    local_search_metaheuristic: str
+    sampled_score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def instance_context(solver_input: SolverInput) -> str:
+    """
+    Key under which strategy statistics are pooled: a power-of-two bucket of
+    the number of nodes and the mix of active constraints.
+    """
+    size = len(solver_input.time_matrix)
+    bucket = 2 ** max(3, math.ceil(math.log2(max(size, 1))))
+    features = []
+    if any(solver_input.breaks):
+        features.append("breaks")
+    if solver_input.precedence_constraints:
+        features.append("precedence")
+    if solver_input.allowed_vehicles_by_node:
+        features.append("restricted")
+    if solver_input.max_route_distance:
+        features.append("distance")
+    if solver_input.distribute_load:
+        features.append("balanced")
+    if any(solver_input.soft_time_windows):
+        features.append("soft_windows")
+    if solver_input.enable_neighborhood_clustering:
+        features.append("clustering")
+    return f"{bucket}|{'+'.join(features) or 'plain'}"
+
+
+def strategy_reward(
+    objective_value: Optional[float],
+    lower_bound: Optional[float],
+    time_to_incumbent: Optional[float],
+    time_limit_seconds: Optional[float] = None,
+) -> Optional[float]:
+    """
+    Reward in [0, 1]: ``lower_bound / objective`` blended with how early the
+    final incumbent was found (relative to the time limit when known).
+    """
+    if objective_value is None or lower_bound is None:
+        return None
+    quality = 1.0 if objective_value <= 0 else min(1.0, max(0.0, lower_bound / objective_value))
+    if time_to_incumbent is None:
+        speed = 0.0
+    elif time_limit_seconds:
+        speed = 1.0 - min(1.0, time_to_incumbent / float(time_limit_seconds))
+    else:
+        speed = 1.0 / (1.0 + time_to_incumbent)
+    return QUALITY_WEIGHT * quality + (1.0 - QUALITY_WEIGHT) * speed
+
+
+def _arm_key(first_solution_strategy: str, local_search_metaheuristic: str) -> str:
+    return f"{first_solution_strategy}/{local_search_metaheuristic}"
+
+
+class StrategySelector:
+    """
+    Thompson sampling over (first solution, metaheuristic) pairs.
+
+    Each pair keeps a Beta posterior per instance context, updated with
+    fractional rewards; statistics live in a local diskcache so they are
+    shared by processes and survive restarts.
+    """
+
+    def __init__(self, cache: Optional[Cache] = None) -> None:
+        self._cache = cache
+
+    @property
+    def cache(self) -> Cache:
+        if self._cache is None:
+            base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+            cache_dir = STRATEGY_STATS_DIR
+            if not os.path.isabs(cache_dir):
+                cache_dir = os.path.join(base_dir, cache_dir)
+            self._cache = Cache(cache_dir)
+        return self._cache
+
+    def stats(self, context: str) -> Dict[str, Dict[str, float]]:
+        return dict(self.cache.get(context, {}))
+
+    def choose(
+        self,
+        context: str,
+        combinations: Iterable[Tuple[str, str]],
+        rng: Optional[random.Random] = None,
+    ) -> StrategyChoice:
+        rng = rng or random
+        stats = self.stats(context)
+        best: Optional[StrategyChoice] = None
+        for first_solution, metaheuristic in sorted(combinations):
+            arm = stats.get(_arm_key(first_solution, metaheuristic), {})
+            score = rng.betavariate(1.0 + arm.get("alpha", 0.0), 1.0 + arm.get("beta", 0.0))
+            if best is None or score > best.sampled_score:
+                best = StrategyChoice(
+                    context=context,
+                    first_solution_strategy=first_solution,
+                    local_search_metaheuristic=metaheuristic,
+                    sampled_score=score,
+                )
+        if best is None:
+            raise ValueError("No strategy combination to choose from.")
+        return best
+
+    def record(
+        self,
+        choice: StrategyChoice,
+        reward: float,
+        objective_value: Optional[float] = None,
+        time_to_incumbent: Optional[float] = None,
+    ) -> None:
+        reward = min(1.0, max(0.0, float(reward)))
+        key = _arm_key(choice.first_solution_strategy, choice.local_search_metaheuristic)
+        with self.cache.transact():
+            stats = dict(self.cache.get(choice.context, {}))
+            arm = dict(stats.get(key, {}))
+            runs = arm.get("runs", 0) + 1
+            arm["runs"] = runs
+            arm["alpha"] = arm.get("alpha", 0.0) + reward
+            arm["beta"] = arm.get("beta", 0.0) + 1.0 - reward
+            if objective_value is not None:
+                arm["last_objective"] = objective_value
+            if time_to_incumbent is not None:
+                previous = arm.get("mean_time_to_incumbent", time_to_incumbent)
+                arm["mean_time_to_incumbent"] = previous + (time_to_incumbent - previous) / runs
+            stats[key] = arm
+            self.cache.set(choice.context, stats)
+
+
+_selector: Optional[StrategySelector] = None
+
+
+def get_strategy_selector() -> StrategySelector:
+    global _selector
+    if _selector is None:
+        _selector = StrategySelector()
+    return _selector
@@ -11,6 +11,7 @@ from typing import List, Dict, Any
 from copy import deepcopy
 from optimise.routing.model import Instance, WorkOrder, Worker
 from optimise.routing.constants import translate
+from optimise.routing.defaults import MULTI_SKILL_MODE
 
 
 
@@ -27,6 +28,9 @@ def get_optimisation_instances(original_request: Dict[str, Any]) -> List[Instanc
         validate_request_fields(request)  # This function validates that all required fields are in the request
         instances = []
 
+        if request.get('multi_skill_mode', MULTI_SKILL_MODE) == "single_model":
+            return [get_single_model_instance(request)]
+
         for skill in request['orders_skills']:
             instance = Instance.from_dict({'name': skill, **request})
             add_orders_to_instance(instance, request['orders'], skill, request)
@@ -38,6 +42,24 @@ def get_optimisation_instances(original_request: Dict[str, Any]) -> List[Instanc
     except Exception as e:
         raise ValueError(translate("failed_to_create_optimization_instances", request.get('language')).format(e))
 
+def get_single_model_instance(request: Dict[str, Any]) -> Instance:
+    """
+    One instance for the whole fleet: every worker appears once and each order
+    is restricted to the workers holding its skill (see instance_to_solver_input).
+    """
+    skills = request['orders_skills']
+    instance = Instance.from_dict({'name': '+'.join(skills) or 'routing', **request})
+    instance.restrict_vehicles_by_skill = True
+    for skill in skills:
+        add_orders_to_instance(instance, request['orders'], skill, request)
+    for worker in request['workers']:
+        if any(skill in worker['skills'] for skill in skills):
+            try:
+                instance.add_worker(Worker.from_dict(worker, request))
+            except Exception as e:
+                raise ValueError(translate("failed_to_add_worker_to_instance", request.get('language')).format(worker['e_id'], e))
+    return instance
+
 def add_orders_to_instance(instance: Instance, orders: List[Dict[str, Any]], skill: str, request: Dict[str, Any]):
     for order in orders:
         if order['skill'] == skill:
@@ -59,6 +59,34 @@ DEFAULT_OPTIMIZATION_TIME_LIMIT_MINUTES = _env_int("DEFAULT_OPTIMIZATION_TIME_LI
 DEFAULT_RESULT_TYPE = _env_str("DEFAULT_RESULT_TYPE", "fast")  # fast, optimized or best
 NUM_RUNS_FOR_BEST_RESULT_TYPE = _env_int("NUM_RUNS_FOR_BEST_RESULT_TYPE", 5)
 MAX_NUM_WORKERS = _env_int("MAX_NUM_WORKERS", 20)
+# MATRICES WITH AT LEAST THIS MANY CELLS ARE SHIPPED TO SOLVER PROCESSES THROUGH SHARED MEMORY
+WIRE_SHARED_MEMORY_MIN_CELLS = _env_int("WIRE_SHARED_MEMORY_MIN_CELLS", 250000)
+# MEMOISED DATE AND TIME STRINGS (REQUESTS REPEAT THE SAME SHIFT HOURS AND DATES)
+DATE_PARSE_CACHE_SIZE = _env_int("DATE_PARSE_CACHE_SIZE", 16384)
+# STOP THE SEARCH ONCE THE INCUMBENT IS WITHIN THIS RELATIVE GAP OF THE LOWER BOUND (0 DISABLES)
+DEFAULT_OPTIMALITY_GAP = _env_float("DEFAULT_OPTIMALITY_GAP", 0.0)
+# DISTINCT SOLUTIONS KEPT DURING THE SEARCH TO PICK ALTERNATIVES FROM, AND HOW MUCH COSTLIER THAN THE BEST THEY MAY BE
+ALTERNATIVE_POOL_SIZE = _env_int("ALTERNATIVE_POOL_SIZE", 50)
+ALTERNATIVE_MAX_COST_INCREASE = _env_float("ALTERNATIVE_MAX_COST_INCREASE", 0.2)
+# REMOVE PROVABLY INFEASIBLE ORDERS AND TIGHTEN TIME WINDOWS BEFORE BUILDING THE MODEL
+ENABLE_PRESOLVE = _env_bool("ENABLE_PRESOLVE", True)
+# MERGE ORDERS AT THE SAME LOCATION WITH COMPATIBLE WINDOWS INTO A SINGLE ROUTING NODE
+ENABLE_COLOCATED_MERGE = _env_bool("ENABLE_COLOCATED_MERGE", True)
+# FETCH THE NEXT DAYS' TRAVEL MATRICES IN THE BACKGROUND WHILE THE CURRENT DAY IS SOLVED
+ENABLE_MATRIX_PREFETCH = _env_bool("ENABLE_MATRIX_PREFETCH", True)
+# ASSIGN THE ORDERS OF A MULTI-DAY HORIZON TO DAYS BEFORE ROUTING INSTEAD OF SPILLING DROPPED ORDERS OVER
+# (REQUESTS OPT IN WITH "day_assignment")
+ENABLE_DAY_ASSIGNMENT = _env_bool("ENABLE_DAY_ASSIGNMENT", False)
+# SHARE OF THE WORKERS' NET SHIFT TIME THE DAY ASSIGNMENT MAY FILL WITH SERVICE AND ESTIMATED TRAVEL
+DAY_ASSIGNMENT_UTILISATION = _env_float("DAY_ASSIGNMENT_UTILISATION", 0.9)
+# PROCESSES SOLVING INDEPENDENT GROUPS OF HORIZON DAYS CONCURRENTLY, ONE POOL PER PROCESS (1 DISABLES)
+PARALLEL_DAY_WORKERS = _env_int("PARALLEL_DAY_WORKERS", 1)
+# "split": ONE INSTANCE PER SKILL, "single_model": ONE INSTANCE FOR THE WHOLE FLEET WITH SKILL-RESTRICTED VEHICLES
+MULTI_SKILL_MODE = _env_str("MULTI_SKILL_MODE", "split")
+# SOLVER BACKEND REGISTERED IN optimise.routing.solver.registry ("ortools" OR "construction")
+SOLVER_BACKEND = _env_str("SOLVER_BACKEND", "ortools")
+# TIME BUDGET OF THE 2-OPT/RELOCATE PHASE OF THE CONSTRUCTION BACKEND
+CONSTRUCTION_IMPROVEMENT_SECONDS = _env_float("CONSTRUCTION_IMPROVEMENT_SECONDS", 1.0)
 DEFAULT_NO_IMPROVEMENT_LIMIT = _env_int("DEFAULT_NO_IMPROVEMENT_LIMIT", 100)
 DISTANCE_MATRIX_DIMENSION_PER_REQUEST = _env_int("DISTANCE_MATRIX_DIMENSION_PER_REQUEST", 50)
 VEHICULE_DROPPING_PENALTY = _env_int("VEHICULE_DROPPING_PENALTY", 1000000)
@@ -75,7 +103,43 @@ ENABLE_DISTANCE_MATRIX_CACHE = _env_bool("ENABLE_DISTANCE_MATRIX_CACHE", False)
 ENABLE_GEOCODING_CACHE = _env_bool("ENABLE_GEOCODING_CACHE", True)
 GEOLOC_CACHE_BACKEND = os.getenv("GEOLOC_CACHE_BACKEND", "db")  # "db" or "local"
 GEOLOC_LOCAL_CACHE_DIR = os.getenv("GEOLOC_LOCAL_CACHE_DIR", "cache/geolocations")
+# CONCURRENT GEOCODING OF THE ADDRESSES MISSING FROM THE CACHE, AND CALLS A PROVIDER MAY RECEIVE BACK TO BACK
+GEOCODING_WORKERS = _env_int("GEOCODING_WORKERS", 8)
+GEOCODING_BURST = _env_int("GEOCODING_BURST", 5)
+# NOMINATIM'S USAGE POLICY ALLOWS ONE REQUEST PER SECOND, WITHOUT BURSTS
+NOMINATIM_RATE_LIMIT = _env_float("NOMINATIM_RATE_LIMIT", 1.0)
+NOMINATIM_BURST = _env_int("NOMINATIM_BURST", 1)
+# ADDRESSES KEPT IN MEMORY IN FRONT OF THE GEOCODE CACHE, AND HOW LONG FAILED LOOKUPS ARE REMEMBERED
+GEOCODE_MEMORY_CACHE_SIZE = _env_int("GEOCODE_MEMORY_CACHE_SIZE", 10000)
+GEOCODE_NEGATIVE_TTL_SECONDS = _env_int("GEOCODE_NEGATIVE_TTL_SECONDS", 24 * 3600)
+GEOCODE_ERROR_TTL_SECONDS = _env_int("GEOCODE_ERROR_TTL_SECONDS", 300)
+# OFFLINE POSTCODE/LOCALITY CENTROIDS: "off", "fallback" (WHEN PROVIDERS FAIL) OR "primary" (BEFORE PROVIDERS)
+GAZETTEER_MODE = _env_str("GAZETTEER_MODE", "fallback")
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH", "cache/gazetteer.sqlite")
 DISTANCE_MATRIX_CACHE_DIR = os.getenv("DISTANCE_MATRIX_CACHE_DIR", "cache/distance_matrix")
+# KEEP-ALIVE CONNECTIONS OF THE SHARED ROUTER SESSIONS: HOSTS KEPT PER SESSION AND CONNECTIONS PER HOST
+ROUTER_POOL_CONNECTIONS = _env_int("ROUTER_POOL_CONNECTIONS", 4)
+ROUTER_POOL_MAXSIZE = _env_int("ROUTER_POOL_MAXSIZE", 16)
+# MATRIX TILES REQUESTED AT ONCE BY THE ASYNC MATRIX SERVICE
+ROUTER_ASYNC_CONCURRENCY = _env_int("ROUTER_ASYNC_CONCURRENCY", 8)
+# RETRIES A JOB MAY SPEND ACROSS ALL ITS REMOTE CALLS, SHORTEST ATTEMPT WORTH MAKING BEFORE ITS DEADLINE,
+# TIME KEPT AFTER THE LAST REMOTE CALL TO SAVE THE RESULTS, AND THE DEADLINE OF JOBS WITHOUT A TIME LIMIT (0: NONE)
+RETRY_BUDGET_MAX_RETRIES = _env_int("RETRY_BUDGET_MAX_RETRIES", 6)
+RETRY_BUDGET_MIN_ATTEMPT_SECONDS = _env_float("RETRY_BUDGET_MIN_ATTEMPT_SECONDS", 1.0)
+JOB_DEADLINE_RESERVE_SECONDS = _env_float("JOB_DEADLINE_RESERVE_SECONDS", 15.0)
+JOB_DEADLINE_SECONDS = _env_float("JOB_DEADLINE_SECONDS", 0.0)
+# ROUTE LEGS WHOSE GEOMETRY IS KEPT IN MEMORY, DEFAULT SIMPLIFICATION TOLERANCE (0: NONE) AND TIME GIVEN TO FETCH THEM
+ROUTE_GEOMETRY_CACHE_SIZE = _env_int("ROUTE_GEOMETRY_CACHE_SIZE", 20000)
+ROUTE_GEOMETRY_TOLERANCE_M = _env_float("ROUTE_GEOMETRY_TOLERANCE_M", 0.0)
+ROUTE_GEOMETRY_TIMEOUT_SECONDS = _env_float("ROUTE_GEOMETRY_TIMEOUT_SECONDS", 10.0)
+# PICK SEARCH STRATEGIES WITH THOMPSON SAMPLING OVER THE RESULTS OF PAST SOLVES
+ADAPTIVE_STRATEGY_SELECTION = _env_bool("ADAPTIVE_STRATEGY_SELECTION", False)
+STRATEGY_STATS_DIR = os.getenv("STRATEGY_STATS_DIR", "cache/strategy_stats")
+# SEED RECURRING PLANS FROM THE BEST ROUTES STORED FOR THE SAME FLEET AND WEEKDAY, WITH A SHORTER SEARCH
+ENABLE_ROUTE_TEMPLATES = _env_bool("ENABLE_ROUTE_TEMPLATES", False)
+ROUTE_TEMPLATES_DIR = os.getenv("ROUTE_TEMPLATES_DIR", "cache/route_templates")
+ROUTE_TEMPLATE_MIN_SIMILARITY = _env_float("ROUTE_TEMPLATE_MIN_SIMILARITY", 0.8)
+ROUTE_TEMPLATE_TIME_FRACTION = _env_float("ROUTE_TEMPLATE_TIME_FRACTION", 0.25)
 DEFAULT_WALKING_DISTANCES_THRESHOLD = _env_float("DEFAULT_WALKING_DISTANCES_THRESHOLD", 200)
 DEFAULT_DRIVING_SPEED_KMH = _env_float("DEFAULT_DRIVING_SPEED_KMH", 40)
 FAST_FIRST_SOLUTIONS = _env_csv(
@@ -1,15 +1,22 @@
+import asyncio
 import json
 import logging
 import os
 from itertools import cycle
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import backoff
+import httpx
+import numpy as np
 import requests.exceptions
 from diskcache import Cache
 from pprint import pprint
 
-from optimise.routing.defaults import ENABLE_DISTANCE_MATRIX_CACHE, DISTANCE_MATRIX_CACHE_DIR
+from optimise.routing.defaults import (
+    DISTANCE_MATRIX_CACHE_DIR,
+    ENABLE_DISTANCE_MATRIX_CACHE,
+    ROUTER_ASYNC_CONCURRENCY,
+)
 
 try:
     from config.defaults import ROUTING_ENGINE
@@ -28,7 +35,8 @@ except ModuleNotFoundError:
 # # Load environment variables from .env file
 # load_dotenv()
 # Assuming import paths for router classes are correct
-from optimise.utils.routing.routers import ORS, Graphhopper, MapboxOSRM, OSRM
+from optimise.routing.router_pool import get_router
+from optimise.utils.retry_budget import DeadlineExceeded, current_budget
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -94,94 +102,186 @@ def get_batches(total_count: int, batch_size: int) -> List[Tuple[int, int]]:
     """Generate start and end indices for each batch given the total number of items and the batch size."""
     return [(i, min(i + batch_size, total_count)) for i in range(0, total_count, batch_size)]
 
+def _cached_submatrix(key):
+    cache = _get_cache()
+    if key in cache:
+        res = cache[key]
+        first = res.distances[0][0] if res.distances is not None and len(res.distances) else None
+        if first is None or first != first:
+            del cache[key]
+        else:
+            return res
+    return None
+
+
 #@lru_cache(maxsize=500)  # Cache size can be adjusted based on your environment and needs
 def fetch_submatrix(api, coords: List[List[float]], sources: List[int], destinations: List[int], profile: str) -> List[List[float]]:
     """Fetch a submatrix using the API, with caching via diskcache."""
 
     if ENABLE_DISTANCE_MATRIX_CACHE:
-        cache = _get_cache()
         key = (tuple(map(tuple, coords)), tuple(sources), tuple(destinations), profile)
-        if key in cache:
-            res=cache[key]
-            if res.distances[0][0] is None:
-                del cache[key]
-            else:
-                return res
+        res = _cached_submatrix(key)
+        if res is not None:
+            return res
     matrix = api.matrix(
         locations=coords,
         sources=sources,
         destinations=destinations,
-        profile=profile
+        profile=profile,
+        keep_raw=False,
     )
     if ENABLE_DISTANCE_MATRIX_CACHE:
-        cache = _get_cache()
-        cache[key] = matrix
+        _store_submatrix(key, matrix)
     return matrix
 
 
-def get_distance_matrix_batches(coords: List[List[float]], router_api, router_config) -> Dict:
-    num_coords = len(coords)
+def _store_submatrix(key, matrix):
+    _get_cache()[key] = matrix
+
+
+async def fetch_submatrix_async(api, coords: List[List[float]], sources: List[int], destinations: List[int], profile: str):
+    """
+    ``fetch_submatrix`` awaiting the router instead of blocking on it. The
+    diskcache is read and written in a worker thread, off the event loop.
+    """
+    if ENABLE_DISTANCE_MATRIX_CACHE:
+        key = (tuple(map(tuple, coords)), tuple(sources), tuple(destinations), profile)
+        res = await asyncio.to_thread(_cached_submatrix, key)
+        if res is not None:
+            return res
+    matrix = await api.matrix_async(
+        locations=coords,
+        sources=sources,
+        destinations=destinations,
+        profile=profile,
+        keep_raw=False,
+    )
+    if ENABLE_DISTANCE_MATRIX_CACHE:
+        await asyncio.to_thread(_store_submatrix, key, matrix)
+    return matrix
+
+
+def _empty_matrix(num_rows: int, num_columns: Optional[int] = None) -> Dict[str, np.ndarray]:
+    shape = (num_rows, num_rows if num_columns is None else num_columns)
+    return {'durations': np.zeros(shape), 'distances': np.zeros(shape)}
+
+
+def _place_tile(full_matrix: Dict[str, np.ndarray], result, origin_batch, destination_batch) -> None:
+    """Copy a tile into the full matrices at its offset, as one block per matrix."""
+    rows = slice(origin_batch[0], origin_batch[1])
+    columns = slice(destination_batch[0], destination_batch[1])
+    full_matrix['distances'][rows, columns] = np.asarray(result.distances, dtype=float)
+    full_matrix['durations'][rows, columns] = np.asarray(result.durations, dtype=float)
+
+
+def get_distance_matrix_batches(
+    coords: List[List[float]],
+    router_api,
+    router_config,
+    sources: Optional[List[int]] = None,
+    destinations: Optional[List[int]] = None,
+) -> Dict:
+    """
+    ``durations`` and ``distances`` matrices (numpy arrays, unreachable pairs
+    as NaN) fetched tile by tile: the full matrices of ``coords``, or only
+    the rows of ``sources`` and columns of ``destinations`` (indices into
+    ``coords``).
+    """
+    sources = list(range(len(coords))) if sources is None else list(sources)
+    destinations = list(range(len(coords))) if destinations is None else list(destinations)
     max_batch_size = router_config['max_batch_size']
     profile = router_config['profile']
-    full_matrix = {'durations': [[0] * num_coords for _ in range(num_coords)],
-                   'distances': [[0] * num_coords for _ in range(num_coords)]}
+    full_matrix = _empty_matrix(len(sources), len(destinations))
 
-    origin_batches = get_batches(num_coords, max_batch_size)
-    destination_batches = get_batches(num_coords, max_batch_size)
+    origin_batches = get_batches(len(sources), max_batch_size)
+    destination_batches = get_batches(len(destinations), max_batch_size)
 
     for origin_batch in origin_batches:
         for destination_batch in destination_batches:
-            origin_batch_indices = list(range(origin_batch[0], origin_batch[1]))
-            destination_batch_indices = list(range(destination_batch[0], destination_batch[1]))
+            origin_batch_indices = sources[origin_batch[0]:origin_batch[1]]
+            destination_batch_indices = destinations[destination_batch[0]:destination_batch[1]]
             result = fetch_submatrix(router_api, coords, origin_batch_indices, destination_batch_indices, profile)
-
-            for i, origin_index in enumerate(origin_batch_indices):
-                full_matrix['distances'][origin_index][destination_batch[0]:destination_batch[1]] = result.distances[i]
-                full_matrix['durations'][origin_index][destination_batch[0]:destination_batch[1]] = result.durations[i]
+            _place_tile(full_matrix, result, origin_batch, destination_batch)
 
     return full_matrix
 
 
+async def get_distance_matrix_batches_async(
+    coords: List[List[float]], router_api, router_config, concurrency: int = ROUTER_ASYNC_CONCURRENCY
+) -> Dict:
+    """
+    ``get_distance_matrix_batches`` with the tiles requested concurrently,
+    at most ``concurrency`` at a time.
+    """
+    num_coords = len(coords)
+    max_batch_size = router_config['max_batch_size']
+    profile = router_config['profile']
+    full_matrix = _empty_matrix(num_coords)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch_tile(origin_batch, destination_batch):
+        origin_batch_indices = list(range(origin_batch[0], origin_batch[1]))
+        destination_batch_indices = list(range(destination_batch[0], destination_batch[1]))
+        async with semaphore:
+            result = await fetch_submatrix_async(
+                router_api, coords, origin_batch_indices, destination_batch_indices, profile
+            )
+        _place_tile(full_matrix, result, origin_batch, destination_batch)
+
+    batches = get_batches(num_coords, max_batch_size)
+    await asyncio.gather(*(fetch_tile(origin, destination) for origin in batches for destination in batches))
+    return full_matrix
+
 
-def initialize_router(router_name: str, config: Dict, key_iterator):
+def initialize_router(router_name: str, config: Dict, key_iterator, base_url: Optional[str] = None):
     api_key = next(key_iterator)  # Get next key from the cyclic iterator
     try:
-        if router_name == 'ors':
-            return ORS(api_key=api_key)
-        elif router_name == 'mapbox_osrm':
-            return MapboxOSRM(api_key=api_key)
-        elif router_name == 'graphhopper':
-            return Graphhopper(api_key=api_key)
-        elif router_name == 'osrm':
-            return OSRM(base_url=ROUTING_ENGINE)
-        else:
-            raise ValueError(f"Unsupported router: {router_name}")
+        if router_name == 'osrm':
+            return get_router(router_name, base_url=base_url or ROUTING_ENGINE)
+        return get_router(router_name, api_key=api_key)
     except Exception as e:
         logging.error(f"Failed to initialize router {router_name} with API Key {api_key}: {e}")
         raise
 
 
+def _give_up(e) -> bool:
+    connection_error = isinstance(e, (requests.exceptions.ConnectionError, httpx.ConnectError))
+    return not connection_error or not current_budget().retry()
+
+
+def _routers_to_try(routers: Dict, router_name: Optional[str]) -> List[Tuple[str, Optional[Dict]]]:
+    if router_name:
+        return [(router_name, routers.get(router_name))]
+    # Sort routers by priority if no specific router_name is supplied
+    return sorted(routers.items(), key=lambda item: item[1]['priority'])
+
+
 @backoff.on_exception(backoff.expo,
                       requests.exceptions.RequestException,
                       max_tries=5,
-                      giveup=lambda e: not isinstance(e, requests.exceptions.ConnectionError))
-def get_distance_matrix_with_retry(coords: List[List[float]], routers: Dict=routers, router_name: str = None) -> Dict:
-    if router_name:
-        routers_to_try = [(router_name, routers.get(router_name))]
-    else:
-        # Sort routers by priority if no specific router_name is supplied
-        routers_to_try = sorted(routers.items(), key=lambda item: item[1]['priority'])
-
-    for name, router_config in routers_to_try:
+                      max_time=lambda: current_budget().remaining(),
+                      giveup=_give_up)
+def get_distance_matrix_with_retry(
+    coords: List[List[float]],
+    routers: Dict = routers,
+    router_name: str = None,
+    sources: Optional[List[int]] = None,
+    destinations: Optional[List[int]] = None,
+) -> Dict:
+    for name, router_config in _routers_to_try(routers, router_name):
         if not router_config:
             continue  # Skip if router configuration is not found
 
+        # no time left for this router nor the next ones: the caller falls back to estimates
+        current_budget().check()
         try:
             key_iterator = cycle(router_config['api_keys'])
             router_api = initialize_router(name, router_config, key_iterator)
-            result = get_distance_matrix_batches(coords, router_api, router_config)
+            result = get_distance_matrix_batches(coords, router_api, router_config, sources, destinations)
             if result:
                 return result  # Return the first successful result
+        except DeadlineExceeded:
+            raise
         except requests.exceptions.RequestException as e:
             logging.error(f"Network related error with {name}: {str(e)}")
             continue  # Continue with the next router in case of network error
@@ -192,6 +292,50 @@ def get_distance_matrix_with_retry(coords: List[List[float]], routers: Dict=rout
     raise Exception("All routing services failed or no valid router configurations found")
 
 
+@backoff.on_exception(backoff.expo,
+                      httpx.TransportError,
+                      max_tries=5,
+                      max_time=lambda: current_budget().remaining(),
+                      giveup=_give_up)
+async def _fetch_matrix_async(coords, router_api, router_config, concurrency):
+    return await get_distance_matrix_batches_async(coords, router_api, router_config, concurrency=concurrency)
+
+
+async def get_distance_matrix_with_retry_async(
+    coords: List[List[float]],
+    routers: Dict = routers,
+    router_name: str = None,
+    base_url: Optional[str] = None,
+    concurrency: int = ROUTER_ASYNC_CONCURRENCY,
+) -> Dict:
+    """
+    ``get_distance_matrix_with_retry`` for the event loop: connection errors
+    are retried with backoff within the job budget, then the next router by
+    priority is tried. ``base_url`` overrides the OSRM engine.
+    """
+    for name, router_config in _routers_to_try(routers, router_name):
+        if not router_config:
+            continue
+
+        current_budget().check()
+        try:
+            key_iterator = cycle(router_config['api_keys'])
+            router_api = initialize_router(name, router_config, key_iterator, base_url=base_url)
+            result = await _fetch_matrix_async(coords, router_api, router_config, concurrency)
+            if result:
+                return result
+        except DeadlineExceeded:
+            raise
+        except httpx.TransportError as e:
+            logging.error(f"Network related error with {name}: {str(e)}")
+            continue
+        except Exception as e:
+            logging.error(f"Error with {name}: {str(e)}")
+            continue
+
+    raise Exception("All routing services failed or no valid router configurations found")
+
+
 if __name__ == "__main__":
 #    config_path = os.getenv("ROUTER_CONFIG_PATH", "config.json")
 #    try:
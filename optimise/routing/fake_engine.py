@@ -0,0 +1,311 @@
+"""
+Local stand-in for a routing engine, for benchmarks and integration tests.
+
+``FakeRoutingEngine`` serves the OSRM ``table`` and ``route`` services and
+the ORS ``matrix`` service over HTTP, so the routers, the matrix tiling and
+retries, and the geometry fetches run unchanged against it, offline and
+reproducibly. Distances are haversine distances times ``detour_factor``;
+durations assume a constant ``speed_kmh``. Latency, random server errors
+(seeded), rate limiting and the largest matrix accepted are configurable, and
+``stats`` counts what the engine answered.
+
+    with FakeRoutingEngine(latency=0.02, error_rate=0.05) as engine:
+        router = OSRM(base_url=engine.url)
+"""
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+from optimise.routing.defaults import DEFAULT_DRIVING_SPEED_KMH
+from optimise.utils.decorators import TokenBucket
+from optimise.utils.haversine_distance import haversine_distance_matrix
+from optimise.utils.routing.utils import encode_polyline
+
+
+class _Reject(Exception):
+    def __init__(self, status: int, body: dict, headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+def _parse_coordinates(text: str) -> List[List[float]]:
+    try:
+        return [[float(value) for value in pair.split(",")][:2] for pair in unquote(text).split(";")]
+    except ValueError:
+        raise _Reject(400, {"code": "InvalidQuery", "message": "Query string malformed"})
+
+
+def _parse_indices(value: Optional[str], count: int) -> List[int]:
+    if value is None or value == "all":
+        return list(range(count))
+    try:
+        indices = [int(index) for index in value.split(";")]
+    except ValueError:
+        raise _Reject(400, {"code": "InvalidQuery", "message": "Query string malformed"})
+    if any(index < 0 or index >= count for index in indices):
+        raise _Reject(400, {"code": "InvalidOptions", "message": "Index out of bounds"})
+    return indices
+
+
+class FakeRoutingEngine:
+    """
+    OSRM/ORS-compatible HTTP server answering from haversine distances.
+
+    :param latency: Seconds every request waits before it is answered.
+    :param jitter: Extra random wait, up to this many seconds.
+    :param error_rate: Share of requests answered with a 503.
+    :param rate_limit: Requests per second allowed (token bucket), None for no limit.
+        Requests over the limit get a 429 with ``Retry-After``.
+    :param burst: Requests allowed back to back, ``rate_limit`` by default.
+    :param max_matrix_size: Most elements (sources x destinations) answered by
+        one matrix request; larger requests are refused, as the hosted APIs do.
+    :param seed: Seed of the jitter and errors, so runs are reproducible.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_matrix_size: Optional[int] = None,
+        speed_kmh: float = DEFAULT_DRIVING_SPEED_KMH,
+        detour_factor: float = 1.0,
+        seed: int = 0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_matrix_size = max_matrix_size
+        self.speed_mps = speed_kmh / 3.6
+        self.detour_factor = detour_factor
+        self.stats = Counter()
+        self._bucket = None
+        if rate_limit:
+            self._bucket = TokenBucket(rate_limit, burst if burst is not None else max(1.0, rate_limit))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running engine, for ``base_url`` of the routers."""
+        if self._server is None:
+            raise RuntimeError("The engine is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # answers
+
+    def table(self, locations: Sequence[Sequence[float]], sources: List[int], destinations: List[int]):
+        """Distances (m) and durations (s) from ``sources`` to ``destinations``."""
+        self._check_size(len(sources) * len(destinations))
+        points = np.asarray(locations, dtype=float)[:, ::-1]
+        # haversine_vector combines its arguments into a destinations x sources matrix
+        distances = haversine_distance_matrix(points[sources], points[destinations]).T * self.detour_factor
+        durations = distances / self.speed_mps
+        self._count("elements", len(sources) * len(destinations))
+        return np.round(distances, 1), np.round(durations, 1)
+
+    def route(self, locations: Sequence[Sequence[float]]) -> Tuple[List[float], List[float]]:
+        """Distance (m) and duration (s) of every leg between consecutive locations."""
+        points = np.asarray(locations, dtype=float)[:, ::-1]
+        distances = [
+            float(haversine_distance_matrix(points[i:i + 1], points[i + 1:i + 2])[0][0]) * self.detour_factor
+            for i in range(len(points) - 1)
+        ]
+        return [round(d, 1) for d in distances], [round(d / self.speed_mps, 1) for d in distances]
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[name] += amount
+
+    def _check_size(self, elements: int, body: Optional[dict] = None) -> None:
+        if self.max_matrix_size is not None and elements > self.max_matrix_size:
+            self._count("too_big")
+            raise _Reject(400, body or {"code": "TooBig", "message": "Too many table coordinates"})
+
+    def _admit(self) -> None:
+        """Wait the configured latency, then rate limit and fail as configured."""
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if self._bucket is not None and not self._bucket.try_acquire():
+            self._count("rate_limited")
+            raise _Reject(429, {"code": "TooManyRequests", "message": "Rate limit exceeded"}, {"Retry-After": "1"})
+        if fail:
+            self._count("errors")
+            raise _Reject(503, {"code": "ServiceUnavailable", "message": "Injected failure"})
+
+    # OSRM / ORS services
+
+    def osrm_table(self, coordinates: str, query: Dict[str, str]) -> dict:
+        locations = _parse_coordinates(coordinates)
+        sources = _parse_indices(query.get("sources"), len(locations))
+        destinations = _parse_indices(query.get("destinations"), len(locations))
+        distances, durations = self.table(locations, sources, destinations)
+        annotations = query.get("annotations", "duration").split(",")
+        body = {"code": "Ok", "sources": self._waypoints(locations, sources)}
+        body["destinations"] = self._waypoints(locations, destinations)
+        if "duration" in annotations:
+            body["durations"] = durations.tolist()
+        if "distance" in annotations:
+            body["distances"] = distances.tolist()
+        return body
+
+    def osrm_route(self, coordinates: str, query: Dict[str, str]) -> dict:
+        locations = _parse_coordinates(coordinates)
+        if len(locations) < 2:
+            raise _Reject(400, {"code": "InvalidQuery", "message": "At least two coordinates are needed"})
+        distances, durations = self.route(locations)
+        legs = [
+            {"distance": distance, "duration": duration, "summary": "", "steps": []}
+            for distance, duration in zip(distances, durations)
+        ]
+        route = {"distance": round(sum(distances), 1), "duration": round(sum(durations), 1), "legs": legs}
+        route["weight"] = route["duration"]
+        route["weight_name"] = "duration"
+        overview = query.get("overview", "simplified")
+        if overview != "false":
+            geometries = query.get("geometries", "polyline")
+            if geometries == "geojson":
+                route["geometry"] = {"type": "LineString", "coordinates": locations}
+            elif geometries == "polyline6":
+                route["geometry"] = encode_polyline(locations, precision=6)
+            else:
+                route["geometry"] = encode_polyline(locations)
+        return {"code": "Ok", "routes": [route], "waypoints": self._waypoints(locations, range(len(locations)))}
+
+    def ors_matrix(self, params: dict) -> dict:
+        locations = params.get("locations") or []
+        if len(locations) < 2:
+            raise _Reject(400, {"error": {"code": 6002, "message": "At least two locations are needed"}})
+        sources = params.get("sources") or list(range(len(locations)))
+        destinations = params.get("destinations") or list(range(len(locations)))
+        if any(not 0 <= index < len(locations) for index in list(sources) + list(destinations)):
+            raise _Reject(400, {"error": {"code": 6003, "message": "Source or destination index out of range"}})
+        self._check_size(
+            len(sources) * len(destinations),
+            {"error": {"code": 6004, "message": "Request parameters exceed the server limits"}},
+        )
+        distances, durations = self.table(locations, sources, destinations)
+        body = {"metadata": {"service": "matrix", "engine": "fake"}}
+        metrics = params.get("metrics") or ["duration"]
+        if "duration" in metrics:
+            body["durations"] = durations.tolist()
+        if "distance" in metrics:
+            body["distances"] = distances.tolist()
+        body["sources"] = self._waypoints(locations, sources)
+        body["destinations"] = self._waypoints(locations, destinations)
+        return body
+
+    @staticmethod
+    def _waypoints(locations, indices) -> List[dict]:
+        return [{"location": list(locations[i]), "name": "", "distance": 0.0} for i in indices]
+
+    # server
+
+    def _bind(self) -> None:
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.engine = self
+
+    def start(self) -> "FakeRoutingEngine":
+        """Serve in a background thread; ``url`` is set once this returns."""
+        self._bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        self._bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "FakeRoutingEngine":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._answer(self._get)
+
+    def do_POST(self):
+        self._answer(self._post)
+
+    def _get(self, engine: FakeRoutingEngine, parts: List[str], query: Dict[str, str], content: bytes) -> dict:
+        # /{service}/v1/{profile}/{coordinates}
+        if len(parts) == 4 and parts[1] == "v1":
+            if parts[0] == "table":
+                return engine.osrm_table(parts[3], query)
+            if parts[0] == "route":
+                return engine.osrm_route(parts[3], query)
+        raise _Reject(400, {"code": "InvalidUrl", "message": f"URL string malformed: {self.path}"})
+
+    def _post(self, engine: FakeRoutingEngine, parts: List[str], query: Dict[str, str], content: bytes) -> dict:
+        # /v2/matrix/{profile}[/json]
+        if len(parts) in (3, 4) and parts[:2] == ["v2", "matrix"]:
+            try:
+                params = json.loads(content or b"{}")
+            except json.JSONDecodeError:
+                raise _Reject(400, {"error": {"code": 6000, "message": "Unable to parse JSON request"}})
+            return engine.ors_matrix(params)
+        raise _Reject(404, {"error": {"code": 6099, "message": f"Unknown endpoint: {self.path}"}})
+
+    def _answer(self, route) -> None:
+        engine = self.server.engine
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        # read the whole request first so the kept-alive connection stays usable
+        content = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        try:
+            engine._admit()
+            status, body, headers = 200, route(engine, parts, query, content), {}
+        except _Reject as reject:
+            status, body, headers = reject.status, reject.body, reject.headers
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
@@ -21,6 +21,8 @@ class SolverInput:
     soft_time_windows: List[Optional[Tuple[int, int, int]]] = field(default_factory=list)
     precedence_constraints: List[Tuple[int, int]] = field(default_factory=list)
     allowed_vehicles_by_node: Dict[int, List[int]] = field(default_factory=dict)
+    # Routes (visited nodes per vehicle) the search starts from
+    initial_routes: List[List[int]] = field(default_factory=list)
 
     # Capacity / working time
     max_working_time: int = 0
@@ -54,6 +56,9 @@ class SolverInput:
     local_search_metaheuristic: Optional[str] = None
     time_limit_seconds: Optional[int] = None
     no_improvement_limit: Optional[int] = None
+    optimality_gap: Optional[float] = None
+    alternatives: int = 0
+    solver_backend: Optional[str] = None
 
     # Objective
     objective: Optional[str] = None
@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field, fields
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from optimise.routing.defaults import WIRE_SHARED_MEMORY_MIN_CELLS
+from optimise.routing.input.solver_input import SolverInput
+
+# SolverInput fields that are shipped as numeric arrays instead of nested lists.
+MATRIX_FIELDS = ("time_matrix", "distance_matrix", "haversine_distance")
+VECTOR_FIELDS = ("time_windows", "service_durations", "penalties")
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """
+    Reference to an array living in a named shared memory segment.
+    Only the name, shape and dtype cross the process boundary.
+    """
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    def read(self) -> np.ndarray:
+        segment = shared_memory.SharedMemory(name=self.name)
+        try:
+            view = np.ndarray(self.shape, dtype=self.dtype, buffer=segment.buf)
+            return view.copy()
+        finally:
+            segment.close()
+
+
+@dataclass(frozen=True)
+class PackedSolverInput:
+    """
+    Compact, picklable form of a SolverInput. Numeric fields are stored as
+    numpy arrays (or shared memory references for large matrices); all other
+    fields are kept as-is since they are small.
+    """
+
+    arrays: Dict[str, Any] = field(default_factory=dict)
+    values: Dict[str, Any] = field(default_factory=dict)
+
+
+def _to_shared(array: np.ndarray, segments: List[shared_memory.SharedMemory]) -> SharedArray:
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    segments.append(segment)
+    target = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+    target[...] = array
+    return SharedArray(name=segment.name, shape=tuple(array.shape), dtype=array.dtype.str)
+
+
+def pack_solver_input(
+    solver_input: SolverInput,
+    shared_memory_min_cells: Optional[int] = None,
+) -> Tuple[PackedSolverInput, List[shared_memory.SharedMemory]]:
+    """
+    Pack a SolverInput into its compact wire form.
+
+    Matrices with at least ``shared_memory_min_cells`` cells are copied into
+    shared memory. The returned segments are owned by the caller, which must
+    call ``release_segments`` once every consumer is done.
+    """
+    min_cells = (
+        WIRE_SHARED_MEMORY_MIN_CELLS
+        if shared_memory_min_cells is None
+        else shared_memory_min_cells
+    )
+    arrays: Dict[str, Any] = {}
+    values: Dict[str, Any] = {}
+    segments: List[shared_memory.SharedMemory] = []
+
+    for item in fields(SolverInput):
+        value = getattr(solver_input, item.name)
+        if item.name in MATRIX_FIELDS and value is not None:
+            array = np.asarray(value)
+            if min_cells > 0 and array.size >= min_cells:
+                arrays[item.name] = _to_shared(array, segments)
+            else:
+                arrays[item.name] = array
+        elif item.name in VECTOR_FIELDS and value is not None and len(value) > 0:
+            arrays[item.name] = np.asarray(value)
+        else:
+            values[item.name] = value
+
+    return PackedSolverInput(arrays=arrays, values=values), segments
+
+
+def unpack_solver_input(packed: PackedSolverInput) -> SolverInput:
+    """
+    Rebuild a SolverInput from its wire form. Arrays are converted back to
+    plain Python lists so OR-Tools callbacks receive native ints.
+    """
+    kwargs = dict(packed.values)
+    for name, value in packed.arrays.items():
+        array = value.read() if isinstance(value, SharedArray) else value
+        as_list = array.tolist()
+        if name == "time_windows":
+            as_list = [tuple(window) for window in as_list]
+        kwargs[name] = as_list
+    return SolverInput(**kwargs)
+
+
+def release_segments(segments: List[shared_memory.SharedMemory]) -> None:
+    for segment in segments:
+        segment.close()
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
@@ -1,18 +1,24 @@
+import contextvars
 import copy
+import logging
 from datetime import timedelta
+import numpy as np
 from optimise.routing.core.functions import get_optimizer_strategy
 from optimise.routing.constants import translate
 from optimise.routing.model.depot import Depot
 from optimise.routing.model.home import Home
+from optimise.routing.model.location_index import LocationIndex
 from optimise.utils.dates import datetime_to_integer
 from optimise.routing.defaults import *
 from optimise.utils.dates import date_from_string
 from datetime import datetime
 from typing import List, Optional, Union, Dict, Any
-from optimise.utils.dates import convert_units
+from optimise.utils.dates import convert_units, conversion_factors
 from optimise.routing.distance_matrix import get_distance_matrix_with_retry
+from optimise.utils.retry_budget import DeadlineExceeded
 from optimise.utils.haversine_distance import haversine_distance_matrix
 
+logger = logging.getLogger("app")
 
 
 """
@@ -129,6 +135,16 @@ class Instance:
         self.zone_restrictions = []
         self.traffic_mode = None
         self.traffic_include_historical = False
+        self.optimality_gap = None
+        self.solver_backend = None
+        self.adaptive_strategy = None
+        self.day_assignment = None
+        self.alternatives = 0
+        self.route_templates = None
+        self.day_plan = {}
+        self.restrict_vehicles_by_skill = False
+        self._location_index = LocationIndex()
+        self._day_location_index = {}
     def __repr__(self):
         return self.name
 
@@ -141,7 +157,17 @@ class Instance:
     """
     @property
     def work_orders(self):
-        return [w for w in self._work_orders if w.is_eligible]
+        return [w for w in self._work_orders if w.is_eligible and self.is_planned(w)]
+
+    def is_planned(self, wo):
+        """
+        Orders assigned to a day by the day plan are only routed from that day
+        on; orders it could not place keep their whole window.
+        """
+        if not self.day_plan:
+            return True
+        planned_date = self.day_plan.get(str(wo.id))
+        return planned_date is None or self.current_optimization_date.date() >= planned_date
 
 
     def add_workorder(self, wo):
@@ -216,7 +242,113 @@ class Instance:
     @property
     def nb_depots(self):
         return len(self.depots)
-    def init_instance(self, date):
+    def _add_day_location(self, address, latitude, longitude, make_node):
+        index = self._day_location_index.get(address)
+        if index is None:
+            index = len(self.locations)
+            self._day_location_index[address] = index
+            self.locations.append({"address":address, "latitude":latitude, "longitude":longitude})
+            self.service_durations.append(0)
+            node = make_node()
+            node.instance = self
+            self.depots.append(node)
+        return index
+
+    def _fetch_matrices(self, coordinates, sources, destinations):
+        """
+        Matrices from the ``sources`` to the ``destinations`` (indices into
+        ``coordinates``), see LocationIndex.extend.
+        """
+        origins = [list(coordinates[i]) for i in sources]
+        targets = [list(coordinates[i]) for i in destinations]
+        # haversine_vector pairs every destination with every origin
+        haversine = np.asarray(haversine_distance_matrix(origins, targets), dtype=float).T
+        if self.distance_matrix_method == "haversine":
+            return self._estimated_matrices(haversine)
+        # distance_data = get_distance_matrix(method=self.distance_matrix_method, destinations=tuple([(l["latitude"], l["longitude"]) for l in self.locations]), departure_time=self.departure_time,error_language=self.language)
+        try:
+            distance_data = get_distance_matrix_with_retry(
+                [[lon, lat] for lat, lon in coordinates], sources=list(sources), destinations=list(destinations)
+            )
+        except DeadlineExceeded:
+            logger.warning("No time left to fetch the travel matrix: using haversine estimates")
+            return self._estimated_matrices(haversine)
+        except Exception as e:
+            raise ValueError(translate("failed_to_create_distance_matrix", self.language).format(e))
+        return distance_data["durations"], distance_data["distances"], haversine
+
+    def _estimated_matrices(self, haversine):
+        """Travel times estimated from the haversine distances at the driving speed."""
+        speed_mps = (self.driving_speed_kmh * 1000) / 3600.0
+        # same truncation as convert_units(dist / speed_mps, "seconds", ...), applied to the whole matrix
+        seconds_per_unit = conversion_factors[ROUTING_TIME_RESOLUTION]
+        seconds = np.asarray(haversine, dtype=float) / speed_mps if speed_mps > 0 else np.zeros(np.shape(haversine))
+        time_matrix = (seconds / seconds_per_unit).astype(np.int64)
+        return time_matrix, haversine, haversine
+
+    def travel_times(self, coordinates):
+        """
+        Travel time matrix between ``coordinates``, served from the location
+        index. Precomputed matrices only cover the locations of a single day,
+        so with them the times are estimated from the haversine distances.
+        """
+        if self.precomputed_distance_matrix and self.precomputed_time_matrix:
+            speed_mps = (self.driving_speed_kmh * 1000) / 3600.0
+            haversine = np.asarray(haversine_distance_matrix([list(c) for c in coordinates]), dtype=float)
+            if speed_mps <= 0:
+                return np.zeros_like(haversine)
+            return haversine / speed_mps / conversion_factors[ROUTING_TIME_RESOLUTION]
+        missing = self._location_index.missing(coordinates)
+        if missing:
+            self._location_index.extend(missing, self._fetch_matrices)
+        time_matrix, _distance_matrix, _haversine = self._location_index.submatrices(coordinates)
+        return np.asarray(time_matrix, dtype=float)
+
+    def candidate_coordinates(self, date):
+        """
+        Coordinates that may appear on ``date`` or a later day of the horizon:
+        every start/end of the workers and every pending order whose window
+        has not ended. A superset of what init_instance will need.
+        """
+        coordinates = []
+        for e in self._workers:
+            for place in (self.start_at, self.end_at):
+                if place == "depot" and e.depot:
+                    coordinates.append((e.depot["latitude"], e.depot["longitude"]))
+                elif place == "home":
+                    coordinates.append((e.latitude, e.longitude))
+        for wo in self._work_orders:
+            if wo.is_scheduled or wo.latitude is None or wo.longitude is None:
+                continue
+            if wo.latest_end is not None and wo.latest_end.date() < date.date():
+                continue
+            coordinates.append((wo.latitude, wo.longitude))
+        return coordinates
+
+    def prefetch_locations(self, date, executor):
+        """
+        Fetch in the background the matrices of the coordinates the days from
+        ``date`` on may need. init_instance waits for the fetch if it needs
+        one of these coordinates, and fetches itself if the prefetch failed.
+        """
+        if (
+            self.precomputed_distance_matrix and self.precomputed_time_matrix
+        ) or self.distance_matrix_method == "haversine":
+            return None
+        missing = self._location_index.missing(self.candidate_coordinates(date))
+        if not missing:
+            return None
+
+        def prefetch():
+            try:
+                self._location_index.extend(missing, self._fetch_matrices)
+            except Exception as e:
+                logger.warning(f"Matrix prefetch for {date} failed: {e}")
+
+        # the prefetch spends the retry budget of the job that asked for it
+        return executor.submit(contextvars.copy_context().run, prefetch)
+
+    def init_instance(self, date, prefetch_pending=True):
         self.locations=[]
         self.starts=[]
         self.ends=[]
@@ -230,6 +362,7 @@ class Instance:
         self.current_optimization_date=date
         self.allow_soft_time_windows = False
         self.location_priorities=[]
+        self._day_location_index={}
 
 
 
@@ -238,57 +371,54 @@ class Instance:
 
         for w in self.workers:
             w.init_worker()
-        if len(self.work_orders)>0 and len(self.workers)==0:
+        # eligibility is date dependent and costly to evaluate: compute the day's sets once
+        workers = self.workers
+        work_orders = self.work_orders
+        if len(work_orders)>0 and len(workers)==0:
             #there is no worker to handle these work order_or_worker
-            for wo in self.work_orders:
+            for wo in work_orders:
                 message=translate("NO_SKILL_MATCH",self.language).format(wo.skill)
                 if message not in wo.errors:
                     wo.errors.append(message)
 
-        if len(self.work_orders)==0 or len(self.workers)==0:
+        if len(work_orders)==0 or len(workers)==0:
             #there is no worker to handle these work order_or_worker
             return
+        if self.restrict_vehicles_by_skill:
+            available_skills = {skill for w in workers for skill in w.skills}
+            for wo in work_orders:
+                if wo.skill not in available_skills:
+                    message=translate("NO_SKILL_MATCH",self.language).format(wo.skill)
+                    if message not in wo.errors:
+                        wo.errors.append(message)
 
         if self.start_at=="depot":
-            for e in self.workers:
-                if not any(location.get("address") == e.depot["address"] for location in self.locations):
-                    self.locations.append({"address":e.depot["address"], "latitude":e.depot["latitude"], "longitude":e.depot["longitude"]})
-                    self.service_durations.append(0)
-                    depot=Depot(e.depot["id"], e.depot["address"], latitude=e.depot["latitude"], longitude=e.depot["longitude"])
-                    depot.instance=self
-                    self.depots.append(depot)
-                self.starts.append(next((index for index, location in enumerate(self.locations) if location.get("address") == e.depot["address"]), 0))
+            for e in workers:
+                self.starts.append(self._add_day_location(
+                    e.depot["address"], e.depot["latitude"], e.depot["longitude"],
+                    lambda: Depot(e.depot["id"], e.depot["address"], latitude=e.depot["latitude"], longitude=e.depot["longitude"])))
         if self.start_at=="home":
-            for e in self.workers:
-                if not any(location.get("address") == e.address for location in self.locations):
-                    self.locations.append({"address":e.address, "latitude":e.latitude, "longitude":e.longitude})
-                    self.service_durations.append(0)
-                    home=Home(e.id, e.address, latitude=e.latitude, longitude=e.longitude)
-                    home.instance=self
-                    self.depots.append(home)
-                self.starts.append(next((index for index, location in enumerate(self.locations) if location.get("address") == e.address), 0))
+            for e in workers:
+                self.starts.append(self._add_day_location(
+                    e.address, e.latitude, e.longitude,
+                    lambda: Home(e.id, e.address, latitude=e.latitude, longitude=e.longitude)))
         if self.end_at=="depot":
-            for e in self.workers:
-                if not any(location.get("address") == e.depot["address"] for location in self.locations):
-                    self.locations.append({"address":e.depot["address"], "latitude":e.depot["latitude"], "longitude":e.depot["longitude"]})
-                    self.service_durations.append(0)
-                    depot=Depot(e.id, e.depot["address"], latitude=e.depot["latitude"], longitude=e.depot["longitude"])
-                    depot.instance=self
-                    self.depots.append(depot)
-                self.ends.append(next((index for index, location in enumerate(self.locations) if location.get("address") == e.depot["address"]), 0))
+            for e in workers:
+                self.ends.append(self._add_day_location(
+                    e.depot["address"], e.depot["latitude"], e.depot["longitude"],
+                    lambda: Depot(e.id, e.depot["address"], latitude=e.depot["latitude"], longitude=e.depot["longitude"])))
         if self.end_at=="home":
-            for e in self.workers:
-                if not any(location.get("address") == e.address for location in self.locations):
-                    self.locations.append({"address":e.address, "latitude":e.latitude, "longitude":e.longitude})
-                    self.service_durations.append(0)
-                    home=Home(e.id, e.address, latitude=e.latitude, longitude=e.longitude)
-                    home.instance=self
-                    self.depots.append(home)
-                self.ends.append(next((index for index, location in enumerate(self.locations) if location.get("address") == e.address), 0))
-
-        self.locations.extend([{"address":r.address, "latitude":r.latitude, "longitude":r.longitude} for r in self.work_orders])
-        location_latlon = [[l["latitude"], l["longitude"]] for l in self.locations]
-        location_lonlat = [[l["longitude"], l["latitude"]] for l in self.locations]
+            for e in workers:
+                self.ends.append(self._add_day_location(
+                    e.address, e.latitude, e.longitude,
+                    lambda: Home(e.id, e.address, latitude=e.latitude, longitude=e.longitude)))
+
+        self.locations.extend([{"address":r.address, "latitude":r.latitude, "longitude":r.longitude} for r in work_orders])
+        for order in work_orders:
+            self.service_durations.append(order.work_order_duration)
+            self.penalties.append(10000)
+
+        coordinates = [(l["latitude"], l["longitude"]) for l in self.locations]
         if (
             self.precomputed_distance_matrix
             and self.precomputed_time_matrix
@@ -297,34 +427,19 @@ class Instance:
         ):
             self.distance_matrix = self.precomputed_distance_matrix
             self.time_matrix = self.precomputed_time_matrix
-            self.haversine_distance = haversine_distance_matrix(location_latlon)
-            for order in self.work_orders:
-                self.service_durations.append(order.work_order_duration)
-                self.penalties.append(10000)
-        elif self.distance_matrix_method == "haversine":
-            self.haversine_distance = haversine_distance_matrix(location_latlon)
-            self.distance_matrix = self.haversine_distance
-            speed_mps = (self.driving_speed_kmh * 1000) / 3600.0
-            self.time_matrix = [
-                [
-                    int(convert_units((dist / speed_mps) if speed_mps > 0 else 0, "seconds", self.language, ROUTING_TIME_RESOLUTION))
-                    for dist in row
-                ]
-                for row in self.distance_matrix
-            ]
+            self.haversine_distance = haversine_distance_matrix([list(c) for c in coordinates])
         else:
-            # distance_data = get_distance_matrix(method=self.distance_matrix_method, destinations=tuple([(l["latitude"], l["longitude"]) for l in self.locations]), departure_time=self.departure_time,error_language=self.language)
-            try:
-                distance_data = get_distance_matrix_with_retry(location_lonlat)
-                self.distance_matrix = distance_data["distances"]
-                self.time_matrix = distance_data["durations"]
-            except Exception as e:
-                raise ValueError(translate("failed_to_create_distance_matrix", self.language).format(e))
-
-            self.haversine_distance = haversine_distance_matrix(location_latlon)
-            for order in self.work_orders:
-                self.service_durations.append(order.work_order_duration)
-                self.penalties.append(10000)
+            missing = self._location_index.missing(coordinates)
+            if missing:
+                if prefetch_pending and self.optimization_horizon and self.optimization_horizon > 1:
+                    # later days only pick from the pending orders: fetch them now so
+                    # that the following days are served from the index
+                    missing.extend(
+                        (wo.latitude, wo.longitude) for wo in self._work_orders
+                        if not wo.is_scheduled and wo.latitude is not None and wo.longitude is not None
+                    )
+                self._location_index.extend(missing, self._fetch_matrices)
+            self.time_matrix, self.distance_matrix, self.haversine_distance = self._location_index.submatrices(coordinates)
 
         if self.traffic_mode == "predictive" and self.time_matrix:
             multiplier = 1.05
@@ -340,7 +455,7 @@ class Instance:
                                                      intra_day=True)) for i in range(0, self.nb_depots)]
         self.soft_time_windows = [None for _ in range(0, self.nb_depots)]
 
-        for order in self.work_orders:
+        for order in work_orders:
             self.time_windows.append(order.get_time_constraint())
             preferred_window = order.get_preferred_time_constraint()
             penalty = order.soft_time_window_penalty
@@ -352,7 +467,7 @@ class Instance:
             else:
                 self.soft_time_windows.append(None)
 
-        for i, wo in enumerate(self.work_orders):
+        for i, wo in enumerate(work_orders):
             self.location_priorities.append((i + self.nb_depots, wo.priority))
     """
     Returns a list of work orders that are not scheduled.
@@ -476,6 +591,12 @@ class Instance:
             instance.task_dependencies = instance_data.get("task_dependencies", [])
             instance.zone_restrictions = instance_data.get("zone_restrictions", [])
             instance.traffic_mode = instance_data.get("traffic_mode")
+            instance.optimality_gap = instance_data.get("optimality_gap")
+            instance.solver_backend = instance_data.get("solver_backend")
+            instance.adaptive_strategy = instance_data.get("adaptive_strategy")
+            instance.day_assignment = instance_data.get("day_assignment")
+            instance.alternatives = instance_data.get("alternatives") or 0
+            instance.route_templates = instance_data.get("route_templates")
             instance.traffic_include_historical = bool(
                 instance_data.get("traffic_include_historical", False)
             )
@@ -0,0 +1,94 @@
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+Coordinate = Tuple[float, float]
+MatrixFetcher = Callable[[List[Coordinate], List[int], List[int]], Tuple[list, list, list]]
+
+"""
+Persistent coordinate index over the travel matrices of an Instance.
+"""
+class LocationIndex:
+    """
+    Keeps a coordinate -> row mapping and the (time, distance, haversine)
+    matrices of every coordinate seen so far, so that each optimisation day
+    only slices the rows it needs and only fetches coordinates it has never
+    seen before.
+    """
+    def __init__(self) -> None:
+        self._rows: Dict[Coordinate, int] = {}
+        self._time: Optional[np.ndarray] = None
+        self._distance: Optional[np.ndarray] = None
+        self._haversine: Optional[np.ndarray] = None
+        # Held while fetching, so readers wait for an in-flight prefetch.
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, coordinate: Coordinate) -> bool:
+        return coordinate in self._rows
+
+    def missing(self, coordinates: Iterable[Coordinate]) -> List[Coordinate]:
+        with self._lock:
+            return self._missing(coordinates)
+
+    def _missing(self, coordinates: Iterable[Coordinate]) -> List[Coordinate]:
+        seen = set()
+        missing = []
+        for coordinate in coordinates:
+            if coordinate not in self._rows and coordinate not in seen:
+                seen.add(coordinate)
+                missing.append(coordinate)
+        return missing
+
+    def extend(self, coordinates: Iterable[Coordinate], fetch: MatrixFetcher) -> None:
+        """
+        Add ``coordinates`` to the index. ``fetch`` receives the known plus
+        new coordinates (latitude, longitude) with the ``sources`` and
+        ``destinations`` to fetch (indices into them) and returns the three
+        matrices from the sources to the destinations. Only the rows and
+        columns of the new coordinates are fetched: their rows against every
+        coordinate, then the known rows against them.
+        """
+        with self._lock:
+            new = self._missing(coordinates)
+            if not new:
+                return
+            known = len(self._rows)
+            ordered = list(self._rows) + new
+            rows = list(range(len(ordered)))
+            below = [np.asarray(matrix) for matrix in fetch(ordered, rows[known:], rows)]
+            if not known:
+                self._time, self._distance, self._haversine = below
+            else:
+                right = [np.asarray(matrix) for matrix in fetch(ordered, rows[:known], rows[known:])]
+                grown = []
+                for current, new_rows, new_columns in zip((self._time, self._distance, self._haversine), below, right):
+                    matrix = np.empty((len(ordered), len(ordered)), dtype=np.result_type(current, new_rows, new_columns))
+                    matrix[:known, :known] = current
+                    matrix[:known, known:] = new_columns
+                    matrix[known:] = new_rows
+                    grown.append(matrix)
+                self._time, self._distance, self._haversine = grown
+            self._rows = {coordinate: row for row, coordinate in enumerate(ordered)}
+
+    def submatrices(self, coordinates: List[Coordinate]) -> Tuple[list, list, list]:
+        with self._lock:
+            rows = np.fromiter((self._rows[c] for c in coordinates), dtype=np.int64, count=len(coordinates))
+            grid = np.ix_(rows, rows)
+            return (
+                self._time[grid].tolist(),
+                self._distance[grid].tolist(),
+                self._haversine[grid].tolist(),
+            )
@@ -2,8 +2,10 @@ from optimise.routing.model import WorkOrder
 from optimise.utils.dates import convert_time_to_app_unit, format_time_as_hours_minutes
 import copy
 
+from optimise.routing.solver.tours import assignment_tours
+
 class Solution:
-    def __init__(self, instance, assignement, routing_model, manager):
+    def __init__(self, instance, assignement, routing_model, manager, tours=None, objective_value=None):
         self.instance = instance
         self.assignement = assignement
         self.routing_model=routing_model
@@ -13,44 +15,50 @@ class Solution:
         self.objective_value=0
         if assignement is not None:
             self.objective_value=assignement.ObjectiveValue()
+            tours = assignment_tours(assignement, routing_model, manager)
+        elif objective_value is not None:
+            self.objective_value=objective_value
         self.__dropped_nodes=[]
         self.current_date = self.instance.current_optimization_date
-        if assignement is not None:
-            self._init_solution()
+        if tours is not None:
+            self._init_solution(tours)
             self.results=self._get_results()
-            self.print_status()
+            if assignement is not None:
+                self.print_status()
         else:
             self.results = None
 
-    def _init_solution(self):
+    @classmethod
+    def from_tours(cls, instance, tours, objective_value):
+        """
+        Solution of the current day from the tour of every worker, without
+        the routing model (e.g. routes solved in another process).
+        """
+        return cls(instance, None, None, None, tours=tours, objective_value=objective_value)
 
-        time_dimension = self.routing_model.GetDimensionOrDie('Time')
+    def _node(self, node_index):
+        if node_index < self.instance.nb_depots:
+            return self.instance.depots[node_index]
+        return self.instance.work_orders[node_index - self.instance.nb_depots]
+
+    def _init_solution(self, tours):
 
-        num_workers = len(self.instance.workers)
-        for worker_id in range(num_workers):
-                index = self.routing_model.Start(worker_id)
-                previous_index = index
+        for worker_id, tour in enumerate(tours[:len(self.instance.workers)]):
                 worker = self.instance.workers[worker_id]
-                i = 0
-                time_to_next_node = 0
+                previous_node_index = tour[0][0]
                 previous_node_leave_time = 0
-                while not self.routing_model.IsEnd(index):
+                for i, (node_index, visit_time) in enumerate(tour[:-1]):
 
-                    node_index = self.manager.IndexToNode(index)
-                    if node_index < self.instance.nb_depots:
-                        node = self.instance.depots[node_index]
-                    else:
-                        node = self.instance.work_orders[node_index - self.instance.nb_depots]
+                    node = self._node(node_index)
 
                     node.date = self.current_date.strftime(format="%Y-%m-%d")
-                    travel_var = time_dimension.CumulVar(index)
-                    node._visit_start_time = self.assignement.Min(travel_var)
-                    node_leave_time = self.assignement.Min(travel_var)
+                    node._visit_start_time = visit_time
+                    node_leave_time = visit_time
                     slack_time = 0
                     if i == 0:
                         day_start= convert_time_to_app_unit(worker.day_starts_at)
                         if node_leave_time <= day_start:
-                            node._visit_start_time = self.assignement.Min(travel_var)
+                            node._visit_start_time = visit_time
                             worker.tour_start_time = format_time_as_hours_minutes(day_start)
                             worker.tour_end_time = format_time_as_hours_minutes(node_leave_time)
                             node.wait_time_minutes = 0
@@ -63,38 +71,29 @@ class Solution:
                     else:
                         slack_time = max(
                             node_leave_time - previous_node_leave_time -
-                            self.instance.time_matrix[self.manager.IndexToNode(previous_index)][
+                            self.instance.time_matrix[previous_node_index][
                                 node_index] - node.work_order_duration, 0)
                         node.slack_time = slack_time
 
-                    node.travel_distance = self.instance.distance_matrix[self.manager.IndexToNode(previous_index)][
-                        node_index]
-                    node.travel_time = self.instance.time_matrix[self.manager.IndexToNode(previous_index)][node_index]
+                    node.travel_distance = self.instance.distance_matrix[previous_node_index][node_index]
+                    node.travel_time = self.instance.time_matrix[previous_node_index][node_index]
 
                     node.step_number = i
                     worker.add_work_order(node=node, slack_time=slack_time)
-                    #                time_to_next_node = self.assignement.Min(travel_var)
-                    previous_index = index
+                    previous_node_index = node_index
                     previous_node_leave_time = node_leave_time
-                    index = self.assignement.Value(self.routing_model.NextVar(index))
 
-                    i += 1
-
-                node_index = self.manager.IndexToNode(index)
-                if node_index < self.instance.nb_depots:
-                    node = self.instance.depots[node_index]
-                else:
-                    node = self.instance.work_orders[node_index - self.instance.nb_depots]
+                node_index, visit_time = tour[-1]
+                node = self._node(node_index)
 
                 node.date = self.current_date.strftime(format="%Y-%m-%d")
-                travel_var = time_dimension.CumulVar(index)
-                node._visit_start_time = self.assignement.Min(travel_var)
-                node_leave_time = self.assignement.Min(travel_var)
+                node._visit_start_time = visit_time
+                node_leave_time = visit_time
                 day_end = convert_time_to_app_unit(worker.day_ends_at)
 
                 slack_time = 0
                 if node_leave_time > day_end:
-                    node._visit_start_time = self.assignement.Min(travel_var)
+                    node._visit_start_time = visit_time
                     worker.tour_end_time = format_time_as_hours_minutes(node_leave_time)
                     worker.tour_start_time =format_time_as_hours_minutes(node_leave_time)
                     node.wait_time_minutes = 0
@@ -106,9 +105,8 @@ class Solution:
                     node.wait_time_minutes = day_end - node_leave_time
                     slack_time = node.wait_time_minutes
 
-                node.travel_distance = self.instance.distance_matrix[self.manager.IndexToNode(previous_index)][
-                    node_index]
-                node.travel_time = self.instance.time_matrix[self.manager.IndexToNode(previous_index)][node_index]
+                node.travel_distance = self.instance.distance_matrix[previous_node_index][node_index]
+                node.travel_time = self.instance.time_matrix[previous_node_index][node_index]
 
                 worker.add_work_order(node=node, slack_time=slack_time)
 
@@ -1,8 +1,9 @@
 from typing import Dict, Any, List
 from optimise.routing.defaults import DEFAULT_GEOCODING_SERVICE
 from optimise.utils.geocoding import get_geolocation, address_str
-from optimise.utils.dates import days_ahead_from_date, date_from_string, add_time_with_max_end_of_day
-from optimise.routing.preprocessing.handle_workorders import set_and_geolocate_address
+from optimise.utils.dates import days_ahead_from_date, add_time_with_max_end_of_day, DateParseError, parse_field
+from optimise.routing.constants import translate
+from optimise.routing.preprocessing.handle_workorders import geolocate_addresses, set_and_geolocate_address
 def set_and_geolocate_depot(team: Dict[str, Any], default_service="nominatim", enable_geocoding: bool = True) -> None:
     address_dict = {
         'street': team['depot']['street'],
@@ -21,7 +22,7 @@ def set_and_geolocate_depot(team: Dict[str, Any], default_service="nominatim", e
     team['depot'].update(get_geolocation(address_dict, default_service=default_service))
 
 
-def process_worker(worker: Dict[str, Any], team: Dict[str, Any], request: Dict[str, Any], enable_geocoding: bool = True) -> None:
+def process_worker(worker: Dict[str, Any], team: Dict[str, Any], request: Dict[str, Any], enable_geocoding: bool = True, location=None) -> None:
     worker['depot'] = team.get('depot', request.get('depot'))
     worker['team'] = team['name']
     # address_dict = {
@@ -37,6 +38,7 @@ def process_worker(worker: Dict[str, Any], team: Dict[str, Any], request: Dict[s
         worker,
         geolocation_service=request['geocoding_service'],
         enable_geocoding=enable_geocoding,
+        location=location,
     )
     if worker['day_starts_at'] in ["0", "", None]:
         worker['day_starts_at'] = "00:00:00"
@@ -48,34 +50,43 @@ def process_worker(worker: Dict[str, Any], team: Dict[str, Any], request: Dict[s
         worker['pause_ends_at'] = "00:00:00"
 
     for bt in worker['blocked_times']:
-        bt['blocked_date'] = date_from_string(bt['blocked_date'], format_string=request['date_format'])
-        bt['blocked_start'] = date_from_string(bt['blocked_start'], request['date_format'].split()[1]).time()
-        bt['blocked_end'] = date_from_string(bt['blocked_end'], request['date_format'].split()[1]).time()
+        bt['blocked_date'] = parse_field(bt['blocked_date'], 'blocked_date', format_string=request['date_format'])
+        bt['blocked_start'] = parse_field(bt['blocked_start'], 'blocked_start', request['date_format'].split()[1]).time()
+        bt['blocked_end'] = parse_field(bt['blocked_end'], 'blocked_end', request['date_format'].split()[1]).time()
 
     for shift in worker['shifts']:
-        shift['shift_date'] = date_from_string(shift['shift_date'], format_string=request['date_format'])
-        shift['shift_start'] = date_from_string(shift['shift_start'], request['date_format'].split()[1]).time()
-        shift['shift_end'] = date_from_string(shift['shift_end'], request['date_format'].split()[1]).time()
-        shift['pause_start'] = date_from_string(shift['pause_start'], request['date_format'].split()[1]).time()
-        shift['pause_end'] = date_from_string(shift['pause_end'],
-                                                          request['date_format'].split()[1]).time()
+        shift['shift_date'] = parse_field(shift['shift_date'], 'shift_date', format_string=request['date_format'])
+        shift['shift_start'] = parse_field(shift['shift_start'], 'shift_start', request['date_format'].split()[1]).time()
+        shift['shift_end'] = parse_field(shift['shift_end'], 'shift_end', request['date_format'].split()[1]).time()
+        shift['pause_start'] = parse_field(shift['pause_start'], 'pause_start', request['date_format'].split()[1]).time()
+        shift['pause_end'] = parse_field(shift['pause_end'], 'pause_end', request['date_format'].split()[1]).time()
         shift['optional']=shift.get('optional', False)
 
-    worker['day_starts_at'] = date_from_string(worker.get('day_starts_at', '00:00:00'), request['date_format'].split()[1]).time()
-    worker['day_ends_at'] = date_from_string(worker.get('day_ends_at', '23:59:59'), request['date_format'].split()[1]).time()
-    worker['pause_starts_at'] = date_from_string(worker.get('pause_starts_at', '00:00:00'), request['date_format'].split()[1]).time()
-    worker['pause_ends_at'] = date_from_string(worker.get('pause_ends_at', '00:00:00'), request['date_format'].split()[1]).time()
+    worker['day_starts_at'] = parse_field(worker.get('day_starts_at', '00:00:00'), 'day_starts_at', request['date_format'].split()[1]).time()
+    worker['day_ends_at'] = parse_field(worker.get('day_ends_at', '23:59:59'), 'day_ends_at', request['date_format'].split()[1]).time()
+    worker['pause_starts_at'] = parse_field(worker.get('pause_starts_at', '00:00:00'), 'pause_starts_at', request['date_format'].split()[1]).time()
+    worker['pause_ends_at'] = parse_field(worker.get('pause_ends_at', '00:00:00'), 'pause_ends_at', request['date_format'].split()[1]).time()
 
 
 def handle_teams_and_workers(request: Dict[str, Any], errors=None, enable_geocoding: bool = True) -> None:
     if errors is None:
         errors = []
     workers_list=[]
+    locations = {}
+    if enable_geocoding:
+        workers = [worker for team_details in request['teams'].values() for worker in team_details['workers']]
+        locations = geolocate_addresses(workers, request['geocoding_service'])
     for team_name, team_details in request['teams'].items():
         team_details['name']=team_name
         set_and_geolocate_depot(team_details, request['geocoding_service'], enable_geocoding=enable_geocoding)
         for worker in team_details['workers']:
-            process_worker(worker, team_details, request, enable_geocoding=enable_geocoding)
+            try:
+                process_worker(worker, team_details, request, enable_geocoding=enable_geocoding, location=locations.get(id(worker)))
+            except DateParseError as e:
+                errors.append(
+                    translate("error_processing_worker", request.get("language")).format(worker.get("e_id", "unknown"), str(e))
+                )
+                continue
             workers_list.append(worker)
 
     return workers_list
@@ -1,9 +1,9 @@
 import logging
 from datetime import datetime, time, timedelta, date
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
-from optimise.utils.geocoding import get_geolocation, address_str
-from optimise.utils.dates import date_from_string
+from optimise.utils.geocoding import address_str, geocode_many, get_geolocation
+from optimise.utils.dates import DateParseError, parse_datetime, parse_field
 from optimise.routing.constants import translate
 from optimise.routing.defaults import DEFAULT_GEOCODING_SERVICE
 
@@ -15,31 +15,27 @@ def convert_visiting_hours_to_time(order: Dict[str, Any], request: Dict[str, Any
         order["visiting_hour_start"] = "00:00:00"
     if order.get("visiting_hour_end") in ["0", "", None]:
         order["visiting_hour_end"] = "23:59:59"
-    order["visiting_hour_start"] = date_from_string(
-        order["visiting_hour_start"], request["date_format"].split()[1]
+    order["visiting_hour_start"] = parse_field(
+        order["visiting_hour_start"], "visiting_hour_start", request["date_format"].split()[1]
     ).time()
-    order["visiting_hour_end"] = date_from_string(
-        order["visiting_hour_end"], request["date_format"].split()[1]
+    order["visiting_hour_end"] = parse_field(
+        order["visiting_hour_end"], "visiting_hour_end", request["date_format"].split()[1]
     ).time()
     visits_schedule = order.get("visits_schedule") or []
     order["visits_schedule"] = visits_schedule
     for visiting_time in visits_schedule:
-        visiting_time["visit_date"] = date_from_string(
-            visiting_time["visit_date"], format_string=request["date_format"].split()[0]
+        visiting_time["visit_date"] = parse_field(
+            visiting_time["visit_date"], "visit_date", format_string=request["date_format"].split()[0]
         ).date()
-        visiting_time["visit_start"] = date_from_string(
-            visiting_time["visit_start"], format_string=request["date_format"].split()[1]
+        visiting_time["visit_start"] = parse_field(
+            visiting_time["visit_start"], "visit_start", format_string=request["date_format"].split()[1]
         ).time()
-        visiting_time["visit_end"] = date_from_string(
-            visiting_time["visit_end"], request["date_format"].split()[1]
+        visiting_time["visit_end"] = parse_field(
+            visiting_time["visit_end"], "visit_end", request["date_format"].split()[1]
         ).time()
 
 
-def set_and_geolocate_address(
-    order_or_worker: Dict[str, Any],
-    geolocation_service: str = DEFAULT_GEOCODING_SERVICE,
-    enable_geocoding: bool = True,
-) -> None:
+def _address_dict(order_or_worker: Dict[str, Any]) -> Dict[str, Any]:
     address_dict = {
         "street": order_or_worker.get("street", ""),
         "city": order_or_worker.get("city", ""),
@@ -52,16 +48,50 @@ def set_and_geolocate_address(
     elif not any(address_dict.values()):
         # Fall back to using the existing address string as the street
         address_dict["street"] = order_or_worker["address"]
+    return address_dict
+
 
-    has_coords = isinstance(order_or_worker.get("longitude"), (float, int)) and isinstance(
+def _has_coordinates(order_or_worker: Dict[str, Any]) -> bool:
+    return isinstance(order_or_worker.get("longitude"), (float, int)) and isinstance(
         order_or_worker.get("latitude"), (float, int)
     )
-    if has_coords:
+
+
+def geolocate_addresses(
+    orders_or_workers: List[Dict[str, Any]],
+    geolocation_service: str = DEFAULT_GEOCODING_SERVICE,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Geocode in one batch the orders or workers without coordinates. Returns
+    their locations by ``id()``, to pass to ``set_and_geolocate_address``.
+    """
+    pending = [item for item in orders_or_workers if not _has_coordinates(item)]
+    if not pending:
+        return {}
+    try:
+        locations = geocode_many([_address_dict(item) for item in pending], geolocation_service)
+    except Exception as e:
+        logger.error(e)
+        return {}
+    return {id(item): location for item, location in zip(pending, locations)}
+
+
+def set_and_geolocate_address(
+    order_or_worker: Dict[str, Any],
+    geolocation_service: str = DEFAULT_GEOCODING_SERVICE,
+    enable_geocoding: bool = True,
+    location: Optional[Dict[str, Any]] = None,
+) -> None:
+    address_dict = _address_dict(order_or_worker)
+
+    if _has_coordinates(order_or_worker):
         return
     if not enable_geocoding:
         raise ValueError("Missing latitude/longitude and geocoding is disabled")
 
-    order_or_worker.update(get_geolocation(address_dict, geolocation_service))
+    if location is None:
+        location = get_geolocation(address_dict, geolocation_service)
+    order_or_worker.update(location)
 
 
 def validate_priority(order: Dict[str, Any], error_language: str = "en") -> None:
@@ -84,20 +114,26 @@ def validate_order_fields(order: Dict[str, Any], error_language: str = "en", req
 
 
 def str_to_date(date_str: str, format: str = "%Y-%m-%d") -> date:
-    return datetime.strptime(date_str, format).date()
+    return parse_datetime(date_str, format).date()
 
 
 def str_to_time(time_str: str, format: str = "%H:%M:%S") -> time:
-    return datetime.strptime(time_str, format).time()
+    return parse_datetime(time_str, format).time()
 
 
 def convert_str_to_date_time(
     order: Dict[str, Any], key_date: str, key_time: str, format_date: str, format_time: str
 ) -> None:
     if key_date in order and order[key_date] not in ["0", "", None]:
-        order[key_date] = str_to_date(order[key_date], format_date)
+        try:
+            order[key_date] = str_to_date(order[key_date], format_date)
+        except (TypeError, ValueError) as exc:
+            raise DateParseError(key_date, order[key_date]) from exc
     if key_time in order and order[key_time] not in ["0", "", None]:
-        order[key_time] = str_to_time(order[key_time], format_time)
+        try:
+            order[key_time] = str_to_time(order[key_time], format_time)
+        except (TypeError, ValueError) as exc:
+            raise DateParseError(key_time, order[key_time]) from exc
 
 
 def set_default_values(
@@ -184,15 +220,15 @@ def handle_order_datetime_operations(order: Dict[str, Any], request: Dict[str, A
     if isinstance(preferred_start, datetime):
         order["preferred_time_window_start_datetime"] = preferred_start
     elif preferred_start not in ["0", "", None]:
-        order["preferred_time_window_start_datetime"] = date_from_string(
-            preferred_start, request["date_format"]
+        order["preferred_time_window_start_datetime"] = parse_field(
+            preferred_start, "preferred_time_window_start", request["date_format"]
         )
 
     if isinstance(preferred_end, datetime):
         order["preferred_time_window_end_datetime"] = preferred_end
     elif preferred_end not in ["0", "", None]:
-        order["preferred_time_window_end_datetime"] = date_from_string(
-            preferred_end, request["date_format"]
+        order["preferred_time_window_end_datetime"] = parse_field(
+            preferred_end, "preferred_time_window_end", request["date_format"]
         )
 
     if order["latest_end_datetime"] < order["earliest_start_datetime"]:
@@ -214,6 +250,9 @@ def handle_orders(request: Dict[str, Any], errors=None, enable_geocoding: bool =
         errors = []
 
     order_skills = set()
+    invalid_dates = set()
+    geolocation_service = request.get("geocoding_service", DEFAULT_GEOCODING_SERVICE)
+    locations = geolocate_addresses(request["orders"], geolocation_service) if enable_geocoding else {}
     for order in request["orders"]:
         if request.get("account_for_priority"):
             validate_priority(order, error_language=request.get("language"))
@@ -232,17 +271,23 @@ def handle_orders(request: Dict[str, Any], errors=None, enable_geocoding: bool =
             preferred_window = order["preferred_time_windows"][0]
             order["preferred_time_window_start"] = preferred_window.get("start")
             order["preferred_time_window_end"] = preferred_window.get("end")
-        convert_visiting_hours_to_time(order, request)
-        set_and_geolocate_address(
-            order,
-            request.get("geocoding_service", DEFAULT_GEOCODING_SERVICE),
-            enable_geocoding=enable_geocoding,
-        )
         try:
+            convert_visiting_hours_to_time(order, request)
+            set_and_geolocate_address(
+                order,
+                geolocation_service,
+                enable_geocoding=enable_geocoding,
+                location=locations.get(id(order)),
+            )
             handle_order_datetime_operations(order, request, errors)
             order_skills.add(order["skill"])
-        except Exception:
-            raise
+        except DateParseError as e:
+            errors.append(
+                translate("error_processing_order", request.get("language")).format(order.get("id", "unknown"), str(e))
+            )
+            invalid_dates.add(id(order))
 
     request["orders_skills"] = order_skills
+    if invalid_dates:
+        request["orders"] = [order for order in request["orders"] if id(order) not in invalid_dates]
     return request["orders"]
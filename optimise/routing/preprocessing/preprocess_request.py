@@ -200,10 +200,18 @@ def coerce_request_types(request: Dict[str, Any], errors: List[str]) -> None:
     )
     if "randomize_response" in request:
         request["randomize_response"] = _coerce_bool(request.get("randomize_response"))
+    if "adaptive_strategy" in request:
+        request["adaptive_strategy"] = _coerce_bool(request.get("adaptive_strategy"))
+    if "day_assignment" in request:
+        request["day_assignment"] = _coerce_bool(request.get("day_assignment"))
+    if "route_templates" in request:
+        request["route_templates"] = _coerce_bool(request.get("route_templates"))
     request["max_route_distance"] = _coerce_int(
         request.get("max_route_distance"), "max_route_distance", errors
     )
 
+    if "alternatives" in request:
+        request["alternatives"] = _coerce_int(request.get("alternatives"), "alternatives", errors)
     request["optimization_horizon"] = _coerce_int(request.get("optimization_horizon"), "optimization_horizon", errors)
     request["time_limit"] = _coerce_int(request.get("time_limit"), "time_limit", errors)
     request["allow_slack"] = _coerce_int(request.get("allow_slack"), "allow_slack", errors)
@@ -217,6 +225,10 @@ def coerce_request_types(request: Dict[str, Any], errors: List[str]) -> None:
     request["driving_speed_kmh"] = _coerce_float(
         request.get("driving_speed_kmh"), "driving_speed_kmh", errors
     )
+    if "optimality_gap" in request:
+        request["optimality_gap"] = _coerce_float(
+            request.get("optimality_gap"), "optimality_gap", errors
+        )
 
 
 def process_time_settings(request, setting_name, default_value, units_per_hour):
@@ -0,0 +1,203 @@
+"""
+Road geometry of solved routes.
+
+A route is drawn leg by leg, one leg per pair of consecutive stops. Legs are
+fetched concurrently from the routing engine and kept in an in-process LRU
+keyed by their coordinate pair, so the depot legs shared by many routes, and
+the routes of a re-optimised plan, are fetched once. The joined geometry can
+be simplified (Douglas–Peucker) before it is encoded (``encode_polyline``).
+"""
+import asyncio
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from optimise.routing.defaults import (
+    ROUTE_GEOMETRY_CACHE_SIZE,
+    ROUTE_GEOMETRY_TIMEOUT_SECONDS,
+    ROUTE_GEOMETRY_TOLERANCE_M,
+    ROUTER_ASYNC_CONCURRENCY,
+)
+from optimise.routing.router_pool import get_router
+from optimise.utils.retry_budget import RetryBudget, budget_scope
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6371008.8
+# Stop coordinates are rounded to about 10 cm before legs are matched
+COORDINATE_DECIMALS = 6
+
+Point = Tuple[float, float]
+Leg = Tuple[Point, Point]
+
+
+class _LegCache:
+    """In-process LRU of leg geometries, ``(n, 2)`` arrays of lon/lat."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            points = self._entries.get(key)
+            if points is not None:
+                self._entries.move_to_end(key)
+            return points
+
+    def set(self, key, points):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = points
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_legs = _LegCache(ROUTE_GEOMETRY_CACHE_SIZE)
+
+
+def simplify(points: np.ndarray, tolerance_m: float) -> np.ndarray:
+    """
+    Douglas–Peucker simplification of a lon/lat line: drops the points closer
+    than ``tolerance_m`` metres to the chord of the points kept around them.
+    Distances are measured on an equirectangular projection, accurate at the
+    scale of a route.
+    """
+    if tolerance_m <= 0 or len(points) < 3:
+        return points
+    radians = np.radians(points)
+    xy = np.column_stack(
+        (radians[:, 0] * math.cos(radians[:, 1].mean()), radians[:, 1])
+    ) * EARTH_RADIUS_M
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    spans = [(0, len(points) - 1)]
+    while spans:
+        start, end = spans.pop()
+        if end - start < 2:
+            continue
+        chord = xy[end] - xy[start]
+        offsets = xy[start + 1:end] - xy[start]
+        length = math.hypot(chord[0], chord[1])
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(chord[0] * offsets[:, 1] - chord[1] * offsets[:, 0]) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance_m:
+            split = start + 1 + farthest
+            keep[split] = True
+            spans.append((start, split))
+            spans.append((split, end))
+    return points[keep]
+
+
+def _point(coord: Sequence[float]) -> Point:
+    return (round(float(coord[0]), COORDINATE_DECIMALS), round(float(coord[1]), COORDINATE_DECIMALS))
+
+
+async def _fetch_leg(router, profile: str, leg: Leg, semaphore: asyncio.Semaphore) -> Optional[np.ndarray]:
+    async with semaphore:
+        try:
+            direction = await router.directions_async(
+                locations=[list(leg[0]), list(leg[1])],
+                profile=profile,
+                overview="full",
+                geometries="geojson",
+            )
+        except Exception as e:
+            logger.debug("Geometry of leg %s could not be fetched: %s", leg, e)
+            return None
+    if not direction.geometry:
+        return None
+    return np.asarray(direction.geometry, dtype=float)[:, :2]
+
+
+async def fetch_leg_geometries(
+    legs: Sequence[Leg],
+    base_url: str,
+    profile: str = "driving",
+    concurrency: int = ROUTER_ASYNC_CONCURRENCY,
+) -> Dict[Leg, Optional[np.ndarray]]:
+    """
+    Geometry of every distinct leg, from the cache or fetched from the OSRM
+    engine at ``base_url``, ``concurrency`` at a time. Legs the engine could
+    not route map to None and are not cached.
+    """
+    geometries: Dict[Leg, Optional[np.ndarray]] = {}
+    missing: List[Leg] = []
+    for leg in dict.fromkeys(legs):
+        if leg[0] == leg[1]:
+            geometries[leg] = np.array([leg[0]], dtype=float)
+            continue
+        points = _legs.get((base_url, profile, leg))
+        if points is None:
+            missing.append(leg)
+        else:
+            geometries[leg] = points
+    if not missing:
+        return geometries
+
+    router = get_router("osrm", base_url=base_url)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    fetched = await asyncio.gather(*(_fetch_leg(router, profile, leg, semaphore) for leg in missing))
+    for leg, points in zip(missing, fetched):
+        geometries[leg] = points
+        if points is not None:
+            _legs.set((base_url, profile, leg), points)
+    return geometries
+
+
+async def route_geometries(
+    routes: Sequence[Sequence[Sequence[float]]],
+    base_url: str,
+    profile: str = "driving",
+    tolerance_m: Optional[float] = None,
+    concurrency: int = ROUTER_ASYNC_CONCURRENCY,
+    timeout_seconds: float = ROUTE_GEOMETRY_TIMEOUT_SECONDS,
+) -> List[Optional[np.ndarray]]:
+    """
+    Road geometry of each route, given as its lon/lat stops in order of visit:
+    an ``(n, 2)`` lon/lat array simplified to ``tolerance_m`` metres
+    (``ROUTE_GEOMETRY_TOLERANCE_M`` by default), or None when the route has
+    fewer than two stops or one of its legs could not be routed. All legs
+    share ``timeout_seconds`` and the retries of one budget.
+    """
+    if tolerance_m is None:
+        tolerance_m = ROUTE_GEOMETRY_TOLERANCE_M
+    route_legs = []
+    for stops in routes:
+        points = [_point(stop) for stop in stops]
+        route_legs.append(list(zip(points, points[1:])))
+
+    with budget_scope(RetryBudget(seconds=timeout_seconds)):
+        legs = await fetch_leg_geometries(
+            [leg for route in route_legs for leg in route], base_url, profile=profile, concurrency=concurrency
+        )
+
+    results: List[Optional[np.ndarray]] = []
+    for legs_of_route in route_legs:
+        parts = [legs[leg] for leg in legs_of_route]
+        if not parts or any(part is None for part in parts):
+            results.append(None)
+            continue
+        # every leg starts where the previous one ended
+        joined = np.concatenate([parts[0]] + [part[1:] for part in parts[1:]])
+        results.append(simplify(joined, tolerance_m))
+    return results
+
+
+def clear_leg_cache() -> None:
+    _legs.clear()
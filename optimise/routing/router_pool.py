@@ -0,0 +1,132 @@
+"""
+Process-wide router clients. Routers are built once per (engine, base URL,
+credentials) and all send their requests through one ``requests.Session``
+with bounded keep-alive pools, so the tiles of a matrix job and repeated
+geometry calls reuse open connections instead of paying a TCP/TLS handshake
+each. Sessions are safe to share between threads. A forked child (e.g. a
+prefork task worker) starts with an empty pool: sockets inherited from the
+parent must not be used by both processes.
+
+The async variants of the routers (``matrix_async``, ``directions_async``)
+share one ``httpx.AsyncClient`` per event loop, bounded the same way.
+"""
+import asyncio
+import os
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from optimise.routing.defaults import ROUTER_POOL_CONNECTIONS, ROUTER_POOL_MAXSIZE
+from optimise.utils.routing.client_async import AsyncClient
+from optimise.utils.routing.routers import ORS, Graphhopper, MapboxOSRM, OSRM, Valhalla
+
+ROUTER_CLASSES = {
+    "ors": ORS,
+    "mapbox_osrm": MapboxOSRM,
+    "graphhopper": Graphhopper,
+    "osrm": OSRM,
+    "valhalla": Valhalla,
+}
+# Engines reached at a base URL of our own rather than a public API
+SELF_HOSTED = {"osrm", "valhalla"}
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_routers: Dict[Tuple[str, Optional[str], Optional[str]], object] = {}
+# one async client per event loop: httpx connections cannot move between loops
+_async_http: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_pid = os.getpid()
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=ROUTER_POOL_CONNECTIONS, pool_maxsize=ROUTER_POOL_MAXSIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _forget_pool() -> None:
+    """Drop the pool without closing it: its sockets belong to the parent."""
+    global _lock, _session, _routers, _async_http, _pid
+    _lock = threading.Lock()
+    _session = None
+    _routers = {}
+    _async_http = weakref.WeakKeyDictionary()
+    _pid = os.getpid()
+
+
+def _check_pid() -> None:
+    # fallback for platforms without os.register_at_fork
+    if _pid != os.getpid():
+        _forget_pool()
+
+
+def get_session() -> requests.Session:
+    """The shared keep-alive session of the process."""
+    global _session
+    _check_pid()
+    with _lock:
+        if _session is None:
+            _session = _new_session()
+        return _session
+
+
+def get_async_http() -> httpx.AsyncClient:
+    """The shared ``httpx.AsyncClient`` of the running event loop."""
+    _check_pid()
+    loop = asyncio.get_running_loop()
+    with _lock:
+        http = _async_http.get(loop)
+        if http is None or http.is_closed:
+            limits = httpx.Limits(
+                max_connections=ROUTER_POOL_CONNECTIONS * ROUTER_POOL_MAXSIZE,
+                max_keepalive_connections=ROUTER_POOL_MAXSIZE,
+            )
+            http = _async_http[loop] = httpx.AsyncClient(limits=limits)
+        return http
+
+
+def get_router(router_name: str, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    """
+    The shared router of an engine, built on first use. ``base_url`` only
+    applies to self-hosted engines (``osrm``, ``valhalla``); the others use
+    their public API.
+    """
+    router_class = ROUTER_CLASSES.get(router_name)
+    if router_class is None:
+        raise ValueError(f"Unsupported router: {router_name}")
+    key = (router_name, base_url, api_key or None)
+    session = get_session()
+    with _lock:
+        router = _routers.get(key)
+        if router is None:
+            if router_name in SELF_HOSTED:
+                router = router_class(base_url=base_url, session=session)
+            else:
+                router = router_class(api_key=api_key, session=session)
+            router.async_client = AsyncClient.from_client(router.client, http=get_async_http)
+            _routers[key] = router
+        return router
+
+
+def reset_router_pool() -> None:
+    """
+    Close the shared blocking connections and forget every router. Async
+    clients are dropped; their connections close with their event loop.
+    """
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _routers.clear()
+        _async_http.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pool)
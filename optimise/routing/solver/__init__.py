@@ -1,6 +1,8 @@
+from optimise.routing.solver.construction import ConstructionSolver
 from optimise.routing.solver.ortools_builder import OrtoolsSolver
 from optimise.routing.solver.registry import registry
 
 registry.register("ortools", OrtoolsSolver)
+registry.register("construction", ConstructionSolver)
 
-__all__ = ["OrtoolsSolver", "registry"]
+__all__ = ["ConstructionSolver", "OrtoolsSolver", "registry"]
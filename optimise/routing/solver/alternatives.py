@@ -0,0 +1,76 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Routes = Tuple[Tuple[int, ...], ...]
+
+
+def assignment_routes(assignment, routing, manager) -> Routes:
+    routes = []
+    for vehicle in range(routing.vehicles()):
+        route = []
+        index = assignment.Value(routing.NextVar(routing.Start(vehicle)))
+        while not routing.IsEnd(index):
+            route.append(manager.IndexToNode(index))
+            index = assignment.Value(routing.NextVar(index))
+        routes.append(tuple(route))
+    return tuple(routes)
+
+
+def _vehicle_by_node(routes: Sequence[Sequence[int]]) -> Dict[int, int]:
+    return {node: vehicle for vehicle, route in enumerate(routes) for node in route}
+
+
+def assignment_distance(routes_a: Sequence[Sequence[int]], routes_b: Sequence[Sequence[int]]) -> float:
+    """
+    Share of the orders served by one of the solutions that are served by a
+    different vehicle (or dropped) in the other one.
+    """
+    vehicles_a = _vehicle_by_node(routes_a)
+    vehicles_b = _vehicle_by_node(routes_b)
+    nodes = set(vehicles_a) | set(vehicles_b)
+    if not nodes:
+        return 0.0
+    changed = sum(1 for node in nodes if vehicles_a.get(node) != vehicles_b.get(node))
+    return changed / len(nodes)
+
+
+def select_diverse_solutions(
+    solutions: Dict[Routes, int],
+    count: int,
+    max_cost_increase: Optional[float] = None,
+    incumbent: Optional[Routes] = None,
+) -> List[Tuple[int, List[List[int]]]]:
+    """
+    Pick ``count`` alternatives to the ``incumbent`` (by default the cheapest
+    solution of the pool), as ``(objective, routes)``, among those at most
+    ``max_cost_increase`` costlier. Each pick maximises its smallest
+    assignment distance to the solutions already picked, cheaper first on
+    ties; pool members assigning orders exactly like a pick are never
+    returned.
+    """
+    if count <= 0 or len(solutions) < 2:
+        return []
+    ranked = sorted(solutions.items(), key=lambda item: (item[1], item[0]))
+    if incumbent is not None and incumbent in solutions:
+        ranked.remove((incumbent, solutions[incumbent]))
+        ranked.insert(0, (incumbent, solutions[incumbent]))
+    if max_cost_increase is not None:
+        limit = ranked[0][1] * (1 + max_cost_increase)
+        ranked = [item for item in ranked if item[1] <= limit]
+    picked: List[Tuple[Routes, int]] = [ranked[0]]
+    candidates = ranked[1:]
+    distances = [assignment_distance(routes, picked[0][0]) for routes, _ in candidates]
+    while len(picked) <= count and candidates:
+        position = max(
+            range(len(candidates)),
+            key=lambda i: (distances[i], -candidates[i][1]),
+        )
+        if distances[position] <= 0:
+            break
+        routes, objective = candidates.pop(position)
+        distances.pop(position)
+        picked.append((routes, objective))
+        distances = [
+            min(distance, assignment_distance(other, routes))
+            for distance, (other, _) in zip(distances, candidates)
+        ]
+    return [(objective, [list(route) for route in routes]) for routes, objective in picked[1:]]
@@ -0,0 +1,569 @@
+import time
+from dataclasses import replace
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from optimise.routing.config.solve_profile import SolveProfile
+from optimise.routing.constraints import RoutingConstraint
+from optimise.routing.defaults import CONSTRUCTION_IMPROVEMENT_SECONDS
+from optimise.routing.input.solver_input import SolverInput
+from optimise.routing.solver.lower_bound import arc_cost_lower_bound, arc_cost_matrix
+from optimise.routing.solver.ortools_builder import OrtoolsRoutingBuilder, OrtoolsSolver
+from optimise.routing.solver.tours import Tour
+
+_EPSILON = 1e-9
+
+
+class _Problem:
+    """
+    Dense numpy view of a SolverInput, with the route feasibility rules of the
+    model built by OrtoolsRoutingBuilder.
+    """
+
+    def __init__(self, solver_input: SolverInput) -> None:
+        size = len(solver_input.time_matrix)
+        num_vehicles = solver_input.num_vehicles
+        self.size = size
+        self.num_vehicles = num_vehicles
+
+        self.time = np.asarray(solver_input.time_matrix, dtype=float)
+        self.cost = arc_cost_matrix(solver_input)
+        self.service = np.zeros(size)
+        durations = np.asarray(solver_input.service_durations[:size], dtype=float)
+        self.service[: len(durations)] = durations
+
+        self.starts = np.asarray(solver_input.starts, dtype=np.int64)
+        self.ends = np.asarray(solver_input.ends or solver_input.starts, dtype=np.int64)
+        depots = set(solver_input.starts) | set(solver_input.ends)
+        self.orders = [node for node in range(size) if node not in depots]
+
+        distance = solver_input.distance_matrix
+        self.max_distance = np.inf
+        self.distance = None
+        if solver_input.max_route_distance and distance is not None and len(distance) == size:
+            self.distance = np.asarray(distance, dtype=float)
+            self.max_distance = float(solver_input.max_route_distance)
+        self.max_work = float(solver_input.max_working_time) if solver_input.max_working_time else np.inf
+        # LoadDistributionConstraint counts arcs: stops + 1 <= size // vehicles + 1
+        self.max_stops = size // max(num_vehicles, 1) if solver_input.distribute_load else size
+        self.vehicle_cost = 0.0
+        if solver_input.minimize_vehicles and not solver_input.distribute_load and solver_input.vehicle_penalty:
+            self.vehicle_cost = float(solver_input.vehicle_penalty)
+
+        self.allowed = np.ones((num_vehicles, size), dtype=bool)
+        for node, vehicles in solver_input.allowed_vehicles_by_node.items():
+            if 0 <= node < size:
+                self.allowed[:, node] = False
+                valid = [v for v in vehicles if 0 <= v < num_vehicles]
+                self.allowed[valid, node] = True
+        # Precedence needs matching cumuls on a shared vehicle; such orders are
+        # left to OR-Tools and dropped here.
+        for before, after in solver_input.precedence_constraints:
+            for node in (before, after):
+                if 0 <= node < size:
+                    self.allowed[:, node] = False
+
+        num_depots = solver_input.num_depots
+        if num_depots is None:
+            num_depots = len(set(solver_input.starts)) if solver_input.starts else 1
+        penalties = solver_input.penalties or []
+        self.penalty = np.full(size, np.inf)
+        for node in self.orders:
+            if 0 <= node - num_depots < len(penalties):
+                self.penalty[node] = float(penalties[node - num_depots])
+
+        self._init_time(solver_input)
+
+    def _init_time(self, solver_input: SolverInput) -> None:
+        size = self.size
+        num_vehicles = self.num_vehicles
+        # Without time windows no Time dimension (and no break) is created.
+        self.timed = bool(solver_input.time_windows)
+        horizon = float(solver_input.horizon) if solver_input.horizon else np.inf
+        self.horizon = horizon
+        self.slack = float(solver_input.allow_slack)
+        self.window_start = np.zeros(size)
+        self.latest = np.full(size, horizon)
+        tolerance = float(solver_input.time_window_tolerance)
+        for node, window in enumerate(solver_input.time_windows[:size]):
+            self.window_start[node] = window[0]
+            self.latest[node] = min(window[1] - self.service[node] + tolerance, horizon)
+
+        self.depart_earliest = np.zeros(num_vehicles)
+        self.depart_latest = np.full(num_vehicles, horizon)
+        if self.timed:
+            for vehicle, start in enumerate(self.starts):
+                window = (
+                    solver_input.time_windows[start]
+                    if start < len(solver_input.time_windows)
+                    else solver_input.time_windows[0]
+                )
+                self.depart_earliest[vehicle], self.depart_latest[vehicle] = window
+
+        # BreaksConstraint: mandatory breaks at 0 and at the end of the day
+        # bound the shift, the others are pauses taken between two services.
+        self.break_tolerance = float(solver_input.break_time_tolerance)
+        day_end = solver_input.break_day_end if solver_input.break_day_end is not None else horizon
+        self.shift_start = np.zeros(num_vehicles)
+        self.shift_end = np.full(num_vehicles, horizon)
+        self.pauses: List[List[Tuple[float, float]]] = [[] for _ in range(num_vehicles)]
+        for vehicle, vehicle_breaks in enumerate(solver_input.breaks[:num_vehicles]):
+            for item in vehicle_breaks:
+                start = item[0]
+                duration = item[1] if len(item) > 1 else 0
+                optional = item[2] if len(item) > 2 else True
+                if optional or duration <= 0:
+                    continue
+                if start == 0:
+                    self.shift_start[vehicle] = max(self.shift_start[vehicle], duration)
+                elif start + duration >= day_end:
+                    self.shift_end[vehicle] = min(self.shift_end[vehicle], start)
+                else:
+                    self.pauses[vehicle].append((float(start), float(duration)))
+            self.pauses[vehicle].sort()
+
+        # Soft bounds on the visit times, charged per unit of time outside:
+        # TimeWindowConstraint's soft windows, then PrioritySoftConstraint's
+        # upper bounds, which replace those of the soft windows.
+        self.soft_start = np.zeros(size)
+        self.early_cost = np.zeros(size)
+        self.soft_end = np.full(size, np.inf)
+        self.late_cost = np.zeros(size)
+        if not self.timed:
+            return
+        depots = set(solver_input.starts) | set(solver_input.ends)
+        for node, soft_window in enumerate(solver_input.soft_time_windows[:size]):
+            if node in depots or not soft_window or soft_window[2] <= 0:
+                continue
+            soft_start, soft_end, penalty = soft_window
+            self.soft_start[node], self.early_cost[node] = soft_start, penalty
+            self.soft_end[node], self.late_cost[node] = soft_end, penalty
+        if solver_input.account_for_priority:
+            for node, priority in solver_input.location_priorities:
+                if node in depots or not 0 <= node < len(solver_input.time_windows):
+                    continue
+                self.soft_end[node] = solver_input.time_windows[node][0] + self.service[node]
+                self.late_cost[node] = 5 - priority
+
+    def route_cost(self, route: List[int], vehicle: int) -> float:
+        if not route:
+            return 0.0
+        nodes = [int(self.starts[vehicle]), *route, int(self.ends[vehicle])]
+        return float(self.cost[nodes[:-1], nodes[1:]].sum()) + self.vehicle_cost
+
+    def soft_cost(self, tour: Tour) -> float:
+        """Soft time-window and priority penalties of the visit times of ``tour``."""
+        if len(tour) <= 2:
+            return 0.0
+        nodes = np.asarray([node for node, _time in tour[1:-1]], dtype=np.int64)
+        times = np.asarray([visit_time for _node, visit_time in tour[1:-1]], dtype=float)
+        early = np.maximum(self.soft_start[nodes] - times, 0.0) * self.early_cost[nodes]
+        late = np.maximum(times - self.soft_end[nodes], 0.0) * self.late_cost[nodes]
+        return float(early.sum() + late.sum())
+
+    def tour(self, route: List[int], vehicle: int) -> Optional[Tour]:
+        """Stops of ``route`` with their visit times, start and end included."""
+        visits = np.zeros(len(route) + 2)
+        if self.schedule(route, vehicle, visits) is None:
+            return None
+        nodes = [int(self.starts[vehicle]), *route, int(self.ends[vehicle])]
+        return [(node, int(round(time))) for node, time in zip(nodes, visits)]
+
+    def schedule(
+        self, route: List[int], vehicle: int, visits: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Earliest departure time from the start and from every node of
+        ``route``, or None when the route is infeasible. Pauses are assumed
+        to be taken while travelling, which is conservative. ``visits``, of
+        length ``len(route) + 2``, receives the time at the start, at every
+        node and at the end (the cumuls of the Time dimension).
+        """
+        if len(route) > self.max_stops:
+            return None
+        if route and self.service[route].sum() > self.max_work:
+            return None
+        start = int(self.starts[vehicle])
+        end = int(self.ends[vehicle])
+        if self.distance is not None and route:
+            nodes = [start, *route, end]
+            if self.distance[nodes[:-1], nodes[1:]].sum() > self.max_distance:
+                return None
+
+        departures = np.zeros(len(route) + 1)
+        if not self.timed or not route:
+            return departures
+
+        ready = max(self.depart_earliest[vehicle], self.shift_start[vehicle])
+        if ready > self.depart_latest[vehicle]:
+            return None
+        pauses = self.pauses[vehicle]
+        pending = 0
+        tolerance = self.break_tolerance
+        previous = start
+        leave = ready + self.service[start]
+        end_limit = min(self.horizon, self.shift_end[vehicle])
+
+        for position, node in enumerate([*route, end]):
+            is_end = position == len(route)
+            first = position == 0
+            travel = self.time[previous, node]
+            arrive = leave + travel
+            begin = arrive if is_end else max(arrive, self.window_start[node])
+            service = 0.0 if is_end else self.service[node]
+
+            while pending < len(pauses) and begin + service > pauses[pending][0] + tolerance:
+                pause_start, duration = pauses[pending]
+                taken = max(pause_start - tolerance, 0.0 if first else leave)
+                if taken > pause_start + tolerance:
+                    return None
+                resume = taken + duration + (self.service[start] if first else 0.0)
+                if first:
+                    leave = max(leave, resume)
+                begin = max(begin, resume + travel)
+                pending += 1
+
+            if first:
+                # The start cumul is free within the depot window: leave as
+                # late as possible to avoid waiting at the first order.
+                start_cumul = min(self.depart_latest[vehicle], begin - travel - self.service[start])
+                leave = max(leave, start_cumul + self.service[start])
+                departures[0] = leave
+                arrive = leave + travel
+                if visits is not None:
+                    visits[0] = leave - self.service[start]
+            if begin - arrive > self.slack + _EPSILON:
+                return None
+            if visits is not None:
+                visits[position + 1] = begin
+            if is_end:
+                if begin > end_limit + _EPSILON:
+                    return None
+                break
+            if begin > self.latest[node] + _EPSILON:
+                return None
+            leave = begin + service
+            departures[position + 1] = leave
+            previous = node
+
+        return departures
+
+
+class _Route:
+    """
+    A route and the arrays the vectorised insertion screening needs.
+    """
+
+    def __init__(self, problem: _Problem, vehicle: int, nodes: List[int]) -> None:
+        self.vehicle = vehicle
+        self.nodes = nodes
+        self.sequence = np.asarray(
+            [problem.starts[vehicle], *nodes, problem.ends[vehicle]], dtype=np.int64
+        )
+        departures = problem.schedule(nodes, vehicle)
+        self.departures = departures if departures is not None else np.zeros(len(nodes) + 1)
+        self.service = problem.service[nodes].sum() if nodes else 0.0
+        self.distance = 0.0
+        if problem.distance is not None:
+            self.distance = problem.distance[self.sequence[:-1], self.sequence[1:]].sum()
+
+        # Latest start at each successor position, ignoring pauses and slack.
+        latest_next = np.full(len(nodes) + 1, min(problem.horizon, problem.shift_end[vehicle]))
+        if problem.timed:
+            for position in range(len(nodes) - 1, -1, -1):
+                node = nodes[position]
+                following = self.sequence[position + 2]
+                latest_next[position] = min(
+                    problem.latest[node],
+                    latest_next[position + 1] - problem.service[node] - problem.time[node, following],
+                )
+        else:
+            latest_next[:] = np.inf
+        self.latest_next = latest_next
+
+
+def _screen(problem: _Problem, route: _Route, candidates: np.ndarray) -> np.ndarray:
+    """
+    Insertion cost of every candidate at every position of ``route``
+    (positions x candidates), ``inf`` where a necessary condition fails.
+    """
+    before = route.sequence[:-1][:, None]
+    after = route.sequence[1:][:, None]
+    nodes = candidates[None, :]
+    delta = problem.cost[before, nodes] + problem.cost[nodes, after] - problem.cost[before, after]
+    if not route.nodes:
+        delta = delta + problem.vehicle_cost
+
+    feasible = np.broadcast_to(problem.allowed[route.vehicle, candidates][None, :], delta.shape).copy()
+    if len(route.nodes) + 1 > problem.max_stops:
+        feasible[:] = False
+    feasible &= (route.service + problem.service[nodes]) <= problem.max_work
+    if problem.distance is not None:
+        extra = (
+            problem.distance[before, nodes]
+            + problem.distance[nodes, after]
+            - problem.distance[before, after]
+        )
+        feasible &= route.distance + extra <= problem.max_distance + _EPSILON
+    if problem.timed:
+        arrive = route.departures[:, None] + problem.time[before, nodes]
+        begin = np.maximum(arrive, problem.window_start[nodes])
+        feasible &= begin <= problem.latest[nodes] + _EPSILON
+        following = begin + problem.service[nodes] + problem.time[nodes, after]
+        feasible &= following <= route.latest_next[:, None] + _EPSILON
+    return np.where(feasible, delta, np.inf)
+
+
+def _best_positions(problem: _Problem, route: _Route, candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if candidates.size == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+    deltas = _screen(problem, route, candidates)
+    positions = deltas.argmin(axis=0)
+    return deltas[positions, np.arange(candidates.size)], positions
+
+
+def _exact_insertion(problem: _Problem, route: _Route, node: int) -> Tuple[float, int]:
+    deltas = _screen(problem, route, np.asarray([node], dtype=np.int64))[:, 0]
+    for position in np.argsort(deltas, kind="stable"):
+        if not np.isfinite(deltas[position]):
+            break
+        nodes = route.nodes[:position] + [node] + route.nodes[position:]
+        if problem.schedule(nodes, route.vehicle) is not None:
+            return float(deltas[position]), int(position)
+    return np.inf, 0
+
+
+def _regret_insertion(problem: _Problem) -> List[_Route]:
+    """
+    Regret-2 insertion: repeatedly insert the order whose best and second
+    best options (another vehicle, or dropping it for its penalty) differ
+    the most.
+    """
+    routes = [_Route(problem, vehicle, []) for vehicle in range(problem.num_vehicles)]
+    candidates = np.asarray(
+        [node for node in problem.orders if problem.allowed[:, node].any()], dtype=np.int64
+    )
+    if candidates.size == 0 or not routes:
+        return routes
+
+    best = np.full((len(routes), candidates.size), np.inf)
+    positions = np.zeros((len(routes), candidates.size), dtype=np.int64)
+    for vehicle, route in enumerate(routes):
+        best[vehicle], positions[vehicle] = _best_positions(problem, route, candidates)
+    verified = np.zeros_like(best, dtype=bool)
+
+    while candidates.size:
+        penalty = problem.penalty[candidates]
+        costs = np.where(best < penalty[None, :], best, np.inf)
+        if not np.isfinite(costs).any():
+            break
+        if len(routes) > 1:
+            ordered = np.partition(costs, 1, axis=0)
+            first, second = ordered[0], np.minimum(ordered[1], penalty)
+        else:
+            first, second = costs[0], penalty
+        with np.errstate(invalid="ignore"):
+            regret = np.where(np.isfinite(first), second - first, -np.inf)
+        regret = np.nan_to_num(regret, nan=-np.inf, posinf=np.finfo(float).max)
+        column = int(np.lexsort((first, -regret))[0])
+        vehicle = int(costs[:, column].argmin())
+        node = int(candidates[column])
+        route = routes[vehicle]
+
+        if not verified[vehicle, column]:
+            verified[vehicle, column] = True
+            position = int(positions[vehicle, column])
+            nodes = route.nodes[:position] + [node] + route.nodes[position:]
+            if problem.schedule(nodes, vehicle) is None:
+                best[vehicle, column], positions[vehicle, column] = _exact_insertion(problem, route, node)
+            continue
+
+        position = int(positions[vehicle, column])
+        routes[vehicle] = _Route(problem, vehicle, route.nodes[:position] + [node] + route.nodes[position:])
+        candidates = np.delete(candidates, column)
+        best = np.delete(best, column, axis=1)
+        positions = np.delete(positions, column, axis=1)
+        verified = np.delete(verified, column, axis=1)
+        best[vehicle], positions[vehicle] = _best_positions(problem, routes[vehicle], candidates)
+        verified[vehicle] = False
+
+    return routes
+
+
+def _two_opt(problem: _Problem, route: _Route) -> Optional[_Route]:
+    count = len(route.nodes)
+    if count < 2:
+        return None
+    sequence = route.sequence
+    cost = problem.cost
+    forward = np.concatenate([[0.0], np.cumsum(cost[sequence[:-1], sequence[1:]])])
+    backward = np.concatenate([[0.0], np.cumsum(cost[sequence[1:], sequence[:-1]])])
+
+    # Reverse sequence[i..k], 1 <= i < k <= count.
+    first, last = np.meshgrid(np.arange(1, count + 1), np.arange(1, count + 1), indexing="ij")
+    valid = first < last
+    first, last = first[valid], last[valid]
+    delta = (
+        cost[sequence[first - 1], sequence[last]]
+        + cost[sequence[first], sequence[last + 1]]
+        - cost[sequence[first - 1], sequence[first]]
+        - cost[sequence[last], sequence[last + 1]]
+        + (backward[last] - backward[first])
+        - (forward[last] - forward[first])
+    )
+    for move in np.argsort(delta, kind="stable"):
+        if delta[move] >= -_EPSILON:
+            break
+        i, k = int(first[move]) - 1, int(last[move]) - 1
+        nodes = route.nodes[:i] + route.nodes[i : k + 1][::-1] + route.nodes[k + 1 :]
+        if problem.schedule(nodes, route.vehicle) is not None:
+            return _Route(problem, route.vehicle, nodes)
+    return None
+
+
+def _relocate(problem: _Problem, routes: List[_Route], deadline: float) -> bool:
+    cost = problem.cost
+    for source in routes:
+        for position, node in enumerate(source.nodes):
+            if time.monotonic() > deadline:
+                return False
+            before, after = source.sequence[position], source.sequence[position + 2]
+            gain = cost[before, node] + cost[node, after] - cost[before, after]
+            if len(source.nodes) == 1:
+                gain += problem.vehicle_cost
+            candidate = np.asarray([node], dtype=np.int64)
+            options = []
+            for target in routes:
+                if target is source or not problem.allowed[target.vehicle, node]:
+                    continue
+                deltas = _screen(problem, target, candidate)[:, 0]
+                best = int(deltas.argmin())
+                if deltas[best] - gain < -_EPSILON:
+                    options.append((deltas[best] - gain, target.vehicle, best))
+            if not options:
+                continue
+            remaining = source.nodes[:position] + source.nodes[position + 1 :]
+            if problem.schedule(remaining, source.vehicle) is None:
+                continue
+            for _delta, vehicle, insert_at in sorted(options):
+                target = routes[vehicle]
+                nodes = target.nodes[:insert_at] + [node] + target.nodes[insert_at:]
+                if problem.schedule(nodes, vehicle) is not None:
+                    routes[vehicle] = _Route(problem, vehicle, nodes)
+                    routes[source.vehicle] = _Route(problem, source.vehicle, remaining)
+                    return True
+    return False
+
+
+def _improve(problem: _Problem, routes: List[_Route], seconds: float) -> List[_Route]:
+    deadline = time.monotonic() + max(seconds, 0.0)
+    improved = True
+    while improved and time.monotonic() < deadline:
+        improved = False
+        for vehicle in range(len(routes)):
+            while time.monotonic() < deadline:
+                better = _two_opt(problem, routes[vehicle])
+                if better is None:
+                    break
+                routes[vehicle] = better
+                improved = True
+        if _relocate(problem, routes, deadline):
+            improved = True
+    return routes
+
+
+class ConstructionSolver:
+    """
+    Fast numpy construction heuristic: regret insertion with time-window,
+    break, capacity and distance checks, followed by a short 2-opt/relocate
+    phase. ``solve_tours`` returns the constructed tours without building an
+    OR-Tools model; ``solve`` loads them into the same model as
+    OrtoolsSolver for callers that need the ``(assignment, routing,
+    manager)`` structure.
+    """
+
+    def __init__(
+        self,
+        constraints: Optional[Iterable[RoutingConstraint]] = None,
+        improvement_seconds: Optional[float] = None,
+    ) -> None:
+        self.builder = OrtoolsRoutingBuilder(constraints=constraints)
+        self.improvement_seconds = (
+            CONSTRUCTION_IMPROVEMENT_SECONDS if improvement_seconds is None else improvement_seconds
+        )
+        self.lower_bound: Optional[int] = None
+        self.routes: List[List[int]] = []
+        self.tours: List[Tour] = []
+        self.objective_value: Optional[float] = None
+
+    def construct(
+        self, solver_input: SolverInput, profile: Optional[SolveProfile] = None
+    ) -> List[List[int]]:
+        """
+        Visited nodes of every vehicle (start/end excluded).
+        """
+        problem = _Problem(solver_input)
+        seconds = self.improvement_seconds
+        if profile and profile.time_limit_seconds is not None and profile.time_limit_seconds > 0:
+            seconds = min(seconds, float(profile.time_limit_seconds))
+        routes = _improve(problem, _regret_insertion(problem), seconds)
+
+        self.routes = [route.nodes for route in routes]
+        self.tours = [problem.tour(route.nodes, route.vehicle) for route in routes]
+        served = {node for route in self.routes for node in route}
+        dropped = [node for node in problem.orders if node not in served]
+        self.objective_value = sum(
+            problem.route_cost(route.nodes, route.vehicle) for route in routes
+        ) + sum(
+            problem.soft_cost(tour) for tour in self.tours if tour is not None
+        ) + float(problem.penalty[dropped].sum())
+        return self.routes
+
+    def _fallback(self, profile: Optional[SolveProfile], solver_input: SolverInput):
+        # Mandatory orders the heuristic could not place, or a side constraint
+        # it does not model: let OR-Tools find a first solution instead.
+        fallback = OrtoolsSolver(constraints=self.builder.constraints)
+        fallback_profile = replace(
+            profile or SolveProfile.from_solver_input(solver_input),
+            solution_limit=1,
+            optimality_gap=None,
+        )
+        return fallback, fallback_profile
+
+    def solve_tours(
+        self,
+        solver_input: SolverInput,
+        profile: Optional[SolveProfile] = None,
+    ) -> Optional[Tuple[List[Tour], int]]:
+        """
+        ``(tours, objective_value)`` of the constructed routes, or those of
+        the OR-Tools fallback when a mandatory order could not be placed. The
+        objective is the one the OR-Tools model charges for these tours: arc
+        and vehicle costs, soft window and priority penalties at the
+        scheduled visit times, and the penalties of the dropped orders.
+        """
+        self.construct(solver_input, profile)
+        self.lower_bound = arc_cost_lower_bound(solver_input)
+        if np.isfinite(self.objective_value) and all(tour is not None for tour in self.tours):
+            return self.tours, int(round(self.objective_value))
+        fallback, fallback_profile = self._fallback(profile, solver_input)
+        return fallback.solve_tours(solver_input, fallback_profile)
+
+    def solve(
+        self,
+        solver_input: SolverInput,
+        profile: Optional[SolveProfile] = None,
+    ):
+        routes = self.construct(solver_input, profile)
+        self.lower_bound = arc_cost_lower_bound(solver_input)
+
+        manager, routing, _context = self.builder.build(solver_input)
+        assignment = routing.ReadAssignmentFromRoutes(
+            [[manager.NodeToIndex(node) for node in route] for route in routes], True
+        )
+        if assignment is not None:
+            return assignment, routing, manager
+
+        fallback, fallback_profile = self._fallback(profile, solver_input)
+        return fallback.solve(solver_input, fallback_profile)
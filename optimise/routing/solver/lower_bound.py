@@ -0,0 +1,86 @@
+from typing import Optional
+
+import numpy as np
+
+from optimise.routing.input.solver_input import SolverInput
+
+
+def arc_cost_matrix(solver_input: SolverInput) -> np.ndarray:
+    # Mirrors ArcCostConstraint: travel cost plus service time of the origin
+    # node, except for the distance objective.
+    if solver_input.objective == "distance":
+        return np.asarray(solver_input.distance_matrix, dtype=float)
+    costs = np.asarray(solver_input.time_matrix, dtype=float)
+    service = np.zeros(len(costs))
+    durations = np.asarray(solver_input.service_durations[: len(costs)], dtype=float)
+    service[: len(durations)] = durations
+    return costs + service[:, None]
+
+
+def arc_cost_lower_bound(solver_input: SolverInput) -> int:
+    """
+    Cheap lower bound on the objective of a SolverInput.
+
+    Every visited order is entered by exactly one arc and left by exactly one
+    arc, and a dropped order costs its disjunction penalty. Taking, for each
+    order, the cheaper of its penalty and its cheapest incoming (respectively
+    outgoing) arc gives two assignment-relaxation bounds; the larger one is
+    returned. With ``minimize_vehicles`` every visited order puts at least one
+    vehicle in use, so the bound is the cheaper of dropping every order and
+    that fixed vehicle cost on top of the arc bound. All other objective
+    terms (soft windows, span costs) are non-negative and safely ignored.
+    """
+    size = len(solver_input.time_matrix)
+    if size == 0:
+        return 0
+
+    depots = set(solver_input.starts) | set(solver_input.ends)
+    orders = np.array([node for node in range(size) if node not in depots], dtype=np.int64)
+    if orders.size == 0:
+        return 0
+
+    costs = arc_cost_matrix(solver_input)
+    costs[np.arange(size), np.arange(size)] = np.inf
+
+    sources = np.concatenate([np.array(sorted(set(solver_input.starts)), dtype=np.int64), orders])
+    targets = np.concatenate([orders, np.array(sorted(set(solver_input.ends or solver_input.starts)), dtype=np.int64)])
+    cheapest_in = costs[np.ix_(sources, orders)].min(axis=0)
+    cheapest_out = costs[np.ix_(orders, targets)].min(axis=1)
+
+    num_depots = solver_input.num_depots
+    if num_depots is None:
+        num_depots = len(set(solver_input.starts)) if solver_input.starts else 1
+    penalty = np.full(orders.size, np.inf)
+    penalties = solver_input.penalties or []
+    for position, node in enumerate(orders):
+        order_index = node - num_depots
+        if 0 <= order_index < len(penalties):
+            penalty[position] = penalties[order_index]
+
+    bound_in = np.minimum(cheapest_in, penalty)
+    bound_out = np.minimum(cheapest_out, penalty)
+    bound = max(bound_in.sum(), bound_out.sum())
+    vehicle_cost = _fixed_vehicle_cost(solver_input)
+    if vehicle_cost:
+        bound = min(penalty.sum(), bound + vehicle_cost)
+    if not np.isfinite(bound):
+        return 0
+    return int(bound)
+
+
+def _fixed_vehicle_cost(solver_input: SolverInput) -> int:
+    # Mirrors VehicleCostConstraint.
+    if solver_input.distribute_load or not solver_input.minimize_vehicles:
+        return 0
+    return int(solver_input.vehicle_penalty or 0)
+
+
+def optimality_gap(objective_value: Optional[float], lower_bound: Optional[float]) -> Optional[float]:
+    """
+    Relative gap ``(objective - bound) / objective``, or None when unknown.
+    """
+    if objective_value is None or lower_bound is None:
+        return None
+    if objective_value <= 0:
+        return 0.0
+    return max(0.0, (objective_value - lower_bound) / objective_value)
@@ -1,10 +1,12 @@
-from typing import Iterable, Optional, Tuple
+import logging
+from typing import Iterable, List, Optional, Tuple
 
 from ortools.constraint_solver import routing_enums_pb2, pywrapcp
 
 from optimise.routing.config.solve_profile import SolveProfile
 from optimise.routing.constraints import (
     ArcCostConstraint,
+    ArcPruningConstraint,
     BreaksConstraint,
     CapacityConstraint,
     ConstraintContext,
@@ -19,8 +21,23 @@ from optimise.routing.constraints import (
     VehicleCostConstraint,
     ZoneRestrictionConstraint,
 )
-from optimise.routing.core.monitoring import NoImprovementMonitor
+from optimise.routing.core.monitoring import (
+    IncumbentMonitor,
+    NoImprovementMonitor,
+    OptimalityGapMonitor,
+    SolutionPoolMonitor,
+)
+from optimise.routing.defaults import (
+    ALTERNATIVE_MAX_COST_INCREASE,
+    ALTERNATIVE_POOL_SIZE,
+    ROUTE_TEMPLATE_TIME_FRACTION,
+)
 from optimise.routing.input.solver_input import SolverInput
+from optimise.routing.solver.alternatives import assignment_routes, select_diverse_solutions
+from optimise.routing.solver.lower_bound import arc_cost_lower_bound
+from optimise.routing.solver.tours import Tour, assignment_tours, read_tours
+
+logger = logging.getLogger("app")
 
 DEFAULT_CONSTRAINTS = (
     ArcCostConstraint(),
@@ -32,6 +49,7 @@ DEFAULT_CONSTRAINTS = (
     TimeWindowConstraint(),
     PrecedenceConstraint(),
     ZoneRestrictionConstraint(),
+    ArcPruningConstraint(),
     BreaksConstraint(),
     PrioritySoftConstraint(),
     NodeDroppingConstraint(),
@@ -81,6 +99,9 @@ class OrtoolsSolver:
 
     def __init__(self, constraints: Optional[Iterable[RoutingConstraint]] = None) -> None:
         self.builder = OrtoolsRoutingBuilder(constraints=constraints)
+        self.lower_bound: Optional[int] = None
+        self.time_to_incumbent: Optional[float] = None
+        self.alternatives: List[Tuple[int, List[Tour]]] = []
 
     def solve(
         self,
@@ -93,6 +114,11 @@ class OrtoolsSolver:
             monitor = NoImprovementMonitor(routing, solver_input.no_improvement_limit)
             routing.AddAtSolutionCallback(monitor)
 
+        self.lower_bound = arc_cost_lower_bound(solver_input)
+        if profile and profile.optimality_gap:
+            gap_monitor = OptimalityGapMonitor(routing, self.lower_bound, profile.optimality_gap)
+            routing.AddAtSolutionCallback(gap_monitor)
+
         search_parameters = pywrapcp.DefaultRoutingSearchParameters()
         if profile:
             if profile.first_solution_strategy:
@@ -113,5 +139,62 @@ class OrtoolsSolver:
                 search_parameters.solution_limit = int(profile.solution_limit)
             search_parameters.log_search = profile.log_search
 
-        assignment = routing.SolveWithParameters(search_parameters)
+        initial_assignment = None
+        if solver_input.initial_routes:
+            routing.CloseModelWithParameters(search_parameters)
+            initial_assignment = routing.ReadAssignmentFromRoutes(
+                [[manager.NodeToIndex(node) for node in route] for route in solver_input.initial_routes],
+                True,
+            )
+            if initial_assignment is None:
+                logger.warning("Initial routes rejected by the model, searching from scratch")
+            elif profile and profile.time_limit_seconds:
+                # improving an accepted seed needs a fraction of the budget
+                search_parameters.time_limit.seconds = max(
+                    1, int(profile.time_limit_seconds * ROUTE_TEMPLATE_TIME_FRACTION)
+                )
+
+        incumbent_monitor = IncumbentMonitor(routing)
+        routing.AddAtSolutionCallback(incumbent_monitor)
+        pool_monitor = None
+        if profile and profile.alternatives > 0:
+            pool_monitor = SolutionPoolMonitor(
+                routing,
+                manager,
+                max(ALTERNATIVE_POOL_SIZE, profile.alternatives + 1),
+                ALTERNATIVE_MAX_COST_INCREASE,
+            )
+            routing.AddAtSolutionCallback(pool_monitor)
+        if initial_assignment is not None:
+            assignment = routing.SolveFromAssignmentWithParameters(initial_assignment, search_parameters)
+        else:
+            assignment = routing.SolveWithParameters(search_parameters)
+        self.time_to_incumbent = incumbent_monitor.time_to_incumbent
+        self.alternatives = []
+        if pool_monitor is not None and assignment is not None:
+            picked = select_diverse_solutions(
+                pool_monitor.solutions,
+                profile.alternatives,
+                ALTERNATIVE_MAX_COST_INCREASE,
+                incumbent=assignment_routes(assignment, routing, manager),
+            )
+            # the closed model reads every alternative back, with its visit times
+            for objective_value, routes in picked:
+                tours = read_tours(routing, manager, routes)
+                if tours is not None:
+                    self.alternatives.append((objective_value, tours))
         return assignment, routing, manager
+
+    def solve_tours(
+        self,
+        solver_input: SolverInput,
+        profile: Optional[SolveProfile] = None,
+    ) -> Optional[Tuple[List[Tour], int]]:
+        """
+        ``(tours, objective_value)`` of the solution, or None when none was
+        found.
+        """
+        assignment, routing, manager = self.solve(solver_input, profile)
+        if assignment is None:
+            return None
+        return assignment_tours(assignment, routing, manager), assignment.ObjectiveValue()
@@ -1,23 +1,113 @@
 import copy
-from dataclasses import replace
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
+from optimise.routing.adapter.colocation import MergeResult, merge_colocated_nodes
+from optimise.routing.adapter.day_assignment import DayPlan, assign_orders_to_days
 from optimise.routing.adapter.instance_to_solver_input import instance_to_solver_input
+from optimise.routing.adapter.presolve import PresolveResult, presolve_solver_input
 from optimise.routing.config.solve_profile import SolveProfile
 from optimise.routing.constants import translate
+from optimise.routing.core.functions import get_strategy_combinations
+from optimise.routing.core.route_templates import (
+    RouteTemplate,
+    fleet_fingerprint,
+    get_route_template_store,
+    order_key,
+    seed_routes,
+)
+from optimise.routing.core.strategy_selector import (
+    StrategyChoice,
+    get_strategy_selector,
+    instance_context,
+    strategy_reward,
+)
 from optimise.routing.defaults import (
+    ADAPTIVE_STRATEGY_SELECTION,
+    DEFAULT_OPTIMALITY_GAP,
+    ENABLE_COLOCATED_MERGE,
+    ENABLE_DAY_ASSIGNMENT,
+    ENABLE_MATRIX_PREFETCH,
+    ENABLE_PRESOLVE,
+    ENABLE_ROUTE_TEMPLATES,
+    PARALLEL_DAY_WORKERS,
     SEARCH_WORKERS,
+    SOLVER_BACKEND,
     SOLVER_LOG_SEARCH_PROGRESS,
     SOLVER_MAX_SEARCH_TIME_IN_SECONDS,
 )
+from optimise.routing.input.solver_input import SolverInput
+from optimise.routing.input.wire import (
+    PackedSolverInput,
+    pack_solver_input,
+    release_segments,
+    unpack_solver_input,
+)
+from optimise.routing.model import WorkOrder
 from optimise.routing.model.solution import Solution
-from optimise.routing.solver.ortools_builder import OrtoolsSolver
+from optimise.routing.solver.lower_bound import optimality_gap
+from optimise.routing.solver.registry import registry
+from optimise.routing.solver.tours import Tour, tour_routes
 try:
     from solution_routing.solution_routing_CRUD import solution_routing_crud
 except ModuleNotFoundError:
     solution_routing_crud = None
 
+# process-wide pool solving independent groups of days, see _get_day_pool
+_day_pool: Optional[Executor] = None
+_day_pool_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PackedSolution:
+    """
+    Compact solver result sent back from a worker process: the visited nodes
+    of every vehicle (start/end excluded), their tours with visit times and
+    the objective value, plus the ``(objective, tours)`` of the alternatives
+    collected during the search.
+    """
+
+    routes: List[List[int]]
+    objective_value: int
+    tours: List[Tour] = field(default_factory=list)
+    lower_bound: Optional[int] = None
+    time_to_incumbent: Optional[float] = None
+    alternatives: List[Tuple[int, List[Tour]]] = field(default_factory=list)
+
+
+def _make_solver(solver_input: SolverInput):
+    return registry.get(solver_input.solver_backend or SOLVER_BACKEND)()
+
+
+def _solve(solver_input: SolverInput, profile: Optional[SolveProfile] = None) -> Optional[PackedSolution]:
+    solver = _make_solver(solver_input)
+    solved = solver.solve_tours(solver_input, profile)
+    if solved is None:
+        return None
+    tours, objective_value = solved
+    return PackedSolution(
+        routes=tour_routes(tours),
+        objective_value=objective_value,
+        tours=tours,
+        lower_bound=solver.lower_bound,
+        time_to_incumbent=getattr(solver, "time_to_incumbent", None),
+        alternatives=getattr(solver, "alternatives", []),
+    )
+
+
+def solve_packed(
+    packed: PackedSolverInput, profile: Optional[SolveProfile] = None
+) -> Optional[PackedSolution]:
+    """
+    Worker entry point: solve a packed problem and return only the tours.
+    """
+    return _solve(unpack_solver_input(packed), profile)
+
 
 def _post_process_solution(solution_list: List[Solution]) -> Dict[str, Any]:
     results_str: Dict[str, List[str]] = {}
@@ -39,7 +129,13 @@ def _post_process_solution(solution_list: List[Solution]) -> Dict[str, Any]:
                 "summaries": [],
                 "strings": [],
                 "objective_value": 0,
+                "lower_bound": None,
+                "optimality_gap": None,
+                "strategy": None,
             }
+        strategy = getattr(solution, "strategy", None)
+        if strategy is not None:
+            results_json["details"][day_key]["strategy"] = strategy
         if solution.results is not None:
             results_json["details"][day_key]["by_worker"].extend(
                 copy.deepcopy(solution.results["by_worker"])
@@ -49,6 +145,11 @@ def _post_process_solution(solution_list: List[Solution]) -> Dict[str, Any]:
             )
             results_json["details"][day_key]["strings"].append(solution.visualize())
             results_json["details"][day_key]["objective_value"] = solution.objective_value
+            lower_bound = getattr(solution, "lower_bound", None)
+            results_json["details"][day_key]["lower_bound"] = lower_bound
+            results_json["details"][day_key]["optimality_gap"] = optimality_gap(
+                solution.objective_value, lower_bound
+            )
 
     if instance is None:
         return results_json
@@ -77,7 +178,16 @@ def _post_process_solution(solution_list: List[Solution]) -> Dict[str, Any]:
     dropped_tours.extend([d.to_dict() for d in dropped])
 
     results_json["dropped"] = dropped_tours
+    _summarise_results(results_json)
 
+    alternatives = _post_process_alternatives(solution_list, results_json)
+    if alternatives:
+        results_json["alternatives"] = alternatives
+
+    return results_json
+
+
+def _summarise_results(results_json: Dict[str, Any]) -> None:
     # Compute performance sums
     total_sums: Dict[str, Any] = {}
     for date in results_json["details"]:
@@ -90,7 +200,74 @@ def _post_process_solution(solution_list: List[Solution]) -> Dict[str, Any]:
                     total_sums[key] += value
     results_json["performance"] = total_sums
 
-    return results_json
+    bounded_days = [
+        day for day in results_json["details"].values() if day["lower_bound"] is not None
+    ]
+    results_json["optimality_gap"] = None
+    if bounded_days:
+        results_json["optimality_gap"] = optimality_gap(
+            sum(day["objective_value"] for day in bounded_days),
+            sum(day["lower_bound"] for day in bounded_days),
+        )
+
+
+def _served_orders(details: Dict[str, Any], order_ids: set) -> set:
+    return {
+        step["node"]["id"]
+        for day in details.values()
+        for worker in day["by_worker"]
+        for step in worker.get("tour_steps", [])
+        if step["node"]["id"] in order_ids
+    }
+
+
+def _post_process_alternatives(
+    solution_list: List[Solution], results_json: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    One result per alternative collected by the solver, in the layout of the
+    main result: days with a k-th alternative use it, the dropped orders are
+    those the alternative leaves out.
+    """
+    count = max((len(getattr(s, "alternatives", None) or []) for s in solution_list), default=0)
+    if count == 0:
+        return []
+    instance = solution_list[0].instance
+    order_ids = {wo.id for wo in instance._work_orders}
+    served = _served_orders(results_json["details"], order_ids)
+    dropped_message = translate("WAS_SCHEDULED_BUT_DROPPED", instance.language)
+
+    alternatives = []
+    for k in range(count):
+        details = copy.deepcopy(results_json["details"])
+        for solution in solution_list:
+            options = getattr(solution, "alternatives", None) or []
+            if k >= len(options):
+                continue
+            alternative = options[k]
+            day = details[str(solution.current_date.date())]
+            day["by_worker"] = copy.deepcopy(alternative.results["by_worker"])
+            day["summaries"] = [copy.deepcopy(alternative.results["summary"])]
+            day["strings"] = []
+            day["objective_value"] = alternative.objective_value
+            day["optimality_gap"] = optimality_gap(alternative.objective_value, day["lower_bound"])
+        alternative_served = _served_orders(details, order_ids)
+        dropped = [d for d in results_json["dropped"] if d["id"] not in alternative_served]
+        dropped.extend(
+            {
+                "id": wo.id,
+                "address": wo.address,
+                "latitude": wo.latitude,
+                "longitude": wo.longitude,
+                "reason_for_not_scheduling": dropped_message,
+            }
+            for wo in instance._work_orders
+            if wo.id in served and wo.id not in alternative_served
+        )
+        alternative_json = {"details": details, "dropped": dropped}
+        _summarise_results(alternative_json)
+        alternatives.append(alternative_json)
+    return alternatives
 
 
 def solve_instances(instances: List[Any], solution_routing=None) -> List[Dict[str, Any]]:
@@ -100,47 +277,525 @@ def solve_instances(instances: List[Any], solution_routing=None) -> List[Dict[st
     return results
 
 
-def _solve_instance(instance: Any, solution_routing=None) -> Dict[str, Any]:
+def _report_progress(instance: Any, solution_routing=None) -> None:
     if solution_routing is not None and solution_routing_crud is not None:
         solution_routing.status_msg = translate(
             "optimizing_for_skill", instance.language
         ).format(str(instance))
         solution_routing_crud.update(solution_routing)
 
+
+def _build_profile(solver_input: SolverInput) -> SolveProfile:
+    profile = SolveProfile.from_solver_input(solver_input)
+
+    if (
+        SOLVER_MAX_SEARCH_TIME_IN_SECONDS > 0
+        and (profile.time_limit_seconds is None or profile.time_limit_seconds <= 0)
+    ):
+        profile = replace(
+            profile, time_limit_seconds=SOLVER_MAX_SEARCH_TIME_IN_SECONDS
+        )
+    if SOLVER_LOG_SEARCH_PROGRESS and not profile.log_search:
+        profile = replace(profile, log_search=True)
+    if SEARCH_WORKERS > 0 and profile.search_workers is None:
+        profile = replace(profile, search_workers=SEARCH_WORKERS)
+    if DEFAULT_OPTIMALITY_GAP > 0 and profile.optimality_gap is None:
+        profile = replace(profile, optimality_gap=DEFAULT_OPTIMALITY_GAP)
+    return profile
+
+
+def _choose_strategy(
+    instance: Any, solver_input: SolverInput
+) -> Tuple[SolverInput, Optional[StrategyChoice]]:
+    """
+    Let the strategy selector pick the search strategies when adaptive
+    selection is on. Deterministic responses keep the configured strategies.
+    """
+    adaptive = getattr(instance, "adaptive_strategy", None)
+    if adaptive is None:
+        adaptive = ADAPTIVE_STRATEGY_SELECTION
+    if not adaptive or not getattr(instance, "randomize_response", True):
+        return solver_input, None
+    if (solver_input.solver_backend or SOLVER_BACKEND) != "ortools":
+        return solver_input, None
+    choice = get_strategy_selector().choose(
+        instance_context(solver_input),
+        get_strategy_combinations(getattr(instance, "result_type", "fast")),
+        rng=getattr(instance, "_rng", None),
+    )
+    solver_input = replace(
+        solver_input,
+        first_solution_strategy=choice.first_solution_strategy,
+        local_search_metaheuristic=choice.local_search_metaheuristic,
+    )
+    return solver_input, choice
+
+
+def _record_strategy(
+    choice: Optional[StrategyChoice],
+    profile: SolveProfile,
+    objective_value: Optional[int],
+    lower_bound: Optional[int],
+    time_to_incumbent: Optional[float],
+) -> Optional[Dict[str, Any]]:
+    if choice is None:
+        return None
+    if objective_value is None:
+        reward = 0.0
+    else:
+        reward = strategy_reward(
+            objective_value, lower_bound, time_to_incumbent, profile.time_limit_seconds
+        )
+    if reward is not None:
+        get_strategy_selector().record(choice, reward, objective_value, time_to_incumbent)
+    return {**choice.to_dict(), "reward": reward, "time_to_incumbent": time_to_incumbent}
+
+
+def _presolve(instance: Any, solver_input: SolverInput) -> PresolveResult:
+    if not ENABLE_PRESOLVE:
+        return PresolveResult(
+            solver_input=solver_input,
+            kept_nodes=list(range(len(solver_input.time_matrix))),
+        )
+    presolved = presolve_solver_input(solver_input)
+    work_orders = instance.work_orders
+    for item in presolved.dropped:
+        order_index = item.node - instance.nb_depots
+        if 0 <= order_index < len(work_orders):
+            message = translate(item.reason, instance.language)
+            if message not in work_orders[order_index].errors:
+                work_orders[order_index].errors.append(message)
+    return presolved
+
+
+def _merge_colocated(solver_input: SolverInput) -> MergeResult:
+    if not ENABLE_COLOCATED_MERGE:
+        return MergeResult(
+            solver_input=solver_input,
+            members=[[node] for node in range(len(solver_input.time_matrix))],
+        )
+    return merge_colocated_nodes(solver_input)
+
+
+def _route_templates_enabled(instance: Any) -> bool:
+    enabled = getattr(instance, "route_templates", None)
+    if enabled is None:
+        enabled = ENABLE_ROUTE_TEMPLATES
+    return bool(enabled)
+
+
+def _seed_from_template(
+    instance: Any, presolved: PresolveResult, merged: MergeResult, solver_input: SolverInput
+) -> SolverInput:
+    """
+    Start the search from the stored template of the day's fleet when its
+    orders are close enough to today's. Orders that are new to the template
+    are left unperformed in the initial routes, for the search to insert.
+    """
+    if not _route_templates_enabled(instance):
+        return solver_input
+    if (solver_input.solver_backend or SOLVER_BACKEND) != "ortools":
+        return solver_input
+    keys = [order_key(wo) for wo in instance.work_orders]
+    template = get_route_template_store().match(fleet_fingerprint(instance), keys)
+    if template is None:
+        return solver_input
+
+    solved_node = {
+        presolved.kept_nodes[member]: node
+        for node, members in enumerate(merged.members)
+        for member in members
+    }
+    order_nodes: Dict[str, List[int]] = {}
+    for order_index, key in enumerate(keys):
+        node = solved_node.get(order_index + instance.nb_depots)
+        if node is not None:
+            order_nodes.setdefault(key, []).append(node)
+    routes = seed_routes(template, [worker.id for worker in instance.workers], order_nodes)
+    # a merged node stands for several orders, it is visited once
+    seen = set()
+    routes = [
+        [node for node in route if not (node in seen or seen.add(node))] for route in routes
+    ]
+    if not any(routes):
+        return solver_input
+    return replace(solver_input, initial_routes=routes)
+
+
+def _record_template(instance: Any, solution: Solution) -> None:
+    """
+    Store the routes of a solved day as the template of its fleet. Must run
+    before the scheduled orders are removed from the instance.
+    """
+    if not _route_templates_enabled(instance):
+        return
+    template = RouteTemplate(
+        fingerprint=fleet_fingerprint(instance),
+        orders=[order_key(wo) for wo in instance.work_orders],
+        routes={
+            str(worker.id): [
+                order_key(step.node)
+                for step in worker.tour_steps
+                if isinstance(step.node, WorkOrder)
+            ]
+            for worker in instance.workers
+        },
+        objective_value=solution.objective_value,
+    )
+    get_route_template_store().record(template)
+
+
+def _expand_solution(
+    solver_input: SolverInput,
+    presolved: PresolveResult,
+    merged: MergeResult,
+    packed_solution: PackedSolution,
+) -> PackedSolution:
+    """
+    Map a solution of the pruned, merged problem back to the original node
+    indices, tours included, so the day loads without a model of the original
+    problem. The pruned orders are dropped, so their penalties join the
+    objective values and the lower bound.
+    """
+    dropped_penalty = presolved.dropped_penalty(solver_input)
+    lower_bound = packed_solution.lower_bound
+    if lower_bound is not None:
+        lower_bound += dropped_penalty
+    return PackedSolution(
+        routes=presolved.expand_routes(merged.expand_routes(packed_solution.routes)),
+        objective_value=packed_solution.objective_value + dropped_penalty,
+        tours=presolved.expand_tours(
+            merged.expand_tours(packed_solution.tours, presolved.solver_input.service_durations)
+        ),
+        lower_bound=lower_bound,
+        time_to_incumbent=packed_solution.time_to_incumbent,
+        alternatives=[
+            (
+                objective_value + dropped_penalty,
+                presolved.expand_tours(merged.expand_tours(tours, presolved.solver_input.service_durations)),
+            )
+            for objective_value, tours in packed_solution.alternatives
+        ],
+    )
+
+
+def _detached_instance(instance: Any) -> Any:
+    """
+    Shallow copy of ``instance`` with its own copies of the workers, orders
+    and depots, which a Solution can record tours on without touching the
+    instance.
+    """
+    detached = copy.copy(instance)
+    memo = {id(instance): detached}
+    detached._workers = copy.deepcopy(instance._workers, memo)
+    detached._work_orders = copy.deepcopy(instance._work_orders, memo)
+    detached.depots = copy.deepcopy(instance.depots, memo)
+    return detached
+
+
+def _alternative_solutions(
+    instance: Any, alternatives: List[Tuple[int, List[Tour]]]
+) -> List[Solution]:
+    """
+    Solutions of the current day for the alternatives found by the solver,
+    each recorded on a detached copy of the instance.
+    """
+    return [
+        Solution.from_tours(_detached_instance(instance), tours, objective_value)
+        for objective_value, tours in alternatives
+    ]
+
+
+def _plan_days(instance: Any) -> Optional[DayPlan]:
+    """
+    Assign the orders of a multi-day horizon to days when the day assignment
+    is on; each day is then routed with its own orders and those dropped on
+    earlier days.
+    """
+    enabled = getattr(instance, "day_assignment", None)
+    if enabled is None:
+        enabled = ENABLE_DAY_ASSIGNMENT
+    if not enabled or (instance.optimization_horizon or 1) <= 1:
+        return None
+    plan = assign_orders_to_days(instance)
+    instance.day_plan = {
+        order_id: (instance.period_start + timedelta(days=day_i)).date()
+        for order_id, day_i in plan.days.items()
+    }
+    return plan
+
+
+def _forget_day_pool() -> None:
+    """Drop the pool without shutting it down: its workers belong to the parent."""
+    global _day_pool, _day_pool_lock
+    _day_pool = None
+    _day_pool_lock = threading.Lock()
+
+
+def _get_day_pool() -> Executor:
+    """
+    The pool of ``PARALLEL_DAY_WORKERS`` workers shared by every request of
+    the process, created on first use. Workers are started by a fork server
+    (or spawned) rather than forked from this process, whose other threads
+    may hold locks.
+    """
+    global _day_pool
+    with _day_pool_lock:
+        if _day_pool is None:
+            if os.getenv("TEST_ENVIRONMENT"):
+                _day_pool = ThreadPoolExecutor(max_workers=PARALLEL_DAY_WORKERS)
+            else:
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _day_pool = ProcessPoolExecutor(
+                    max_workers=PARALLEL_DAY_WORKERS, mp_context=multiprocessing.get_context(method)
+                )
+        return _day_pool
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_day_pool)
+
+
+def _solve_instance(instance: Any, solution_routing=None) -> Dict[str, Any]:
+    _report_progress(instance, solution_routing)
+    _plan_days(instance)
+
+    horizon = instance.optimization_horizon
+    groups = []
+    # daemonic processes (e.g. prefork task workers) cannot start a pool
+    if PARALLEL_DAY_WORKERS > 1 and horizon > 1 and not multiprocessing.current_process().daemon:
+        groups = independent_day_groups(instance)
+    if len(groups) > 1:
+        parallel_days = min(PARALLEL_DAY_WORKERS, len(groups))
+        solutions = solve_day_groups(instance, groups, _get_day_pool(), parallel_days)
+    elif ENABLE_MATRIX_PREFETCH and horizon > 1:
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            solutions = _solve_days(instance, prefetcher)
+    else:
+        solutions = _solve_days(instance)
+    return _post_process_solution(solutions)
+
+
+def _solve_days(instance: Any, prefetcher: Optional[Executor] = None) -> List[Solution]:
+    """
+    Solve the horizon day by day. With a ``prefetcher``, the travel matrices
+    of the following days are fetched while the current day is searched;
+    day ``n + 1`` then only slices them for the orders still pending.
+    """
     horizon = instance.optimization_horizon
     day_start = instance.period_start
     solutions: List[Solution] = []
 
     for day_i in range(horizon):
         day = day_start + timedelta(days=day_i)
-        instance.init_instance(day)
+        instance.init_instance(day, prefetch_pending=prefetcher is None)
+        if prefetcher is not None and day_i + 1 < horizon:
+            instance.prefetch_locations(day + timedelta(days=1), prefetcher)
 
         if not instance.can_schedule_new_orders:
             solutions.append(Solution(instance, None, None, None))
             continue
 
-        solver_input = instance_to_solver_input(instance)
-        profile = SolveProfile.from_solver_input(solver_input)
+        pending = _prepare_day(instance)
+        solutions.append(_load_day(instance, pending, _solve(pending.solve_input, pending.profile)))
 
-        if (
-            SOLVER_MAX_SEARCH_TIME_IN_SECONDS > 0
-            and (profile.time_limit_seconds is None or profile.time_limit_seconds <= 0)
-        ):
-            profile = replace(
-                profile, time_limit_seconds=SOLVER_MAX_SEARCH_TIME_IN_SECONDS
-            )
-        if SOLVER_LOG_SEARCH_PROGRESS and not profile.log_search:
-            profile = replace(profile, log_search=True)
-        if SEARCH_WORKERS > 0 and profile.search_workers is None:
-            profile = replace(profile, search_workers=SEARCH_WORKERS)
-
-        solver = OrtoolsSolver()
-        assignment, routing, manager = solver.solve(solver_input, profile)
-        if assignment is not None:
-            solution = Solution(instance, assignment, routing, manager)
-            solutions.append(solution)
-            solution.set_scheduled_workorder()
-        else:
-            solutions.append(Solution(instance, None, None, None))
+    return solutions
 
-    return _post_process_solution(solutions)
+
+@dataclass
+class _PendingDay:
+    """
+    A day prepared for the solver, with what is needed to load the result
+    back into the instance; ``future`` is set when it is submitted to a
+    worker process.
+    """
+
+    solver_input: SolverInput
+    presolved: PresolveResult
+    merged: MergeResult
+    choice: Optional[StrategyChoice]
+    solve_input: SolverInput
+    profile: SolveProfile
+    future: Any = None
+
+
+def _prepare_day(instance: Any, parallel_days: int = 1) -> _PendingDay:
+    """
+    Build the day's solver input and profile. When ``parallel_days`` days are
+    searched at once, they share the search workers.
+    """
+    solver_input = instance_to_solver_input(instance)
+    presolved = _presolve(instance, solver_input)
+    merged = _merge_colocated(presolved.solver_input)
+    solve_input, choice = _choose_strategy(instance, merged.solver_input)
+    solve_input = _seed_from_template(instance, presolved, merged, solve_input)
+    profile = _build_profile(solve_input)
+    if parallel_days > 1 and profile.search_workers:
+        profile = replace(profile, search_workers=max(1, profile.search_workers // parallel_days))
+    return _PendingDay(solver_input, presolved, merged, choice, solve_input, profile)
+
+
+def _load_day(
+    instance: Any, pending: _PendingDay, packed_solution: Optional[PackedSolution]
+) -> Solution:
+    """
+    Record the tours of the day's solution on the instance, which must be
+    initialised on the day ``pending`` was prepared for.
+    """
+    if packed_solution is None:
+        solution = Solution(instance, None, None, None)
+        solution.strategy = _record_strategy(pending.choice, pending.profile, None, None, None)
+        return solution
+    if pending.presolved.dropped or pending.merged.is_reduced:
+        packed_solution = _expand_solution(
+            pending.solver_input, pending.presolved, pending.merged, packed_solution
+        )
+    alternative_solutions = _alternative_solutions(instance, packed_solution.alternatives)
+    solution = Solution.from_tours(instance, packed_solution.tours, packed_solution.objective_value)
+    solution.lower_bound = packed_solution.lower_bound
+    solution.alternatives = alternative_solutions
+    solution.strategy = _record_strategy(
+        pending.choice,
+        pending.profile,
+        packed_solution.objective_value,
+        packed_solution.lower_bound,
+        packed_solution.time_to_incumbent,
+    )
+    _record_template(instance, solution)
+    solution.set_scheduled_workorder()
+    return solution
+
+
+def _submit_day(
+    instance: Any, executor: Executor, segments: List[Any], parallel_days: int = 1
+) -> Optional[_PendingDay]:
+    """
+    Pack the day the instance is initialised on and submit it to ``executor``.
+    Returns None when there is nothing to schedule that day.
+    """
+    if not instance.can_schedule_new_orders:
+        return None
+    pending = _prepare_day(instance, parallel_days)
+    packed, day_segments = pack_solver_input(pending.solve_input)
+    segments.extend(day_segments)
+    pending.future = executor.submit(solve_packed, packed, pending.profile)
+    return pending
+
+
+def _collect_day(instance: Any, pending: _PendingDay) -> Solution:
+    """
+    Load the worker's tours into the instance, which must be initialised on
+    the same day as when ``pending`` was submitted.
+    """
+    return _load_day(instance, pending, pending.future.result())
+
+
+def solve_instance_runs(
+    run_instances: List[Any], executor: Executor, solution_routing=None
+) -> List[Dict[str, Any]]:
+    """
+    Solve several independent runs of the horizon, one day at a time.
+
+    Instances stay in this process: each day is initialised locally, only the
+    packed SolverInput is submitted to ``executor`` and only the routes come
+    back, so no domain object crosses the process boundary. Runs progress in
+    lockstep because day ``n + 1`` depends on what was scheduled on day ``n``.
+    """
+    solutions: List[List[Solution]] = [[] for _ in run_instances]
+    if not run_instances:
+        return []
+
+    for instance in run_instances:
+        _report_progress(instance, solution_routing)
+        _plan_days(instance)
+
+    horizon = max(instance.optimization_horizon for instance in run_instances)
+    for day_i in range(horizon):
+        pending = []
+        segments: List[Any] = []
+        try:
+            for run, instance in enumerate(run_instances):
+                if day_i >= instance.optimization_horizon:
+                    continue
+                instance.init_instance(instance.period_start + timedelta(days=day_i))
+                submitted = _submit_day(instance, executor, segments)
+                if submitted is None:
+                    solutions[run].append(Solution(instance, None, None, None))
+                    continue
+                pending.append((run, submitted))
+
+            for run, submitted in pending:
+                solutions[run].append(_collect_day(run_instances[run], submitted))
+        finally:
+            release_segments(segments)
+
+    return [_post_process_solution(run_solutions) for run_solutions in solutions]
+
+
+def independent_day_groups(instance: Any) -> List[List[int]]:
+    """
+    Split the horizon (day offsets) into groups that share no pending order.
+
+    An order can only be scheduled between its earliest start (or planned
+    day) and latest end date, so days it cannot span do not depend on each
+    other: only days inside a group carry dropped orders over.
+    """
+    horizon = instance.optimization_horizon
+    start = instance.period_start.date()
+    day_plan = getattr(instance, "day_plan", None) or {}
+    reach = list(range(horizon))
+    for wo in instance._work_orders:
+        if wo.is_scheduled or wo.earliest_start is None or wo.latest_end is None:
+            continue
+        first = max((wo.earliest_start.date() - start).days, 0)
+        planned_date = day_plan.get(str(wo.id)) if day_plan else None
+        if planned_date is not None:
+            # the order is not routed before its planned day
+            first = max(first, (planned_date - start).days)
+        last = min((wo.latest_end.date() - start).days, horizon - 1)
+        if first < last:
+            reach[first] = max(reach[first], last)
+
+    groups: List[List[int]] = []
+    group_end = -1
+    for day_i in range(horizon):
+        if day_i > group_end:
+            groups.append([])
+        groups[-1].append(day_i)
+        group_end = max(group_end, reach[day_i])
+    return groups
+
+
+def solve_day_groups(
+    instance: Any, groups: List[List[int]], executor: Executor, parallel_days: int = 1
+) -> List[Solution]:
+    """
+    Solve independent groups of days concurrently. The k-th day of every
+    group is submitted to ``executor`` at once; a day is initialised again
+    before its routes are loaded, which reproduces its state since the other
+    groups never touch its orders. ``parallel_days`` is how many days the
+    executor runs at once, which share the search workers.
+    """
+    solutions: Dict[int, Solution] = {}
+    for step in range(max((len(group) for group in groups), default=0)):
+        pending = []
+        segments: List[Any] = []
+        try:
+            for group in groups:
+                if step >= len(group):
+                    continue
+                day_i = group[step]
+                instance.init_instance(instance.period_start + timedelta(days=day_i))
+                submitted = _submit_day(instance, executor, segments, parallel_days)
+                if submitted is None:
+                    solutions[day_i] = Solution(instance, None, None, None)
+                    continue
+                pending.append((day_i, submitted))
+
+            for day_i, submitted in pending:
+                instance.init_instance(instance.period_start + timedelta(days=day_i))
+                solutions[day_i] = _collect_day(instance, submitted)
+        finally:
+            release_segments(segments)
+
+    return [solutions[day_i] for day_i in sorted(solutions)]
@@ -0,0 +1,45 @@
+from typing import List, Optional, Sequence, Tuple
+
+# Stops of one vehicle, start and end included, as ``(node, visit time)``;
+# the time is the cumul of the Time dimension at the stop.
+Tour = List[Tuple[int, int]]
+
+TIME_DIMENSION = "Time"
+
+
+def assignment_tours(assignment, routing, manager) -> List[Tour]:
+    """
+    Tour of every vehicle in ``assignment``. Without a Time dimension every
+    visit time is 0.
+    """
+    time_dimension = routing.GetDimensionOrDie(TIME_DIMENSION) if routing.HasDimension(TIME_DIMENSION) else None
+    tours: List[Tour] = []
+    for vehicle in range(routing.vehicles()):
+        tour: Tour = []
+        index = routing.Start(vehicle)
+        while True:
+            visit_time = assignment.Min(time_dimension.CumulVar(index)) if time_dimension else 0
+            tour.append((manager.IndexToNode(index), visit_time))
+            if routing.IsEnd(index):
+                break
+            index = assignment.Value(routing.NextVar(index))
+        tours.append(tour)
+    return tours
+
+
+def read_tours(routing, manager, routes: Sequence[Sequence[int]]) -> Optional[List[Tour]]:
+    """
+    Tours of ``routes`` (visited nodes, start/end excluded) in the closed
+    ``routing`` model, or None when the model rejects them.
+    """
+    assignment = routing.ReadAssignmentFromRoutes(
+        [[manager.NodeToIndex(node) for node in route] for route in routes], True
+    )
+    if assignment is None:
+        return None
+    return assignment_tours(assignment, routing, manager)
+
+
+def tour_routes(tours: Sequence[Tour]) -> List[List[int]]:
+    """Visited nodes of every tour, start/end excluded."""
+    return [[node for node, _time in tour[1:-1]] for tour in tours]
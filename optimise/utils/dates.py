@@ -1,10 +1,12 @@
 """Useful things to do with dates"""
 import logging
-from datetime import datetime, timedelta, time
+import re
+from datetime import date, datetime, timedelta, time
+from functools import lru_cache
 import math
 from dateutil.parser import parse
 logger = logging.getLogger("app")
-from optimise.routing.defaults import ROUTING_TIME_RESOLUTION
+from optimise.routing.defaults import DATE_PARSE_CACHE_SIZE, ROUTING_TIME_RESOLUTION
 from optimise.routing.constants import translate
 
 
@@ -80,41 +82,92 @@ def is_date(string, fuzzy=False):
         return False
 
 
-def date_from_string(string, format_string=None,return_datetime=True ):
-    """Runs through a few common string formats for datetimes,
-    and attempts to coerce them into a datetime. Alternatively,
-    format_string can provide either a single string to attempt
-    or an iterable of strings to attempt."""
+class DateParseError(ValueError):
+    """A date or time field of the request holds a value that does not parse."""
+
+    def __init__(self, field, value):
+        super().__init__("Invalid value for '{}': {!r}".format(field, value))
+        self.field = field
+        self.value = value
+
+
+# Formats whose strptime result datetime.fromisoformat gives faster, with the
+# exact shape of the strings it may be used for.
+_ISO_FORMATS = {
+    "%Y-%m-%d": re.compile(r"\d{4}-\d{2}-\d{2}"),
+    "%Y-%m-%d %H:%M:%S": re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"),
+    "%Y-%m-%dT%H:%M:%S": re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}"),
+}
+_ISO_TIME_FORMATS = {
+    "%H:%M:%S": re.compile(r"\d{2}:\d{2}:\d{2}"),
+    "%H:%M": re.compile(r"\d{2}:\d{2}"),
+}
+_STRPTIME_EPOCH = date(1900, 1, 1)
+
+
+@lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def parse_datetime(string, format_string):
+    """
+    ``datetime.strptime`` memoised on the string, with an ISO-8601 fast path
+    for the common formats. Raises ValueError like strptime.
+    """
+    if isinstance(string, str):
+        pattern = _ISO_FORMATS.get(format_string)
+        if pattern is not None and pattern.fullmatch(string):
+            return datetime.fromisoformat(string)
+        pattern = _ISO_TIME_FORMATS.get(format_string)
+        if pattern is not None and pattern.fullmatch(string):
+            return datetime.combine(_STRPTIME_EPOCH, time.fromisoformat(string))
+    return datetime.strptime(string, format_string)
+
+
+@lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def _date_from_string(string, format_string, today):
+    # ``today`` only keys the memo: dateutil fills missing date parts with it.
     formats_string = [
             "%Y-%m-%d",
             "%m-%d-%Y",
             "%m/%d/%Y",
             "%d/%m/%Y",
         ]
-    if isinstance(format_string, str):
+    if format_string is not None:
         formats_string.insert(0, format_string)
 
-
-
-
-
-
     for format in formats_string:
         try:
-            if return_datetime:
-                return datetime.strptime(string, format)
-            else:
-                return datetime.strptime(string, format).date()
+            return parse_datetime(string, format)
         except ValueError:
             try:
-                parsed = parse(string)
-                return parsed if return_datetime else parsed.date()
+                return parse(string)
             except ValueError:
                 continue
 
     raise ValueError("Could not produce date from string: {}".format(string))
 
 
+def date_from_string(string, format_string=None,return_datetime=True ):
+    """Runs through a few common string formats for datetimes,
+    and attempts to coerce them into a datetime. Alternatively,
+    format_string can provide either a single string to attempt
+    or an iterable of strings to attempt. Results are memoised, so the
+    repeated values of a request are parsed once."""
+    if not isinstance(format_string, str):
+        format_string = None
+    parsed = _date_from_string(string, format_string, date.today())
+    return parsed if return_datetime else parsed.date()
+
+
+def parse_field(value, field, format_string=None, return_datetime=True):
+    """
+    ``date_from_string`` for the ``field`` of a request, raising a
+    DateParseError that names the field when the value does not parse.
+    """
+    try:
+        return date_from_string(value, format_string, return_datetime)
+    except (TypeError, ValueError, OverflowError) as exc:
+        raise DateParseError(field, value) from exc
+
+
 def to_datetime(plain_date, hours=0, minutes=0, seconds=0, ms=0):
     """given a datetime.date, gives back a datetime"""
     # don't mess with datetimes
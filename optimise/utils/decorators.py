@@ -1,25 +1,53 @@
+import threading
 import time
 from functools import wraps
 
 
-def rate_limited(max_per_second):
-    min_interval = 1.0 / max_per_second
-
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills ``rate`` tokens per second and holds at
+    most ``capacity``, so up to ``capacity`` calls may go out back to back.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1.0):
+        """Block until ``tokens`` are available, then take them."""
+        while True:
+            with self._lock:
+                if self._take(tokens):
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def try_acquire(self, tokens=1.0):
+        """Take ``tokens`` if they are available now; never blocks."""
+        with self._lock:
+            return self._take(tokens)
+
+    def _take(self, tokens):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < tokens:
+            return False
+        self._tokens -= tokens
+        return True
+
+
+def rate_limited(max_per_second, burst=1):
     def decorate(func):
-        last_time_called = [0.0]
+        bucket = TokenBucket(max_per_second, burst)
 
         @wraps(func)
         def rate_limited_function(*args, **kwargs):
-            elapsed = time.time() - last_time_called[0]
-            left_to_wait = min_interval - elapsed
-
-            if left_to_wait > 0:
-                time.sleep(left_to_wait)
-
-            ret = func(*args, **kwargs)
-            last_time_called[0] = time.time()
-
-            return ret
+            bucket.acquire()
+            return func(*args, **kwargs)
 
         return rate_limited_function
 
@@ -0,0 +1,156 @@
+"""Offline postcode and locality centroids, for coarse geocoding without network."""
+import csv
+import os
+import sqlite3
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+from optimise.routing.defaults import GAZETTEER_PATH
+
+# Precision of a gazetteer answer, from the finest to the coarsest
+POSTCODE = "postcode"
+POSTCODE_PREFIX = "postcode_prefix"
+LOCALITY = "locality"
+
+# Shortest postcode prefix worth a lookup
+MIN_PREFIX_LENGTH = 2
+
+# Columns of a GeoNames postal code dump (tab separated, no header)
+GEONAMES_COLUMNS = {"country": 0, "postal_code": 1, "locality": 2, "latitude": 9, "longitude": 10}
+
+
+def normalize_postal_code(value: Any) -> str:
+    return "".join(ch for ch in str(value or "").upper() if ch.isalnum())
+
+
+def normalize_locality(value: Any) -> str:
+    text = unicodedata.normalize("NFKD", str(value or "")).casefold()
+    text = "".join(ch if ch.isalnum() else " " for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.split())
+
+
+def normalize_country(value: Any) -> str:
+    return str(value or "").strip().upper()
+
+
+class Gazetteer:
+    """
+    Postcode and locality centroids in a SQLite table. Lookups are indexed
+    equality queries on normalised keys: the exact postcode, then shorter
+    and shorter prefixes of it, then the locality. Connections are opened
+    per thread, so a gazetteer may be shared by concurrent geocoders.
+    """
+
+    _create_sql = (
+        "CREATE TABLE IF NOT EXISTS places "
+        "(country TEXT NOT NULL, postal_code TEXT NOT NULL, locality TEXT NOT NULL, "
+        "latitude REAL NOT NULL, longitude REAL NOT NULL)"
+    )
+    _create_indexes = (
+        "CREATE INDEX IF NOT EXISTS places_postal_code ON places (country, postal_code)",
+        "CREATE INDEX IF NOT EXISTS places_locality ON places (country, locality)",
+    )
+    _insert_sql = "INSERT INTO places (country, postal_code, locality, latitude, longitude) VALUES (?, ?, ?, ?, ?)"
+    _postal_sql = "SELECT locality, latitude, longitude FROM places WHERE country = ? AND postal_code = ?"
+    _locality_sql = "SELECT AVG(latitude), AVG(longitude) FROM places WHERE country = ? AND locality = ?"
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        if path is None:
+            base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+            path = GAZETTEER_PATH
+            if not os.path.isabs(path):
+                path = os.path.join(base_dir, path)
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=60)
+            connection.execute(self._create_sql)
+            for statement in self._create_indexes:
+                connection.execute(statement)
+            self._local.connection = connection
+        return connection
+
+    def import_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add places given as dicts with ``country``, ``postal_code``,
+        ``locality``, ``latitude`` and ``longitude``. Returns the count added.
+        """
+        connection = self._connection()
+        count = 0
+        with connection:
+            for row in rows:
+                try:
+                    latitude, longitude = float(row["latitude"]), float(row["longitude"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                connection.execute(
+                    self._insert_sql,
+                    (
+                        normalize_country(row.get("country")),
+                        normalize_postal_code(row.get("postal_code")),
+                        normalize_locality(row.get("locality")),
+                        latitude,
+                        longitude,
+                    ),
+                )
+                count += 1
+        return count
+
+    def import_csv(self, file: TextIO) -> int:
+        """Import a CSV with a header naming the ``import_rows`` columns."""
+        return self.import_rows(csv.DictReader(file))
+
+    def import_geonames(self, file: TextIO) -> int:
+        """Import a GeoNames postal code dump (``allCountries.txt`` or a country file)."""
+        rows = (
+            {name: values[index] for name, index in GEONAMES_COLUMNS.items()}
+            for values in csv.reader(file, delimiter="\t", quoting=csv.QUOTE_NONE)
+            if len(values) > GEONAMES_COLUMNS["longitude"]
+        )
+        return self.import_rows(rows)
+
+    def lookup(self, address_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Centroid of the address postcode, or of its locality, as
+        ``{"latitude", "longitude", "geocode_precision"}``; None if unknown.
+        """
+        connection = self._connection()
+        country = normalize_country(address_dict.get("country"))
+        locality = normalize_locality(address_dict.get("city"))
+        postal_code = normalize_postal_code(address_dict.get("postalcode"))
+
+        length = len(postal_code)
+        while postal_code and length >= min(MIN_PREFIX_LENGTH, len(postal_code)):
+            rows = connection.execute(self._postal_sql, (country, postal_code[:length])).fetchall()
+            if rows:
+                matching = [row for row in rows if row[0] == locality] or rows
+                precision = POSTCODE if length == len(postal_code) else POSTCODE_PREFIX
+                return {
+                    "latitude": sum(row[1] for row in matching) / len(matching),
+                    "longitude": sum(row[2] for row in matching) / len(matching),
+                    "geocode_precision": precision,
+                }
+            length -= 1
+
+        if locality:
+            latitude, longitude = connection.execute(self._locality_sql, (country, locality)).fetchone()
+            if latitude is not None:
+                return {"latitude": latitude, "longitude": longitude, "geocode_precision": LOCALITY}
+        return None
+
+
+_gazetteer: Optional[Gazetteer] = None
+
+
+def get_gazetteer() -> Gazetteer:
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer
@@ -1,13 +1,32 @@
 from geopy.geocoders import Nominatim, GoogleV3, OpenCage, MapBox
+import math
 import os
-from optimise.routing.defaults import ENABLE_GEOCODING_CACHE, GEOLOC_CACHE_BACKEND, GEOLOC_LOCAL_CACHE_DIR
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from optimise.routing.defaults import (
+    ENABLE_GEOCODING_CACHE,
+    GAZETTEER_MODE,
+    GEOCODE_ERROR_TTL_SECONDS,
+    GEOCODE_MEMORY_CACHE_SIZE,
+    GEOCODE_NEGATIVE_TTL_SECONDS,
+    GEOCODING_BURST,
+    GEOCODING_WORKERS,
+    GEOLOC_CACHE_BACKEND,
+    GEOLOC_LOCAL_CACHE_DIR,
+    NOMINATIM_BURST,
+    NOMINATIM_RATE_LIMIT,
+)
 import time
 
 import logging
 
 logger = logging.getLogger("app")
 
-from optimise.utils.decorators import rate_limited
+from optimise.utils.decorators import TokenBucket, rate_limited
+from optimise.utils.gazetteer import get_gazetteer
+from optimise.utils.retry_budget import budget_scope, current_budget
 from diskcache import Cache
 
 try:
@@ -57,54 +76,325 @@ def _get_local_cache():
     return _local_cache
 
 
-def get_geolocation(address_dict, default_service="nominatim"):
-    # address = address_str(address_dict)
-    #
-    # if not isinstance(address, str):
-    #     return None
+# Why an address could not be geocoded; provider errors are retried sooner.
+NOT_FOUND = "not_found"
+POSTCODE_MISMATCH = "postcode_mismatch"
+PROVIDER_ERROR = "provider_error"
+# the job ran out of time before asking: not remembered
+DEADLINE = "deadline"
+_NEGATIVE_TTL = {
+    NOT_FOUND: GEOCODE_NEGATIVE_TTL_SECONDS,
+    POSTCODE_MISMATCH: GEOCODE_NEGATIVE_TTL_SECONDS,
+    PROVIDER_ERROR: GEOCODE_ERROR_TTL_SECONDS,
+}
+_NEGATIVE_PREFIX = "negative:"
+# Precision of provider answers; gazetteer answers are coarser
+ADDRESS = "address"
+# Geocoding service name that asks for gazetteer centroids first
+GAZETTEER = "gazetteer"
+
+
+@dataclass
+class GeocodeStats:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    memory_hits: int = 0
+    store_hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    gazetteer_hits: int = 0
+
+    def count(self, name, amount=1):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "store_hits": self.store_hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "gazetteer_hits": self.gazetteer_hits,
+            }
+
+
+class _Memo:
+    """
+    In-process LRU of geocoded addresses, keyed by normalised address. Values
+    are ``(lat_long, reason, expires_at)``; failures have a reason and expire.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, address):
+        with self._lock:
+            entry = self._entries.get(address)
+            if entry is None:
+                return None
+            if entry[2] is not None and entry[2] <= time.time():
+                del self._entries[address]
+                return None
+            self._entries.move_to_end(address)
+            return entry
+
+    def set(self, address, lat_long, reason=None, expires_at=None):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[address] = (lat_long, reason, expires_at)
+            self._entries.move_to_end(address)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+geocoding_stats = GeocodeStats()
+_memo = _Memo(GEOCODE_MEMORY_CACHE_SIZE)
+
+# Requests per second and back-to-back calls of providers stricter than
+# RATE_LIMIT and GEOCODING_BURST
+_PROVIDER_LIMITS = {"nominatim": (NOMINATIM_RATE_LIMIT, NOMINATIM_BURST)}
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
 
+def _provider_limit(name):
+    return _PROVIDER_LIMITS.get(name, (RATE_LIMIT, GEOCODING_BURST))
+
+
+def _provider_bucket(name):
+    """Token bucket shared by every thread calling provider ``name``."""
+    with _buckets_lock:
+        bucket = _buckets.get(name)
+        if bucket is None:
+            bucket = _buckets[name] = TokenBucket(*_provider_limit(name))
+        return bucket
+
+
+def _provider_workers(name, max_workers):
+    """
+    Threads worth running against provider ``name``: one second of its rate,
+    or its burst. More would only queue on its token bucket.
+    """
+    rate, burst = _provider_limit(name)
+    return max(1, min(max_workers, max(burst, math.ceil(rate))))
+
+
+def normalize_address(address_dict):
+    """Case- and spacing-insensitive form of an address, to spot repeats."""
+    return " ".join(address_str(address_dict).casefold().split())
+
+
+def _cache_key(address_dict):
+    key = address_str(address_dict)
+    if geo_entries_crud is not None:
+        key = geo_entries_crud.hash_key(key)
+    return key
+
+
+def _cache_get_many(keys):
+    found = {}
+    if GEOLOC_CACHE_BACKEND == "db":
+        if geo_entries_crud is None or db_session is None:
+            return found
+        session = db_session()
+        try:
+            for key in keys:
+                found[key] = geo_entries_crud.get(session, key)
+        finally:
+            session.close()
+    elif GEOLOC_CACHE_BACKEND == "local":
+        cache = _get_local_cache()
+        with cache.transact():
+            for key in keys:
+                found[key] = cache.get(key)
+    return found
+
+
+def _cache_set_many(entries):
+    if GEOLOC_CACHE_BACKEND == "db":
+        if geo_entries_crud is None or db_session is None:
+            return
+        session = db_session()
+        try:
+            for key, lat_long in entries.items():
+                geo_entries_crud.create(session, key, lat_long)
+        finally:
+            session.close()
+    elif GEOLOC_CACHE_BACKEND == "local":
+        cache = _get_local_cache()
+        with cache.transact():
+            for key, lat_long in entries.items():
+                cache.set(key, lat_long)
+
+
+def _negative_get_many(keys):
+    """
+    Remembered failures as ``{key: (reason, expires_at)}``. They are kept in
+    the local diskcache whatever the backend, since they must expire.
+    """
+    found = {}
+    cache = _get_local_cache()
+    with cache.transact():
+        for key in keys:
+            reason, expires_at = cache.get(_NEGATIVE_PREFIX + key, expire_time=True)
+            if reason is not None:
+                found[key] = (reason, expires_at)
+    return found
+
+
+def _negative_set_many(entries):
+    cache = _get_local_cache()
+    with cache.transact():
+        for key, reason in entries.items():
+            cache.set(_NEGATIVE_PREFIX + key, reason, expire=_NEGATIVE_TTL[reason])
+
+
+def geocode_many(address_dicts, default_service="nominatim", max_workers=GEOCODING_WORKERS):
+    """
+    Coordinates of every address, in order, as ``{"latitude", "longitude"}``
+    (empty strings when no provider knows the address). Repeated addresses
+    are looked up once. Lookups go through the in-process memo, then the
+    persistent cache read and written in bulk; the misses are geocoded
+    concurrently, each provider under its own token bucket, by no more
+    threads than the default provider's rate limit admits. Failures are
+    remembered for a shorter time than coordinates.
+
+    Addresses nobody could geocode get the centroid of their postcode or
+    locality from the offline gazetteer (``GAZETTEER_MODE=fallback``). With
+    ``GAZETTEER_MODE=primary`` or the ``gazetteer`` service, the gazetteer
+    answers first and providers only get what it does not know. Results
+    carry their ``geocode_precision``.
+    """
+    gazetteer_mode = GAZETTEER_MODE
+    if default_service == GAZETTEER:
+        gazetteer_mode = "primary"
     if default_service != "google":
         default_service = "nominatim"
-    session = None
-    try:
-        lat_long = None
-        if ENABLE_GEOCODING_CACHE:
-            addr_key = address_str(address_dict)
-            key = addr_key
-            if geo_entries_crud is not None:
-                key = geo_entries_crud.hash_key(addr_key)
-            if GEOLOC_CACHE_BACKEND == "db":
-                if geo_entries_crud is not None and db_session is not None:
-                    session = db_session()
-                    lat_long = geo_entries_crud.get(session, key)
-            elif GEOLOC_CACHE_BACKEND == "local":
-                lat_long = _get_local_cache().get(key)
-
-
-        if lat_long is None or lat_long['latitude'] is None or lat_long['longitude'] is None:
-            geoloc = geocode_addresses(address_dict, default_service=default_service)
-            if geoloc is not None:
-                lat_long = {"latitude": geoloc.latitude, "longitude": geoloc.longitude}
+    groups = {}
+    for address_dict in address_dicts:
+        groups.setdefault(normalize_address(address_dict), address_dict)
+    keys = {address: _cache_key(address_dict) for address, address_dict in groups.items()}
+
+    results = {}
+    if gazetteer_mode == "primary":
+        results.update(_gazetteer_lookup(groups))
+    if ENABLE_GEOCODING_CACHE:
+        for address in groups:
+            if address in results:
+                continue
+            entry = _memo.get(address)
+            if entry is None:
+                continue
+            geocoding_stats.count("negative_hits" if entry[1] else "memory_hits")
+            results[address] = entry[0]
+
+        pending = [keys[address] for address in groups if address not in results]
+        cached = _cache_get_many(pending) if pending else {}
+        failed = _negative_get_many(pending) if pending else {}
+        for address, key in keys.items():
+            if address in results:
+                continue
+            lat_long = cached.get(key)
+            if lat_long is not None and lat_long["latitude"] is not None and lat_long["longitude"] is not None:
+                geocoding_stats.count("store_hits")
+                results[address] = lat_long
+                _memo.set(address, lat_long)
+            elif key in failed:
+                geocoding_stats.count("negative_hits")
+                results[address] = {"latitude": "", "longitude": ""}
+                _memo.set(address, results[address], *failed[key])
+
+    misses = [address for address in groups if address not in results]
+    if misses:
+        geocoding_stats.count("misses", len(misses))
+
+        budget = current_budget()
+
+        def lookup(address):
+            with budget_scope(budget):
+                return _geocode(groups[address], default_service=default_service)
+
+        workers = min(_provider_workers(default_service, max_workers), len(misses))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(lookup, misses))
+        else:
+            outcomes = [lookup(address) for address in misses]
+        found = {}
+        failures = {}
+        for address, (geoloc, reason) in zip(misses, outcomes):
+            if geoloc is None:
+                results[address] = {"latitude": "", "longitude": ""}
+                if reason not in _NEGATIVE_TTL:
+                    continue
+                failures[keys[address]] = reason
                 if ENABLE_GEOCODING_CACHE:
-                    if GEOLOC_CACHE_BACKEND == "db":
-                        if geo_entries_crud is not None and db_session is not None:
-                            if session is None:
-                                session = db_session()
-                            geo_entries_crud.create(session, key, lat_long)
-                    elif GEOLOC_CACHE_BACKEND == "local":
-                        _get_local_cache().set(key, lat_long)
-            else:
-                lat_long = {"latitude": "", "longitude": ""}
-        return lat_long
+                    _memo.set(address, results[address], reason, time.time() + _NEGATIVE_TTL[reason])
+                continue
+            results[address] = {"latitude": geoloc.latitude, "longitude": geoloc.longitude}
+            found[keys[address]] = results[address]
+            if ENABLE_GEOCODING_CACHE:
+                _memo.set(address, results[address])
+        if ENABLE_GEOCODING_CACHE and found:
+            _cache_set_many(found)
+        if ENABLE_GEOCODING_CACHE and failures:
+            _negative_set_many(failures)
+
+    if gazetteer_mode == "fallback":
+        unknown = {
+            address: groups[address] for address, lat_long in results.items() if lat_long["latitude"] == ""
+        }
+        if unknown:
+            results.update(_gazetteer_lookup(unknown))
+
+    locations = []
+    for address_dict in address_dicts:
+        location = dict(results[normalize_address(address_dict)])
+        if location["latitude"] != "":
+            location.setdefault("geocode_precision", ADDRESS)
+        locations.append(location)
+    return locations
+
+
+def _gazetteer_lookup(groups):
+    found = {}
+    try:
+        gazetteer = get_gazetteer()
+        for address, address_dict in groups.items():
+            location = gazetteer.lookup(address_dict)
+            if location is not None:
+                found[address] = location
+    except Exception as e:
+        logger.error(f"Gazetteer lookup failed: {e}")
+    if found:
+        geocoding_stats.count("gazetteer_hits", len(found))
+    return found
+
+
+def get_geolocation(address_dict, default_service="nominatim"):
+    try:
+        return geocode_many([address_dict], default_service=default_service, max_workers=1)[0]
     except Exception as e:
         logger.error(e)
-    finally:
-        if session is not None:
-            session.close()
 
 
-@rate_limited(RATE_LIMIT)
 def geocode_addresses(address_dict, default_service="nominatim"):
+    return _geocode(address_dict, default_service)[0]
+
+
+def _geocode(address_dict, default_service="nominatim"):
+    """
+    ``(location, None)`` from the first provider that knows the address, or
+    ``(None, reason)``.
+    """
     services = {
         "nominatim": geoloc_nominatim,
         "mapbox": geoloc_mapbox,
@@ -117,26 +407,37 @@ def geocode_addresses(address_dict, default_service="nominatim"):
         default_service = "nominatim"
 
     # Determine the order of services based on the default_service parameter
-    ordered_services = [services[default_service.lower()]] + [services[key] for key in services if
-                                                              key != default_service.lower()]
+    ordered_names = [default_service.lower()] + [key for key in services if key != default_service.lower()]
 
-    for service in ordered_services:
+    reason = NOT_FOUND
+    budget = current_budget()
+    for name in ordered_names:
+        service = services[name]
+        if budget.expired():
+            logger.warning("No time left to geocode, skipping the remaining providers")
+            return None, DEADLINE
         try:
-            geoloc = service.geocode(address_str(address_dict))
+            _provider_bucket(name).acquire()
+            timeout = budget.attempt_timeout(None)
+            if timeout is None:
+                geoloc = service.geocode(address_str(address_dict))
+            else:
+                geoloc = service.geocode(address_str(address_dict), timeout=timeout)
             if geoloc is not None:
                 # Check postcode if necessary
                 if "postcode" in address_dict and "address" in geoloc.raw:
                     postcode_service = str(geoloc.raw["address"].get("postcode", "")).replace(" ", "")
                     postcode_dict = str(address_dict.get("postalcode", "")).replace(" ", "")
                     if postcode_service != postcode_dict:
-                        geoloc = None
+                        return None, POSTCODE_MISMATCH
                         #continue
-                return geoloc
+                return geoloc, None
         except Exception as e:
+            reason = PROVIDER_ERROR
             logger.error(f"Error while using {service.__class__.__name__}: {e}")
 
     logger.info("No geoloc found")
-    return None
+    return None, reason
 
 
 @rate_limited(RATE_LIMIT)
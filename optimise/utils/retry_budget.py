@@ -0,0 +1,120 @@
+"""Per-job deadline shared by every remote call of the job, and the retries it allows."""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from optimise.routing.defaults import (
+    JOB_DEADLINE_RESERVE_SECONDS,
+    JOB_DEADLINE_SECONDS,
+    RETRY_BUDGET_MAX_RETRIES,
+    RETRY_BUDGET_MIN_ATTEMPT_SECONDS,
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The job has no time left for another remote call."""
+
+
+class RetryBudget:
+    """
+    Time and retries left to a job. Remote calls take their per-attempt
+    timeout from the remaining time and ask the budget before retrying, so
+    retries layered in clients, in the matrix fetch and around the pipeline
+    share one cap instead of multiplying. ``seconds=None`` sets no deadline
+    and ``max_retries=None`` no retry cap.
+    """
+
+    def __init__(
+        self,
+        seconds: Optional[float] = None,
+        max_retries: Optional[int] = RETRY_BUDGET_MAX_RETRIES,
+        min_attempt_seconds: float = RETRY_BUDGET_MIN_ATTEMPT_SECONDS,
+    ) -> None:
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+        self.max_retries = max_retries
+        self.min_attempt_seconds = min_attempt_seconds
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, None without one."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        """Whether too little time is left for one more attempt."""
+        remaining = self.remaining()
+        return remaining is not None and remaining < self.min_attempt_seconds
+
+    def check(self) -> None:
+        if self.expired():
+            raise DeadlineExceeded("job deadline reached")
+
+    def attempt_timeout(self, default: Optional[float]) -> Optional[float]:
+        """
+        Timeout of the next attempt: ``default``, cut to the remaining time.
+
+        :raises DeadlineExceeded: when too little time is left to try.
+        """
+        self.check()
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        if default is None:
+            return remaining
+        return min(default, remaining)
+
+    def retry(self, delay: float = 0.0) -> bool:
+        """
+        Take one retry from the budget if one is left and an attempt still
+        fits after waiting ``delay`` seconds.
+        """
+        remaining = self.remaining()
+        if remaining is not None and remaining - delay < self.min_attempt_seconds:
+            return False
+        with self._lock:
+            if self.max_retries is not None and self.retries >= self.max_retries:
+                return False
+            self.retries += 1
+            return True
+
+
+def job_budget(time_limit_seconds: Optional[float] = None) -> RetryBudget:
+    """
+    Budget of a job killed after ``time_limit_seconds`` (``JOB_DEADLINE_SECONDS``
+    by default, 0 for none): remote calls stop ``JOB_DEADLINE_RESERVE_SECONDS``
+    early, leaving time to save what the job has.
+    """
+    if time_limit_seconds is None:
+        time_limit_seconds = JOB_DEADLINE_SECONDS
+    if not time_limit_seconds:
+        return RetryBudget()
+    return RetryBudget(seconds=max(0.0, time_limit_seconds - JOB_DEADLINE_RESERVE_SECONDS))
+
+
+# Calls outside a job keep their own retry policies
+UNLIMITED = RetryBudget(seconds=None, max_retries=None)
+
+_current: contextvars.ContextVar = contextvars.ContextVar("retry_budget", default=UNLIMITED)
+
+
+def current_budget() -> RetryBudget:
+    """The budget of the running job, unlimited outside of one."""
+    return _current.get()
+
+
+@contextmanager
+def budget_scope(budget: RetryBudget) -> Iterator[RetryBudget]:
+    """
+    Make ``budget`` the current one. Context variables do not follow work
+    handed to thread pools: run it under ``budget_scope`` or in a copied
+    context (``contextvars.copy_context().run``).
+    """
+    token = _current.set(budget)
+    try:
+        yield budget
+    finally:
+        _current.reset(token)
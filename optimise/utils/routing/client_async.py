@@ -0,0 +1,273 @@
+"""
+Asynchronous requests for the routers, on httpx.
+
+A router method builds its request, sends it through ``self.client._request``
+and parses the body. The async variants reuse both halves unchanged: the
+method first runs against a client that captures the request instead of
+sending it, the request is then awaited on an :class:`AsyncClient`, and the
+method runs once more against a client that replays the fetched body, so
+the router parses it exactly as it would a blocking response.
+"""
+
+import asyncio
+import copy
+import json
+import random
+import warnings
+from datetime import datetime
+
+import httpx
+
+from optimise.utils.retry_budget import current_budget
+
+from . import exceptions
+from .client_base import _RETRIABLE_STATUSES, DEFAULT, BaseClient
+from .utils import get_ordinal
+
+
+class AsyncClient(BaseClient):
+    """Client sending the router requests with an ``httpx.AsyncClient``."""
+
+    def __init__(
+        self,
+        base_url,
+        user_agent=None,
+        timeout=DEFAULT,
+        retry_timeout=None,
+        retry_over_query_limit=None,
+        skip_api_error=None,
+        http=None,
+        **kwargs
+    ):
+        """
+        Takes the arguments of :class:`Client`, plus:
+
+        :param http: The ``httpx.AsyncClient`` to send the requests with, or a
+            callable returning it (e.g. one per event loop). Without it, every
+            request opens and closes its own connection.
+        :type http: httpx.AsyncClient or callable
+        """
+        super(AsyncClient, self).__init__(
+            base_url,
+            user_agent=user_agent,
+            timeout=timeout,
+            retry_timeout=retry_timeout,
+            retry_over_query_limit=retry_over_query_limit,
+            skip_api_error=skip_api_error,
+            **kwargs
+        )
+        self.http = http
+        try:
+            self.headers.update(self.kwargs["headers"])
+        except KeyError:
+            pass
+
+    @classmethod
+    def from_client(cls, client, http=None):
+        """An async client with the base URL, headers and retry settings of a blocking one."""
+        async_client = cls(
+            client.base_url,
+            timeout=client.timeout,
+            retry_timeout=client.retry_timeout.total_seconds(),
+            skip_api_error=client.skip_api_error,
+            http=http,
+            headers=dict(client.headers),
+        )
+        async_client.retry_over_query_limit = client.retry_over_query_limit
+        return async_client
+
+    def _http(self):
+        if self.http is None or isinstance(self.http, httpx.AsyncClient):
+            return self.http
+        return self.http()
+
+    async def _send(self, method, url, **kwargs):
+        http = self._http()
+        if http is not None:
+            return await http.request(method, url, **kwargs)
+        async with httpx.AsyncClient() as http:
+            return await http.request(method, url, **kwargs)
+
+    async def _request(
+        self,
+        url,
+        get_params={},
+        post_params=None,
+        first_request_time=None,
+        retry_counter=0,
+        dry_run=None,
+        raw_body=False,
+    ):
+        """Performs HTTP GET/POST with credentials, returning the body as
+        JSON. Arguments, retries and exceptions are those of :meth:`Client._request`.
+        """
+        if not first_request_time:
+            first_request_time = datetime.now()
+
+        elapsed = datetime.now() - first_request_time
+        if elapsed > self.retry_timeout:
+            raise exceptions.Timeout()
+
+        budget = current_budget()
+        if retry_counter > 0:
+            delay_seconds = 1.5 ** (retry_counter - 1) * (random.random() + 0.5)
+            if not budget.retry(delay_seconds):
+                raise exceptions.Timeout()
+            await asyncio.sleep(delay_seconds)
+
+        authed_url = self._generate_auth_url(url, get_params)
+
+        request_kwargs = {"headers": self.headers, "timeout": self.timeout}
+        method = "GET"
+        if post_params is not None:
+            method = "POST"
+            if self.headers["Content-Type"] == "application/json":
+                request_kwargs["json"] = post_params
+            else:
+                request_kwargs["data"] = post_params
+
+        if dry_run:
+            print(
+                "url:\n{}\nParameters:\n{}".format(
+                    self.base_url + authed_url, json.dumps(post_params, indent=2)
+                )
+            )
+            return
+
+        request_kwargs["timeout"] = budget.attempt_timeout(self.timeout)
+        try:
+            response = await self._send(method, self.base_url + authed_url, **request_kwargs)
+            self._req = response.request
+        except httpx.TimeoutException:
+            raise exceptions.Timeout()
+
+        tried = retry_counter + 1
+
+        if response.status_code in _RETRIABLE_STATUSES:
+            warnings.warn(
+                "Server down.\nRetrying for the {}{} time.".format(tried, get_ordinal(tried)),
+                UserWarning,
+            )
+            return await self._request(
+                url, get_params, post_params, first_request_time, retry_counter + 1, raw_body=raw_body
+            )
+
+        try:
+            return self._get_body(response, raw_body)
+
+        except exceptions.RouterApiError:
+            if self.skip_api_error:
+                warnings.warn(
+                    "Router {} returned an API error with "
+                    "the following message:\n{}".format(self.__class__.__name__, response.text)
+                )
+                return
+
+            raise
+
+        except exceptions.RetriableRequest as e:
+            if isinstance(e, exceptions.OverQueryLimit) and not self.retry_over_query_limit:
+                raise
+
+            warnings.warn(
+                "Rate limit exceeded.\nRetrying for the {}{} time.".format(tried, get_ordinal(tried)),
+                UserWarning,
+            )
+            return await self._request(
+                url, get_params, post_params, first_request_time, retry_counter + 1, raw_body=raw_body
+            )
+
+    @property
+    def req(self):
+        """Holds the ``httpx.Request`` of the last request."""
+        return self._req
+
+    @staticmethod
+    def _get_body(response, raw_body=False):
+        status_code = response.status_code
+        content_type = response.headers.get("content-type", "")
+
+        if status_code == 200:
+            if content_type == "image/tiff" or raw_body:
+                return response.content
+
+            try:
+                return response.json()
+
+            except json.decoder.JSONDecodeError:
+                raise exceptions.JSONParseError("Can't decode JSON response:{}".format(response.text))
+
+        if status_code == 429:
+            raise exceptions.OverQueryLimit(status_code, response.text)
+
+        if 400 <= status_code < 500:
+            raise exceptions.RouterApiError(status_code, response.text)
+
+        if 500 <= status_code:
+            raise exceptions.RouterServerError(status_code, response.text)
+
+        raise exceptions.RouterError(status_code, response.text)
+
+
+class _CapturedRequest(Exception):
+    def __init__(self, url, get_params, post_params, dry_run, raw_body):
+        self.url = url
+        self.get_params = get_params
+        self.post_params = post_params
+        self.dry_run = dry_run
+        self.raw_body = raw_body
+
+
+class _CaptureClient:
+    def _request(self, url, get_params={}, post_params=None, dry_run=None, raw_body=False, **kwargs):
+        raise _CapturedRequest(url, get_params, post_params, dry_run, raw_body)
+
+
+class _ReplayClient:
+    def __init__(self, body):
+        self.body = body
+
+    def _request(self, *args, **kwargs):
+        return self.body
+
+
+class AsyncRouterMixin:
+    """
+    Async variants of the router methods. ``async_client`` defaults to an
+    :class:`AsyncClient` mirroring the router's blocking client.
+    """
+
+    async_client = None
+
+    def _get_async_client(self):
+        if self.async_client is None:
+            self.async_client = AsyncClient.from_client(self.client)
+        return self.async_client
+
+    def _with_client(self, client):
+        router = copy.copy(self)
+        router.client = client
+        return router
+
+    async def _call_async(self, method, *args, **kwargs):
+        try:
+            method(self._with_client(_CaptureClient()), *args, **kwargs)
+        except _CapturedRequest as request:
+            body = await self._get_async_client()._request(
+                request.url,
+                get_params=request.get_params,
+                post_params=request.post_params,
+                dry_run=request.dry_run,
+                raw_body=request.raw_body,
+            )
+        else:  # pragma: no cover - every router method sends one request
+            raise RuntimeError(f"{method.__name__} sent no request")
+        return method(self._with_client(_ReplayClient(body)), *args, **kwargs)
+
+    async def directions_async(self, *args, **kwargs):
+        """:meth:`directions`, awaiting the routing engine instead of blocking."""
+        return await self._call_async(type(self).directions, *args, **kwargs)
+
+    async def matrix_async(self, *args, **kwargs):
+        """:meth:`matrix`, awaiting the routing engine instead of blocking."""
+        return await self._call_async(type(self).matrix, *args, **kwargs)
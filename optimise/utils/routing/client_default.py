@@ -24,6 +24,8 @@ from datetime import datetime
 
 import requests
 
+from optimise.utils.retry_budget import current_budget
+
 from . import exceptions
 from .client_base import _RETRIABLE_STATUSES, DEFAULT, BaseClient, options
 from .utils import get_ordinal
@@ -40,6 +42,7 @@ class Client(BaseClient):
         retry_timeout=None,
         retry_over_query_limit=None,
         skip_api_error=None,
+        session=None,
         **kwargs
     ):
         """
@@ -68,11 +71,15 @@ class Client(BaseClient):
             encountered (e.g. no route found). If False, processing will discontinue and raise an error. Default False.
         :type skip_api_error: bool
 
+        :param session: Session to send the requests with, e.g. one shared by several
+            clients to reuse their connections. A new session by default.
+        :type session: requests.Session
+
         :param kwargs: Additional arguments, such as headers or proxies.
         :type kwargs: dict
         """
 
-        self._session = requests.Session()
+        self._session = session if session is not None else requests.Session()
         super(Client, self).__init__(
             base_url,
             user_agent=user_agent,
@@ -104,6 +111,7 @@ class Client(BaseClient):
         first_request_time=None,
         retry_counter=0,
         dry_run=None,
+        raw_body=False,
     ):
         """Performs HTTP GET/POST with credentials, returning the body as
         JSON.
@@ -127,6 +135,9 @@ class Client(BaseClient):
         :param dry_run: If true, only prints URL and parameters. true or false.
         :type dry_run: bool
 
+        :param raw_body: If true, a successful response body is returned undecoded, as bytes.
+        :type raw_body: bool
+
         :raises routingpy.exceptions.RouterApiError: when the API returns an error due to faulty configuration.
         :raises routingpy.exceptions.RouterServerError: when the API returns a server error.
         :raises routingpy.exceptions.RouterError: when anything else happened while requesting.
@@ -146,14 +157,18 @@ class Client(BaseClient):
         if elapsed > self.retry_timeout:
             raise exceptions.Timeout()
 
+        budget = current_budget()
         if retry_counter > 0:
             # 0.5 * (1.5 ^ i) is an increased sleep time of 1.5x per iteration,
             # starting at 0.5s when retry_counter=1. The first retry will occur
             # at 1, so subtract that first.
             delay_seconds = 1.5 ** (retry_counter - 1)
 
-            # Jitter this value by 50% and pause.
-            time.sleep(delay_seconds * (random.random() + 0.5))
+            # Jitter this value by 50% and pause, if the job can afford the retry.
+            delay_seconds *= random.random() + 0.5
+            if not budget.retry(delay_seconds):
+                raise exceptions.Timeout()
+            time.sleep(delay_seconds)
 
         authed_url = self._generate_auth_url(url, get_params)
 
@@ -178,6 +193,9 @@ class Client(BaseClient):
             )
             return
 
+        # the attempt may not outlive the job (raises DeadlineExceeded)
+        final_requests_kwargs["timeout"] = budget.attempt_timeout(self.timeout)
+
         try:
             response = requests_method(self.base_url + authed_url, **final_requests_kwargs)
             self._req = response.request
@@ -193,10 +211,12 @@ class Client(BaseClient):
                 "Server down.\nRetrying for the {}{} time.".format(tried, get_ordinal(tried)),
                 UserWarning,
             )
-            return self._request(url, get_params, post_params, first_request_time, retry_counter + 1)
+            return self._request(
+                url, get_params, post_params, first_request_time, retry_counter + 1, raw_body=raw_body
+            )
 
         try:
-            return self._get_body(response)
+            return self._get_body(response, raw_body)
 
         except exceptions.RouterApiError:
             if self.skip_api_error:
@@ -217,7 +237,9 @@ class Client(BaseClient):
                 UserWarning,
             )
             # Retry request.
-            return self._request(url, get_params, post_params, first_request_time, retry_counter + 1)
+            return self._request(
+                url, get_params, post_params, first_request_time, retry_counter + 1, raw_body=raw_body
+            )
 
     @property
     def req(self):
@@ -225,12 +247,12 @@ class Client(BaseClient):
         return self._req
 
     @staticmethod
-    def _get_body(response):
+    def _get_body(response, raw_body=False):
         status_code = response.status_code
         content_type = response.headers["content-type"]
 
         if status_code == 200:
-            if content_type == "image/tiff":
+            if content_type == "image/tiff" or raw_body:
                 return response.content
 
             else:
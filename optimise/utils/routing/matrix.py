@@ -17,8 +17,16 @@
 """
 :class:`Matrix` returns matrix results.
 """
+import json
+import re
 from typing import List, Optional
 
+import numpy as np
+
+# A JSON array of arrays of numbers (or nulls): the layout of matrix values
+_NUMBER_GRID = re.compile(rb"\[\s*(?:\[[^\[\]{}\"]*\]\s*,?\s*)*\]")
+_BRACKETS_TO_SPACES = bytes.maketrans(b"[]", b"  ")
+
 
 class Matrix(object):
     """
@@ -33,7 +41,7 @@ class Matrix(object):
     @property
     def durations(self) -> Optional[List[List[float]]]:
         """
-        The durations matrix as list akin to::
+        The durations matrix as list (numpy array when parsed without ``raw``) akin to::
 
             [
                 [
@@ -91,3 +99,67 @@ class Matrix(object):
 
     def __repr__(self):  # pragma: no cover
         return "Matrix({}, {})".format(self.durations, self.distances)
+
+
+def _find_value(body: bytes, key: str) -> int:
+    """Offset of the value of ``"key":`` in a JSON body, -1 if absent."""
+    needle = json.dumps(key).encode("utf-8")
+    start = body.find(needle)
+    while start != -1:
+        colon = start + len(needle)
+        while colon < len(body) and body[colon] in b" \t\r\n":
+            colon += 1
+        if colon < len(body) and body[colon] == ord(":"):
+            value = colon + 1
+            while value < len(body) and body[value] in b" \t\r\n":
+                value += 1
+            return value
+        start = body.find(needle, start + 1)
+    return -1
+
+
+def read_number_grid(body: bytes, key: str) -> Optional[np.ndarray]:
+    """
+    The array of arrays of numbers under ``key`` in a JSON body, as a 2-D
+    float array (nulls become NaN). The values are converted by numpy
+    straight from the bytes, without building the Python lists and floats
+    of a full decode. None if the key is absent or null.
+
+    :raises ValueError: when the value is not a rectangular grid of numbers.
+    """
+    offset = _find_value(body, key)
+    if offset == -1 or body.startswith(b"null", offset):
+        return None
+    match = _NUMBER_GRID.match(body, offset)
+    if match is None:
+        raise ValueError(f"{key} is not an array of arrays of numbers")
+    grid = match.group(0)
+    # each row but the last ends at a "]", after its "[" and the values
+    rows = [row[row.index(b"[") + 1:] for row in grid[1:-1].split(b"]")[:-1]]
+    widths = {row.count(b",") + 1 if row.strip() else 0 for row in rows}
+    if len(widths) > 1:
+        raise ValueError(f"{key} is not a rectangular array of numbers")
+    width = widths.pop() if widths else 0
+    if not width:
+        return np.zeros((len(rows), 0))
+    text = grid.translate(_BRACKETS_TO_SPACES).replace(b"null", b"nan")
+    values = np.fromstring(text, dtype=float, sep=",")
+    if values.size != len(rows) * width:
+        raise ValueError(f"{key} holds values that are not numbers")
+    return values.reshape(len(rows), width)
+
+
+def parse_matrix_body(body: bytes, durations_key: str, distances_key: str) -> Matrix:
+    """
+    :class:`Matrix` of an undecoded JSON response, with numpy arrays for
+    durations and distances and no ``raw``: only the two grids are read.
+    Falls back to a full decode, and lists, when the grids are not rectangular.
+    """
+    try:
+        return Matrix(
+            durations=read_number_grid(body, durations_key),
+            distances=read_number_grid(body, distances_key),
+        )
+    except ValueError:
+        response = json.loads(body)
+        return Matrix(durations=response.get(durations_key), distances=response.get(distances_key))
@@ -19,13 +19,14 @@ from typing import List, Optional, Tuple, Union  # noqa: F401
 
 from .. import convert, utils
 from ..client_base import DEFAULT
+from ..client_async import AsyncRouterMixin
 from ..client_default import Client
 from ..direction import Direction, Directions
 from ..isochrone import Isochrone, Isochrones
-from ..matrix import Matrix
+from ..matrix import Matrix, parse_matrix_body
 
 
-class Graphhopper:
+class Graphhopper(AsyncRouterMixin):
     """Performs requests to the Graphhopper API services."""
 
     _DEFAULT_BASE_URL = "https://graphhopper.com/api/1"
@@ -525,6 +526,7 @@ class Graphhopper:
         out_array: Optional[List[str]] = ["times", "distances"],
         debug=None,
         dry_run: Optional[bool] = None,
+        keep_raw: Optional[bool] = True,
         **matrix_kwargs
     ):
         """Gets travel distance and time for a matrix of origins and destinations.
@@ -563,6 +565,11 @@ class Graphhopper:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the decoded response in ``Matrix.raw``. Without it the
+            durations and distances are read straight from the response bytes into
+            numpy arrays, and nothing else of the response is kept. Default True.
+        :type keep_raw: bool
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -617,12 +624,16 @@ class Graphhopper:
         params.extend(matrix_kwargs.items())
 
         return self.parse_matrix_json(
-            self.client._request("/matrix", get_params=params, dry_run=dry_run),
+            self.client._request(
+                "/matrix", get_params=params, dry_run=dry_run, raw_body=not keep_raw
+            ),
         )
 
 
     @staticmethod
     def parse_matrix_json(response):
+        if isinstance(response, bytes):
+            return parse_matrix_body(response, "times", "distances")
         if response is None:  # pragma: no cover
             return Matrix()
         durations = response.get("times")
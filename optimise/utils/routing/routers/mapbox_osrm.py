@@ -21,13 +21,14 @@ from typing import List, Optional, Tuple, Union
 
 from .. import convert, utils
 from ..client_base import DEFAULT
+from ..client_async import AsyncRouterMixin
 from ..client_default import Client
 from ..direction import Direction, Directions
 from ..isochrone import Isochrone, Isochrones
-from ..matrix import Matrix
+from ..matrix import Matrix, parse_matrix_body
 
 
-class MapboxOSRM:
+class MapboxOSRM(AsyncRouterMixin):
     """Performs requests to the OSRM API services."""
 
     _base_url = "https://api.mapbox.com"
@@ -445,6 +446,7 @@ class MapboxOSRM:
         out_array: Optional[List[str]] = ["duration", "distance"],
         fallback_speed: Optional[int] = None,
         dry_run: Optional[bool] = None,
+        keep_raw: Optional[bool] = True,
     ):
         """
         Gets travel distance and time for a matrix of origins and destinations.
@@ -480,6 +482,11 @@ class MapboxOSRM:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the decoded response in ``Matrix.raw``. Without it the
+            durations and distances are read straight from the response bytes into
+            numpy arrays, and nothing else of the response is kept. Default True.
+        :type keep_raw: bool
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -507,11 +514,14 @@ class MapboxOSRM:
                 "/directions-matrix/v1/mapbox/" + profile + "/" + coords,
                 get_params=params,
                 dry_run=dry_run,
+                raw_body=not keep_raw,
             )
         )
 
     @staticmethod
     def parse_matrix_json(response):
+        if isinstance(response, bytes):
+            return parse_matrix_body(response, "durations", "distances")
         if response is None:  # pragma: no cover
             return Matrix()
 
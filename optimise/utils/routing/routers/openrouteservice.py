@@ -18,13 +18,14 @@ from typing import List, Optional
 
 from .. import utils
 from ..client_base import DEFAULT
+from ..client_async import AsyncRouterMixin
 from ..client_default import Client
 from ..direction import Direction, Directions
 from ..isochrone import Isochrone, Isochrones
-from ..matrix import Matrix
+from ..matrix import Matrix, parse_matrix_body
 
 
-class ORS:
+class ORS(AsyncRouterMixin):
     """Performs requests to the ORS API services."""
 
     _DEFAULT_BASE_URL = "https://api.openrouteservice.org"
@@ -494,6 +495,7 @@ class ORS:
             resolve_locations: Optional[bool] = None,
             units: Optional[str] = None,
             dry_run: Optional[bool] = None,
+            keep_raw: Optional[bool] = True,
     ):
         """Gets travel distance and time for a matrix of origins and destinations.
 
@@ -531,6 +533,11 @@ class ORS:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the decoded response in ``Matrix.raw``. Without it the
+            durations and distances are read straight from the response bytes into
+            numpy arrays, and nothing else of the response is kept. Default True.
+        :type keep_raw: bool
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -554,12 +561,18 @@ class ORS:
 
         return self.parse_matrix_json(
             self.client._request(
-                "/v2/matrix/" + profile + "/json", get_params={}, post_params=params, dry_run=dry_run
+                "/v2/matrix/" + profile + "/json",
+                get_params={},
+                post_params=params,
+                dry_run=dry_run,
+                raw_body=not keep_raw,
             )
         )
 
     @staticmethod
     def parse_matrix_json(response):
+        if isinstance(response, bytes):
+            return parse_matrix_body(response, "durations", "distances")
         if response is None:  # pragma: no cover
             return Matrix()
         durations = response.get("durations")
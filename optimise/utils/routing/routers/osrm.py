@@ -19,12 +19,13 @@ from typing import List, Optional, Union  # noqa: F401
 
 from .. import convert, utils
 from ..client_base import DEFAULT
+from ..client_async import AsyncRouterMixin
 from ..client_default import Client
 from ..direction import Direction, Directions
-from ..matrix import Matrix
+from ..matrix import Matrix, parse_matrix_body
 
 
-class OSRM:
+class OSRM(AsyncRouterMixin):
     """Performs requests to the OSRM API services."""
 
     _DEFAULT_BASE_URL = "https://routing.openstreetmap.de/routed-bike"
@@ -299,6 +300,7 @@ class OSRM:
         out_array: Optional[List[str]] = ["times", "distances"],
         dry_run: Optional[bool] = None,
         annotations: Optional[List[str]] = ("duration", "distance"),
+        keep_raw: Optional[bool] = True,
         **matrix_kwargs,
     ):
         """
@@ -351,6 +353,11 @@ class OSRM:
             One or more of ["duration", "distance"].
         :type annotations: List[str]
 
+        :param keep_raw: Keep the decoded response in ``Matrix.raw``. Without it the
+            durations and distances are read straight from the response bytes into
+            numpy arrays, and nothing else of the response is kept. Default True.
+        :type keep_raw: bool
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
 
@@ -367,7 +374,9 @@ class OSRM:
         )
 
         return self.parse_matrix_json(
-            self.client._request(f"/table/v1/{profile}/{coords}", get_params=params, dry_run=dry_run)
+            self.client._request(
+                f"/table/v1/{profile}/{coords}", get_params=params, dry_run=dry_run, raw_body=not keep_raw
+            )
         )
 
     @staticmethod
@@ -413,6 +422,8 @@ class OSRM:
 
     @staticmethod
     def parse_matrix_json(response):
+        if isinstance(response, bytes):
+            return parse_matrix_body(response, "durations", "distances")
         if response is None:  # pragma: no cover
             return Matrix()
 
@@ -20,6 +20,7 @@ from typing import List, Optional, Sequence, Union  # noqa: F401
 
 from .. import utils
 from ..client_base import DEFAULT
+from ..client_async import AsyncRouterMixin
 from ..client_default import Client
 from ..direction import Direction
 from ..expansion import Edge, Expansions
@@ -28,7 +29,7 @@ from ..matrix import Matrix
 from ..valhalla_attributes import MatchedResults
 
 
-class Valhalla:
+class Valhalla(AsyncRouterMixin):
     """Performs requests to a Valhalla instance."""
 
     _DEFAULT_BASE_URL = "https://valhalla1.openstreetmap.de"
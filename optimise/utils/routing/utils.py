@@ -112,6 +112,52 @@ def decode_polyline6(polyline, is3d=False, order="lnglat"):
     return _decode(polyline, precision=6, is3d=is3d, order=order)
 
 
+def _encode_value(value):
+    """Appends the 5-bit chunks of one signed, scaled coordinate delta."""
+    value = ~(value << 1) if value < 0 else value << 1
+    chunks = []
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+    return "".join(chunks)
+
+
+def _scale(value, factor):
+    """Rounds half away from zero, as the reference polyline encoder does."""
+    scaled = int(abs(value) * factor + 0.5)
+    return -scaled if value < 0 else scaled
+
+
+def encode_polyline(coordinates, precision=5, order="lnglat"):
+    """Encodes coordinates into a polyline string, the inverse of :func:`decode_polyline5`
+    (precision 5) and :func:`decode_polyline6` (precision 6).
+
+    :param coordinates: The coordinates to encode, as pairs.
+    :type coordinates: list of list
+
+    :param precision: Decimal places kept of every coordinate. Default 5.
+    :type precision: int
+
+    :param order: Order of the given coordinates. Options: latlng, lnglat. Defaults to 'lnglat'.
+    :type order: str
+
+    :returns: The encoded polyline.
+    :rtype: str
+    """
+    if order not in ("lnglat", "latlng"):
+        raise ValueError(f"order must be either 'latlng' or 'lnglat', not {order}.")
+    factor = 10**precision
+    chunks, last_lat, last_lng = [], 0, 0
+    for first, second in coordinates:
+        lng, lat = (first, second) if order == "lnglat" else (second, first)
+        lat, lng = _scale(lat, factor), _scale(lng, factor)
+        chunks.append(_encode_value(lat - last_lat))
+        chunks.append(_encode_value(lng - last_lng))
+        last_lat, last_lng = lat, lng
+    return "".join(chunks)
+
+
 def get_ordinal(number):
     """Produces an ordinal (1st, 2nd, 3rd, 4th) from a number"""
 
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Serve a local OSRM/ORS stand-in answering from haversine distances."""
+
+import argparse
+
+from optimise.routing.fake_engine import FakeRoutingEngine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a fake routing engine for offline benchmarks and tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra seconds, up to this value.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 503.")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second before 429s.")
+    parser.add_argument("--burst", type=float, default=None, help="Requests allowed back to back.")
+    parser.add_argument("--max-matrix-size", type=int, default=None, help="Most elements per matrix request.")
+    parser.add_argument("--detour-factor", type=float, default=1.0, help="Road distance over haversine distance.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engine = FakeRoutingEngine(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        max_matrix_size=args.max_matrix_size,
+        detour_factor=args.detour_factor,
+        seed=args.seed,
+    )
+    print(f"Fake routing engine on http://{args.host}:{args.port} (ROUTING_ENGINE for the OSRM router)")
+    try:
+        engine.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Load postcode centroids into the offline geocoding gazetteer."""
+
+import argparse
+
+from optimise.utils.gazetteer import Gazetteer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import postcode centroids into the gazetteer.")
+    parser.add_argument("source", help="GeoNames postal code dump (.txt) or CSV file.")
+    parser.add_argument(
+        "--format",
+        choices=("geonames", "csv"),
+        default="geonames",
+        help="geonames: tab separated dump; csv: country,postal_code,locality,latitude,longitude.",
+    )
+    parser.add_argument("--path", default=None, help="Gazetteer database (default: GAZETTEER_PATH).")
+    args = parser.parse_args()
+
+    gazetteer = Gazetteer(args.path)
+    with open(args.source, encoding="utf-8", newline="") as file:
+        if args.format == "csv":
+            count = gazetteer.import_csv(file)
+        else:
+            count = gazetteer.import_geonames(file)
+    print(f"Imported {count} places into {gazetteer.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -72,9 +72,21 @@ def _build_routing_config() -> Dict[str, Any]:
     return {
         "ENABLE_DISTANCE_MATRIX_CACHE": routing_defaults.ENABLE_DISTANCE_MATRIX_CACHE,
         "DISTANCE_MATRIX_CACHE_DIR": routing_defaults.DISTANCE_MATRIX_CACHE_DIR,
+        "ROUTER_POOL_CONNECTIONS": routing_defaults.ROUTER_POOL_CONNECTIONS,
+        "ROUTER_POOL_MAXSIZE": routing_defaults.ROUTER_POOL_MAXSIZE,
+        "ROUTER_ASYNC_CONCURRENCY": routing_defaults.ROUTER_ASYNC_CONCURRENCY,
+        "RETRY_BUDGET_MAX_RETRIES": routing_defaults.RETRY_BUDGET_MAX_RETRIES,
+        "RETRY_BUDGET_MIN_ATTEMPT_SECONDS": routing_defaults.RETRY_BUDGET_MIN_ATTEMPT_SECONDS,
+        "JOB_DEADLINE_SECONDS": routing_defaults.JOB_DEADLINE_SECONDS,
+        "JOB_DEADLINE_RESERVE_SECONDS": routing_defaults.JOB_DEADLINE_RESERVE_SECONDS,
+        "ROUTE_GEOMETRY_CACHE_SIZE": routing_defaults.ROUTE_GEOMETRY_CACHE_SIZE,
+        "ROUTE_GEOMETRY_TOLERANCE_M": routing_defaults.ROUTE_GEOMETRY_TOLERANCE_M,
+        "ROUTE_GEOMETRY_TIMEOUT_SECONDS": routing_defaults.ROUTE_GEOMETRY_TIMEOUT_SECONDS,
         "ENABLE_GEOCODING_CACHE": routing_defaults.ENABLE_GEOCODING_CACHE,
         "GEOLOC_CACHE_BACKEND": routing_defaults.GEOLOC_CACHE_BACKEND,
         "GEOLOC_LOCAL_CACHE_DIR": routing_defaults.GEOLOC_LOCAL_CACHE_DIR,
+        "GAZETTEER_MODE": routing_defaults.GAZETTEER_MODE,
+        "GAZETTEER_PATH": routing_defaults.GAZETTEER_PATH,
         "DEFAULT_DRIVING_SPEED_KMH": routing_defaults.DEFAULT_DRIVING_SPEED_KMH,
         "DEFAULT_WALKING_DISTANCES_THRESHOLD": routing_defaults.DEFAULT_WALKING_DISTANCES_THRESHOLD,
         "DEFAULT_GEOCODING_SERVICE": routing_defaults.DEFAULT_GEOCODING_SERVICE,
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from ..config import settings
 from ..deps import get_api_key, get_db
 from ..schemas import MatrixRequest, MatrixResponse
-from ..services.matrix_service import build_matrix
+from ..services.matrix_service import build_matrix_async
 from ..services.rate_limit import enforce_rate_limit
 
 
@@ -32,7 +32,7 @@ async def matrix(
         method = "osrm" if method == "haversine" else method
 
     coords_latlon = [[loc.lat, loc.lng] for loc in payload.locations]
-    result = build_matrix(
+    result = await build_matrix_async(
         coords_latlon,
         method=method,
         driving_speed_kmh=payload.driving_speed_kmh,
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 
+from optimise.utils.geocoding import geocoding_stats
+
 from ..observability import metrics
 
 router = APIRouter()
@@ -7,4 +9,4 @@ router = APIRouter()
 
 @router.get("/metrics")
 def get_metrics():
-    return metrics.snapshot()
+    return {**metrics.snapshot(), "geocoding": geocoding_stats.snapshot()}
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import json
 import os
+import tempfile
 import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
-import requests
-
 from fastapi import APIRouter, Body, Depends, HTTPException, Request
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
+from optimise.routing.solver.lower_bound import optimality_gap
+
 from ..config import settings
 from ..deps import get_api_key, get_db
 from ..schemas import (
@@ -23,6 +26,18 @@ from ..schemas import (
     WarningMessage,
     AlternativeSolution,
 )
+from ..services.ingest import (
+    CSV_CONTENT_TYPES,
+    NDJSON_CONTENT_TYPES,
+    XLSX_CONTENT_TYPES,
+    RowError,
+    TaskIngestor,
+    iter_csv_rows,
+    iter_lines,
+    iter_xlsx_rows,
+    parse_ndjson_line,
+)
+from ..services.geometry_service import attach_route_geometry
 from ..services.mapping import ensure_mapping_defaults
 from ..services.optimize_service import build_legacy_request, run_optimization
 from ..services.rate_limit import enforce_rate_limit
@@ -31,6 +46,10 @@ from ..services.usage import compute_node_count, compute_usage_units, monthly_us
 router = APIRouter(prefix="/v1", tags=["optimize"])
 
 CARBON_KG_PER_KM = 0.21
+# Header carrying the request without its tasks for spreadsheet uploads
+ENVELOPE_HEADER = "X-Optimize-Request"
+# Uploads larger than this are spooled to disk while they are read
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
 
 
 def _combine_date_time(date_str: str, time_str: str) -> Optional[datetime]:
@@ -101,6 +120,37 @@ def _build_metrics(
     return metrics
 
 
+def _build_optimality_gap(raw_results: List[Dict[str, Any]]) -> Optional[float]:
+    objective = 0
+    lower_bound = 0
+    bounded = False
+    for result in raw_results:
+        for day_details in result.get("details", {}).values():
+            if day_details.get("lower_bound") is None:
+                continue
+            bounded = True
+            objective += day_details.get("objective_value") or 0
+            lower_bound += day_details["lower_bound"]
+    if not bounded:
+        return None
+    return round(optimality_gap(objective, lower_bound), 4)
+
+
+def _pooled_alternatives(raw_results: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Alternatives collected by the solver, in the layout of ``raw_results``;
+    results with fewer alternatives repeat their main solution.
+    """
+    count = max((len(result.get("alternatives") or []) for result in raw_results), default=0)
+    return [
+        [
+            (result.get("alternatives") or [])[k] if k < len(result.get("alternatives") or []) else result
+            for result in raw_results
+        ]
+        for k in range(count)
+    ]
+
+
 def _build_routes(
     raw_results: List[Dict[str, Any]],
     task_durations: Dict[str, int],
@@ -243,28 +293,27 @@ def _resolve_osrm_base(payload: OptimizeRequest) -> Optional[str]:
     return os.getenv("ROUTING_ENGINE")
 
 
-def _fetch_osrm_geometry(base_url: str, stops: List[RouteStop]) -> Optional[List[StopLocation]]:
-    coords = [
-        f"{stop.location.lng},{stop.location.lat}"
-        for stop in stops
-        if stop.location and stop.location.lat is not None and stop.location.lng is not None
+async def _attach_route_geometry(
+    payload: OptimizeRequest, routes: List[RouteResponse]
+) -> List[WarningMessage]:
+    if not (payload.options and payload.options.include_route_geometry):
+        return []
+    osrm_base = _resolve_osrm_base(payload)
+    if not osrm_base:
+        return [
+            WarningMessage(
+                type="route_geometry_unavailable",
+                message="Routing engine URL not configured; route geometry omitted.",
+            )
+        ]
+    if await attach_route_geometry(routes, osrm_base, payload.options):
+        return []
+    return [
+        WarningMessage(
+            type="route_geometry_unavailable",
+            message="OSRM route geometry could not be fetched for one or more routes.",
+        )
     ]
-    if len(coords) < 2:
-        return None
-
-    url = f"{base_url.rstrip('/')}/route/v1/driving/{';'.join(coords)}"
-    try:
-        res = requests.get(url, params={"overview": "full", "geometries": "geojson"}, timeout=8)
-        if not res.ok:
-            return None
-        data = res.json()
-        geometry = data.get("routes", [{}])[0].get("geometry", {})
-        points = geometry.get("coordinates")
-        if not points:
-            return None
-        return [StopLocation(lat=coord[1], lng=coord[0]) for coord in points]
-    except Exception:
-        return None
 
 
 @router.post("/optimize", response_model=OptimizeResponse)
@@ -276,7 +325,108 @@ async def optimize(
     api_key_id = get_api_key(request, db, required_scopes={"solve:write"})
     identifier = api_key_id or f"anon:{request.client.host if request.client else 'unknown'}"
     enforce_rate_limit(identifier)
+    return await _optimize_payload(payload, db, api_key_id)
+
+
+def _envelope_request(envelope: Any, tasks: Any) -> OptimizeRequest:
+    """
+    The request of a streamed upload: the envelope (every field but the
+    tasks) validated as usual, with the ingested task columns.
+    """
+    if not isinstance(envelope, dict):
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "the request envelope must be a JSON object", "field": "envelope"},
+        )
+    try:
+        payload = OptimizeRequest.model_validate({**envelope, "tasks": []})
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "invalid request envelope", "errors": exc.errors(include_url=False)},
+        )
+    return payload.model_copy(update={"tasks": tasks})
+
+
+async def _spool_body(request: Request):
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+@router.post("/optimize/stream", response_model=OptimizeResponse)
+async def optimize_stream(
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    Optimize tasks streamed as NDJSON (first line: the request without its
+    tasks, then one task per line), CSV or XLSX (one task per row, request
+    in the ``X-Optimize-Request`` header). Tasks are validated row by row
+    into a columnar buffer; invalid rows are reported with their number.
+    """
+    api_key_id = get_api_key(request, db, required_scopes={"solve:write"})
+    identifier = api_key_id or f"anon:{request.client.host if request.client else 'unknown'}"
+    enforce_rate_limit(identifier)
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    ingestor = TaskIngestor()
+    envelope: Any = None
+    if content_type in NDJSON_CONTENT_TYPES:
+        row = 0
+        async for line in iter_lines(request.stream()):
+            row += 1
+            record = parse_ndjson_line(row, line)
+            if record is None:
+                continue
+            if envelope is None:
+                if isinstance(record, RowError):
+                    raise HTTPException(
+                        status_code=400, detail={"message": record.message, "field": "envelope"}
+                    )
+                envelope = record
+                continue
+            ingestor.add(row, record)
+    elif content_type in CSV_CONTENT_TYPES or content_type in XLSX_CONTENT_TYPES:
+        header = request.headers.get(ENVELOPE_HEADER)
+        if not header:
+            raise HTTPException(
+                status_code=400,
+                detail={"message": f"{ENVELOPE_HEADER} header is required", "field": "envelope"},
+            )
+        try:
+            envelope = json.loads(header)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail={"message": f"{ENVELOPE_HEADER} must be JSON", "field": "envelope"},
+            )
+        spool = await _spool_body(request)
+        try:
+            rows = iter_csv_rows(spool) if content_type in CSV_CONTENT_TYPES else iter_xlsx_rows(spool)
+            for row, record in rows:
+                ingestor.add(row, record)
+        except Exception as exc:
+            raise HTTPException(
+                status_code=400, detail={"message": f"unreadable upload: {exc}", "field": "body"}
+            )
+        finally:
+            spool.close()
+    else:
+        raise HTTPException(status_code=415, detail=f"unsupported content type {content_type!r}")
 
+    if envelope is None:
+        raise HTTPException(
+            status_code=400, detail={"message": "the request envelope is missing", "field": "envelope"}
+        )
+    if ingestor.error_count:
+        raise HTTPException(status_code=400, detail=ingestor.error_detail())
+    return await _optimize_payload(_envelope_request(envelope, ingestor.tasks), db, api_key_id)
+
+
+async def _optimize_payload(payload: OptimizeRequest, db: Session, api_key_id: Optional[str]) -> OptimizeResponse:
     if not payload.vehicles:
         raise HTTPException(
             status_code=400,
@@ -329,6 +479,23 @@ async def optimize(
 
     if payload.optimization and payload.optimization.max_computation_time_seconds:
         legacy_request["time_limit"] = int(payload.optimization.max_computation_time_seconds)
+    if payload.optimization and payload.optimization.optimality_gap is not None:
+        legacy_request["optimality_gap"] = float(payload.optimization.optimality_gap)
+    if payload.optimization and payload.optimization.multi_skill_mode:
+        legacy_request["multi_skill_mode"] = payload.optimization.multi_skill_mode
+    if payload.optimization and payload.optimization.solver_backend:
+        legacy_request["solver_backend"] = payload.optimization.solver_backend
+    if payload.optimization and payload.optimization.adaptive_strategy is not None:
+        legacy_request["adaptive_strategy"] = payload.optimization.adaptive_strategy
+    if payload.optimization and payload.optimization.day_assignment is not None:
+        legacy_request["day_assignment"] = payload.optimization.day_assignment
+    if payload.optimization and payload.optimization.route_templates is not None:
+        legacy_request["route_templates"] = payload.optimization.route_templates
+    if payload.optimization and payload.optimization.return_alternative_solutions:
+        # the solver collects diverse alternatives during the main search
+        legacy_request["alternatives"] = max(
+            0, int(payload.optimization.return_alternative_solutions) - 1
+        )
 
     try:
         raw = run_optimization(legacy_request)
@@ -339,27 +506,7 @@ async def optimize(
     task_durations = {task.id: task.service_duration_minutes for task in payload.tasks}
     routes, unassigned, assigned_tasks = _build_routes(solutions, task_durations)
 
-    geometry_warnings: List[WarningMessage] = []
-    if payload.options and payload.options.include_route_geometry:
-        osrm_base = _resolve_osrm_base(payload)
-        if osrm_base:
-            for route in routes:
-                geometry = _fetch_osrm_geometry(osrm_base, route.stops)
-                route.route_geometry = geometry
-                if geometry is None:
-                    geometry_warnings.append(
-                        WarningMessage(
-                            type="route_geometry_unavailable",
-                            message="OSRM route geometry could not be fetched for one or more routes.",
-                        )
-                    )
-        else:
-            geometry_warnings.append(
-                WarningMessage(
-                    type="route_geometry_unavailable",
-                    message="Routing engine URL not configured; route geometry omitted.",
-                )
-            )
+    geometry_warnings = await _attach_route_geometry(payload, routes)
 
     total_tasks = len(payload.tasks)
     solution_quality = (assigned_tasks / total_tasks) if total_tasks else 1.0
@@ -376,6 +523,7 @@ async def optimize(
     elapsed_ms = int((time.perf_counter() - start_time) * 1000)
 
     metrics = _build_metrics(routes, assigned_tasks, total_tasks, payload)
+    metrics.optimality_gap = _build_optimality_gap(solutions)
 
     alternative_solutions = None
     if payload.optimization and payload.optimization.return_alternative_solutions:
@@ -388,16 +536,22 @@ async def optimize(
                 metrics=metrics,
             )
         )
+        pooled = _pooled_alternatives(solutions)
         for idx in range(1, requested):
-            alt_request = dict(legacy_request)
-            alt_request["deterministic"] = False
-            alt_request["random_seed"] = 100 + idx
-            alt_request["randomize_response"] = True
-            try:
-                alt_raw = run_optimization(alt_request)
-            except Exception:
-                continue
-            alt_solutions = alt_raw.get("solutions", [])
+            if idx <= len(pooled):
+                alt_solutions = pooled[idx - 1]
+            else:
+                # fewer diverse solutions than requested: search again
+                alt_request = dict(legacy_request)
+                alt_request["deterministic"] = False
+                alt_request["random_seed"] = 100 + idx
+                alt_request["randomize_response"] = True
+                alt_request.pop("alternatives", None)
+                try:
+                    alt_raw = run_optimization(alt_request)
+                except Exception:
+                    continue
+                alt_solutions = alt_raw.get("solutions", [])
             alt_routes, _, alt_assigned = _build_routes(
                 alt_solutions, task_durations
             )
@@ -405,6 +559,7 @@ async def optimize(
             alt_metrics = _build_metrics(
                 alt_routes, alt_assigned, total_tasks, payload
             )
+            alt_metrics.optimality_gap = _build_optimality_gap(alt_solutions)
             alternative_solutions.append(
                 AlternativeSolution(
                     quality_score=round(alt_quality, 3),
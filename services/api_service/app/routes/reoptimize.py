@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
@@ -21,10 +21,10 @@ from ..services.rate_limit import enforce_rate_limit
 from ..services.reoptimize_service import apply_reoptimize_changes
 from ..services.usage import compute_node_count, compute_usage_units, monthly_usage_units
 from .optimize import (
+    _attach_route_geometry,
     _build_metrics,
     _build_routes,
     _build_warnings,
-    _fetch_osrm_geometry,
     _resolve_osrm_base,
 )
 
@@ -109,27 +109,7 @@ async def reoptimize(
     }
     routes, unassigned, assigned_tasks = _build_routes(solutions, task_durations)
 
-    geometry_warnings: List[WarningMessage] = []
-    if updated_request.options and updated_request.options.include_route_geometry:
-        osrm_base = _resolve_osrm_base(updated_request)
-        if osrm_base:
-            for route in routes:
-                geometry = _fetch_osrm_geometry(osrm_base, route.stops)
-                route.route_geometry = geometry
-                if geometry is None:
-                    geometry_warnings.append(
-                        WarningMessage(
-                            type="route_geometry_unavailable",
-                            message="OSRM route geometry could not be fetched for one or more routes.",
-                        )
-                    )
-        else:
-            geometry_warnings.append(
-                WarningMessage(
-                    type="route_geometry_unavailable",
-                    message="Routing engine URL not configured; route geometry omitted.",
-                )
-            )
+    geometry_warnings = await _attach_route_geometry(updated_request, routes)
 
     total_tasks = len(updated_request.tasks)
     solution_quality = (assigned_tasks / total_tasks) if total_tasks else 1.0
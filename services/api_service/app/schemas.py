@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -310,12 +310,20 @@ class OptimizationSettings(BaseModel):
     max_computation_time_seconds: Optional[int] = None
     solution_quality: Optional[str] = None
     return_alternative_solutions: Optional[int] = None
+    optimality_gap: Optional[float] = Field(default=None, ge=0, le=1)
+    multi_skill_mode: Optional[Literal["split", "single_model"]] = None
+    solver_backend: Optional[Literal["ortools", "construction"]] = None
+    adaptive_strategy: Optional[bool] = None
+    day_assignment: Optional[bool] = None
+    route_templates: Optional[bool] = None
     enable_ml_predictions: Optional[bool] = None
 
 
 class OptimizeOptions(BaseModel):
     return_detailed_metrics: Optional[bool] = True
     include_route_geometry: Optional[bool] = False
+    route_geometry_format: Optional[Literal["polyline", "coordinates"]] = "coordinates"
+    route_geometry_tolerance_m: Optional[float] = Field(default=None, ge=0)
     calculate_carbon_footprint: Optional[bool] = False
     eco_routing: Optional[bool] = False
 
@@ -377,6 +385,7 @@ class RouteResponse(BaseModel):
     total_cost: Optional[float] = None
     stops: List[RouteStop]
     route_geometry: Optional[List[StopLocation]] = None
+    route_polyline: Optional[str] = None
 
 
 class UnassignedTaskResponse(BaseModel):
@@ -394,6 +403,7 @@ class OptimizeMetrics(BaseModel):
     tasks_assigned: Optional[int] = None
     tasks_unassigned: Optional[int] = None
     carbon_kg: Optional[float] = None
+    optimality_gap: Optional[float] = None
 
 
 class WarningMessage(BaseModel):
@@ -427,8 +437,8 @@ class MatrixRequest(BaseModel):
 
 
 class MatrixResponse(BaseModel):
-    distances_m: List[List[float]]
-    durations_s: List[List[float]]
+    distances_m: List[List[Optional[float]]]
+    durations_s: List[List[Optional[float]]]
 
 
 class ReoptimizeChanges(BaseModel):
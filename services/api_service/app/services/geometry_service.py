@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from optimise.routing.route_geometry import route_geometries
+from optimise.utils.routing.utils import encode_polyline
+
+from ..schemas import OptimizeOptions, RouteResponse, StopLocation
+
+
+def _stop_coords(route: RouteResponse) -> List[List[float]]:
+    return [
+        [stop.location.lng, stop.location.lat]
+        for stop in route.stops
+        if stop.location and stop.location.lat is not None and stop.location.lng is not None
+    ]
+
+
+async def attach_route_geometry(
+    routes: List[RouteResponse],
+    base_url: str,
+    options: Optional[OptimizeOptions] = None,
+) -> bool:
+    """
+    Set the road geometry of every route, as ``route_polyline`` or as
+    ``route_geometry`` points depending on ``options.route_geometry_format``.
+    Returns False when the geometry of a route could not be fetched.
+    """
+    geometry_format = (options.route_geometry_format if options else None) or "coordinates"
+    tolerance_m = options.route_geometry_tolerance_m if options else None
+    geometries = await route_geometries([_stop_coords(route) for route in routes], base_url, tolerance_m=tolerance_m)
+
+    complete = True
+    for route, points in zip(routes, geometries):
+        if points is None:
+            complete = False
+            continue
+        if geometry_format == "polyline":
+            route.route_polyline = encode_polyline(points.tolist())
+        else:
+            route.route_geometry = [StopLocation(lat=lat, lng=lng) for lng, lat in points.tolist()]
+    return complete
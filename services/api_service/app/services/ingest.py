@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+from array import array
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pydantic import ValidationError
+
+from ..schemas import Location, Task, TaskDemand, TimeWindow
+
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+XLSX_CONTENT_TYPES = {"application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"}
+
+# Columns of a spreadsheet row; skills are separated by ";" or ",".
+SPREADSHEET_COLUMNS = (
+    "id",
+    "type",
+    "lat",
+    "lng",
+    "address",
+    "service_duration_minutes",
+    "time_window_start",
+    "time_window_end",
+    "preferred_time_window_start",
+    "preferred_time_window_end",
+    "soft_time_window_penalty",
+    "priority",
+    "required_skills",
+    "demand_weight",
+    "demand_volume",
+    "demand_units",
+)
+
+_NAN = float("nan")
+
+
+@dataclass(frozen=True)
+class RowError:
+    row: int
+    field: Optional[str]
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class TaskColumns(Sequence[Task]):
+    """
+    Tasks of a streamed request held column by column. Numbers live in
+    typed arrays and time windows in one flat list indexed by offsets, so a
+    large upload costs a few objects per column instead of a model tree per
+    task. Items are rebuilt as unvalidated ``Task`` models on access.
+    """
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.types: List[Optional[str]] = []
+        self.lat = array("d")
+        self.lng = array("d")
+        self.addresses: List[Optional[str]] = []
+        self.service_minutes = array("q")
+        self.priority = array("q")
+        self.penalty = array("d")
+        self.skills: List[Optional[tuple]] = []
+        self.demand = array("d")
+        self.windows: List[datetime] = []
+        self.window_offsets = array("q", [0])
+        self.preferred: List[datetime] = []
+        self.preferred_offsets = array("q", [0])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, task: Task) -> None:
+        self.ids.append(task.id)
+        self.types.append(task.type)
+        self.lat.append(task.location.lat)
+        self.lng.append(task.location.lng)
+        self.addresses.append(task.location.address)
+        self.service_minutes.append(task.service_duration_minutes)
+        self.priority.append(-1 if task.priority is None else task.priority)
+        self.penalty.append(_NAN if task.soft_time_window_penalty is None else task.soft_time_window_penalty)
+        self.skills.append(tuple(task.required_skills) if task.required_skills is not None else None)
+        demand = task.demand or TaskDemand()
+        for value in (demand.weight, demand.volume, demand.units):
+            self.demand.append(_NAN if value is None else value)
+        for window in task.time_windows:
+            self.windows.extend((window.start, window.end))
+        self.window_offsets.append(len(self.windows))
+        for window in task.preferred_time_windows:
+            self.preferred.extend((window.start, window.end))
+        self.preferred_offsets.append(len(self.preferred))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("task index out of range")
+        demand = [None if value != value else value for value in self.demand[3 * index:3 * index + 3]]
+        return Task.model_construct(
+            id=self.ids[index],
+            type=self.types[index],
+            location=Location.model_construct(
+                lat=self.lat[index], lng=self.lng[index], address=self.addresses[index]
+            ),
+            service_duration_minutes=self.service_minutes[index],
+            time_windows=_windows(self.windows, self.window_offsets, index),
+            preferred_time_windows=_windows(self.preferred, self.preferred_offsets, index),
+            soft_time_window_penalty=None if self.penalty[index] != self.penalty[index] else self.penalty[index],
+            demand=None if demand == [None, None, None] else TaskDemand.model_construct(
+                weight=demand[0], volume=demand[1], units=demand[2]
+            ),
+            priority=None if self.priority[index] < 0 else self.priority[index],
+            required_skills=None if self.skills[index] is None else list(self.skills[index]),
+        )
+
+    def __iter__(self) -> Iterator[Task]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+def _windows(bounds: List[datetime], offsets: array, index: int) -> List[TimeWindow]:
+    start, end = offsets[index], offsets[index + 1]
+    return [
+        TimeWindow.model_construct(start=bounds[i], end=bounds[i + 1]) for i in range(start, end, 2)
+    ]
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _flat_window(row: Dict[str, Any], prefix: str) -> List[Dict[str, Any]]:
+    start, end = row.get(f"{prefix}_start"), row.get(f"{prefix}_end")
+    if _blank(start) and _blank(end):
+        return []
+    return [{"start": start, "end": end}]
+
+
+def spreadsheet_task(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Task payload of a flat spreadsheet row (see ``SPREADSHEET_COLUMNS``).
+    """
+    task: Dict[str, Any] = {
+        "id": None if _blank(row.get("id")) else str(row["id"]).strip(),
+        "location": {"lat": row.get("lat"), "lng": row.get("lng")},
+        "service_duration_minutes": row.get("service_duration_minutes"),
+        "time_windows": _flat_window(row, "time_window"),
+        "preferred_time_windows": _flat_window(row, "preferred_time_window"),
+    }
+    if not _blank(row.get("address")):
+        task["location"]["address"] = str(row["address"])
+    if not _blank(row.get("type")):
+        task["type"] = row["type"]
+    for field in ("soft_time_window_penalty", "priority"):
+        if not _blank(row.get(field)):
+            task[field] = row[field]
+    skills = row.get("required_skills")
+    if not _blank(skills):
+        task["required_skills"] = [
+            skill.strip() for skill in str(skills).replace(";", ",").split(",") if skill.strip()
+        ]
+    demand = {
+        key: row[f"demand_{key}"]
+        for key in ("weight", "volume", "units")
+        if not _blank(row.get(f"demand_{key}"))
+    }
+    if demand:
+        task["demand"] = demand
+    return task
+
+
+class TaskIngestor:
+    """
+    Validates tasks one row at a time into a ``TaskColumns`` buffer and
+    collects the row-level errors. Row numbers are those of the upload
+    (1-based, header or envelope line included).
+    """
+
+    def __init__(self, max_errors: int = 100) -> None:
+        self.tasks = TaskColumns()
+        self.errors: List[RowError] = []
+        self.error_count = 0
+        self.max_errors = max_errors
+        self._seen_ids = set()
+
+    def _error(self, row: int, field: Optional[str], message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(RowError(row=row, field=field, message=message))
+
+    def add(self, row: int, record: Union[Dict[str, Any], RowError]) -> None:
+        if isinstance(record, RowError):
+            self._error(record.row, record.field, record.message)
+            return
+        try:
+            task = Task.model_validate(record)
+        except ValidationError as exc:
+            for error in exc.errors():
+                field = ".".join(str(part) for part in error["loc"]) or None
+                self._error(row, field, error["msg"])
+            return
+        if task.id in self._seen_ids:
+            self._error(row, "id", f"duplicate task id {task.id!r}")
+            return
+        self._seen_ids.add(task.id)
+        self.tasks.append(task)
+
+    def error_detail(self) -> Dict[str, Any]:
+        return {
+            "message": f"{self.error_count} invalid task rows",
+            "errors": [error.to_dict() for error in self.errors],
+            "error_count": self.error_count,
+        }
+
+
+def parse_ndjson_line(row: int, line: Union[bytes, str]) -> Union[Dict[str, Any], RowError, None]:
+    """
+    The JSON object of an NDJSON line, None for a blank line.
+    """
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    if not line.strip():
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError as exc:
+        return RowError(row=row, field=None, message=f"invalid JSON: {exc}")
+    if not isinstance(record, dict):
+        return RowError(row=row, field=None, message="expected a JSON object")
+    return record
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Lines of a streamed body, without their line terminator.
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if pending:
+        yield pending.rstrip(b"\r")
+
+
+def iter_csv_rows(lines: Iterable[Union[bytes, str]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    ``(row, task payload)`` of a CSV upload, read lazily line by line.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    text_lines = (decoder.decode(line) if isinstance(line, bytes) else line for line in lines)
+    reader = csv.DictReader(text_lines)
+    for row in reader:
+        yield reader.line_num, spreadsheet_task(
+            {key.strip(): value for key, value in row.items() if key}
+        )
+
+
+def iter_xlsx_rows(file: BinaryIO) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    ``(row, task payload)`` of the first sheet of an XLSX upload. The workbook
+    is opened in read-only mode, which streams the sheet instead of loading it.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        for row, values in enumerate(rows, start=2):
+            if all(_blank(value) for value in values):
+                continue
+            yield row, spreadsheet_task({key: value for key, value in zip(header, values) if key})
+    finally:
+        workbook.close()
@@ -2,11 +2,21 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional
 
-from optimise.routing.defaults import DEFAULT_DRIVING_SPEED_KMH
-from optimise.routing.distance_matrix import get_distance_matrix_with_retry
+import numpy as np
+
+from optimise.routing.defaults import DEFAULT_DRIVING_SPEED_KMH, ROUTER_ASYNC_CONCURRENCY
+from optimise.routing.distance_matrix import get_distance_matrix_with_retry, get_distance_matrix_with_retry_async
 from optimise.utils.haversine_distance import haversine_distance_matrix
 
 
+def _as_lists(matrix: np.ndarray) -> List[List[Optional[float]]]:
+    """Nested lists of a matrix, with None for the pairs the engine could not route."""
+    missing = np.isnan(matrix)
+    if missing.any():
+        return np.where(missing, None, matrix).tolist()
+    return matrix.tolist()
+
+
 def build_matrix(
     coords_latlon: List[List[float]],
     method: str = "haversine",
@@ -34,7 +44,7 @@ def build_matrix(
                     os.environ.pop("ROUTING_ENGINE", None)
                 else:
                     os.environ["ROUTING_ENGINE"] = previous_engine
-        return {"distances": result["distances"], "durations": result["durations"]}
+        return {"distances": _as_lists(result["distances"]), "durations": _as_lists(result["durations"])}
 
     distances = haversine_distance_matrix(coords_latlon)
     speed_kmh = driving_speed_kmh or DEFAULT_DRIVING_SPEED_KMH
@@ -47,3 +57,25 @@ def build_matrix(
         for row in distances
     ]
     return {"distances": distances, "durations": durations}
+
+
+async def build_matrix_async(
+    coords_latlon: List[List[float]],
+    method: str = "haversine",
+    driving_speed_kmh: Optional[float] = None,
+    routing_engine_url: Optional[str] = None,
+    concurrency: int = ROUTER_ASYNC_CONCURRENCY,
+) -> Dict[str, List[List[float]]]:
+    """
+    ``build_matrix`` for the event loop: OSRM tiles are awaited on the shared
+    async client, ``concurrency`` at a time, instead of holding a thread, with
+    the same retries and failover as the blocking path.
+    """
+    if not coords_latlon or method != "osrm":
+        return build_matrix(coords_latlon, method=method, driving_speed_kmh=driving_speed_kmh)
+
+    coords_lonlat = [[lon, lat] for lat, lon in coords_latlon]
+    result = await get_distance_matrix_with_retry_async(
+        coords_lonlat, router_name="osrm", base_url=routing_engine_url, concurrency=concurrency
+    )
+    return {"distances": _as_lists(result["distances"]), "durations": _as_lists(result["durations"])}
@@ -13,6 +13,7 @@ from .observability import configure_logger
 from optimise.routing.preprocessing.preprocess_request import preprocess_request
 from optimise.routing.data_model import get_optimisation_instances
 from optimise.routing.solver.ortools_runner import solve_instances
+from optimise.utils.retry_budget import budget_scope, job_budget
 import hashlib
 import hmac
 import json
@@ -39,9 +40,11 @@ def solve_job(job_id: str) -> None:
         errors: List[str] = []
         try:
             request_payload: Dict[str, Any] = job.request
-            preprocessed = preprocess_request(request_payload, errors)
-            instances = get_optimisation_instances(preprocessed)
-            results = solve_instances(instances)
+            # remote calls give up before the soft time limit instead of being killed mid-fetch
+            with budget_scope(job_budget(settings.job_timeout_seconds)):
+                preprocessed = preprocess_request(request_payload, errors)
+                instances = get_optimisation_instances(preprocessed)
+                results = solve_instances(instances)
             job.result = {"solutions": results, "errors": errors}
             job.status = "COMPLETED"
         except SoftTimeLimitExceeded:
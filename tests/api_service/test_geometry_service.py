@@ -0,0 +1,40 @@
+import asyncio
+
+import numpy as np
+
+from services.api_service.app.schemas import OptimizeOptions, RouteResponse, RouteStop, StopLocation
+from services.api_service.app.services import geometry_service
+
+
+def _route(*points):
+    stops = [
+        RouteStop(sequence=i, type="task", location=StopLocation(lat=lat, lng=lng))
+        for i, (lat, lng) in enumerate(points)
+    ]
+    return RouteResponse(vehicle_id="v1", total_distance_km=1.0, total_duration_minutes=5.0, stops=stops)
+
+
+def test_attach_route_geometry_as_polyline_or_points(monkeypatch):
+    seen = {}
+
+    async def fake_route_geometries(routes, base_url, tolerance_m=None):
+        seen["routes"], seen["tolerance_m"] = routes, tolerance_m
+        return [np.array([[-120.2, 38.5], [-120.95, 40.7]]), None]
+
+    monkeypatch.setattr(geometry_service, "route_geometries", fake_route_geometries)
+    routes = [_route((38.5, -120.2), (40.7, -120.95)), _route((38.5, -120.2))]
+
+    complete = asyncio.run(
+        geometry_service.attach_route_geometry(routes, "http://osrm.test", OptimizeOptions(route_geometry_format="polyline", route_geometry_tolerance_m=5))
+    )
+    assert not complete
+    assert seen["routes"][0] == [[-120.2, 38.5], [-120.95, 40.7]]
+    assert seen["tolerance_m"] == 5
+    assert routes[0].route_polyline == "_p~iF~ps|U_ulLnnqC"
+    assert routes[0].route_geometry is None
+    assert routes[1].route_polyline is None
+
+    asyncio.run(
+        geometry_service.attach_route_geometry(routes, "http://osrm.test", OptimizeOptions())
+    )
+    assert routes[0].route_geometry == [StopLocation(lat=38.5, lng=-120.2), StopLocation(lat=40.7, lng=-120.95)]
@@ -0,0 +1,98 @@
+import io
+import json
+
+from services.api_service.app.schemas import Task
+from services.api_service.app.services.ingest import TaskIngestor, iter_csv_rows
+
+ENVELOPE = {
+    "problem_type": "vrptw",
+    "objectives": {"primary": "minimize_total_duration"},
+    "vehicles": [
+        {
+            "id": "van_1",
+            "start_location": {"lat": 50.8476, "lng": 4.3561},
+            "available_time_windows": [
+                {"start": "2024-01-01T08:00:00", "end": "2024-01-01T17:00:00"}
+            ],
+        }
+    ],
+    "optimization": {"max_computation_time_seconds": 1},
+}
+
+TASKS = [
+    {
+        "id": f"task_{i}",
+        "location": {"lat": 50.85 + 0.004 * i, "lng": 4.35 - 0.003 * i},
+        "service_duration_minutes": 15,
+        "priority": i + 1,
+        "time_windows": [{"start": "2024-01-01T08:00:00", "end": "2024-01-01T17:00:00"}],
+    }
+    for i in range(3)
+]
+
+CSV_UPLOAD = (
+    "id,lat,lng,service_duration_minutes,time_window_start,time_window_end,required_skills\n"
+    "task_0,50.85,4.35,15,2024-01-01T08:00:00,2024-01-01T17:00:00,\n"
+    "task_1,50.854,4.347,20,,,a;b\n"
+    "task_2,north,4.344,15,,,\n"
+    "task_1,50.858,4.344,15,,,\n"
+)
+
+
+def test_task_columns_round_trip_validated_tasks():
+    ingestor = TaskIngestor()
+    for row, task in enumerate(TASKS, start=2):
+        ingestor.add(row, task)
+    assert ingestor.error_count == 0
+    assert list(ingestor.tasks) == [Task.model_validate(task) for task in TASKS]
+    assert ingestor.tasks[-1].priority == 3
+    assert ingestor.tasks[0].demand is None
+
+
+def test_csv_rows_are_validated_one_by_one():
+    ingestor = TaskIngestor()
+    for row, record in iter_csv_rows(io.BytesIO(CSV_UPLOAD.encode("utf-8"))):
+        ingestor.add(row, record)
+
+    assert len(ingestor.tasks) == 2
+    assert ingestor.tasks[1].required_skills == ["a", "b"]
+    assert ingestor.tasks[1].time_windows == []
+    assert [(error.row, error.field) for error in ingestor.errors] == [(4, "location.lat"), (5, "id")]
+
+
+def test_optimize_stream_accepts_ndjson(client):
+    body = "\n".join(json.dumps(line) for line in [ENVELOPE, *TASKS]) + "\n"
+    response = client.post(
+        "/v1/optimize/stream",
+        content=body.encode("utf-8"),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["metrics"]["tasks_assigned"] + data["metrics"]["tasks_unassigned"] == 3
+
+
+def test_optimize_stream_reports_spreadsheet_rows(client):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["id", "lat", "lng", "service_duration_minutes"])
+    sheet.append(["task_0", 50.85, 4.35, 15])
+    sheet.append(["task_1", 50.854, None, 15])
+    upload = io.BytesIO()
+    workbook.save(upload)
+
+    response = client.post(
+        "/v1/optimize/stream",
+        content=upload.getvalue(),
+        headers={
+            "Content-Type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            "X-Optimize-Request": json.dumps(ENVELOPE),
+        },
+    )
+    assert response.status_code == 400
+    details = response.json()["error"]["details"]
+    assert details["error_count"] == 1
+    assert details["errors"][0]["row"] == 3
+    assert details["errors"][0]["field"] == "location.lng"
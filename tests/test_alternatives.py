@@ -0,0 +1,67 @@
+import copy
+
+from optimise.routing.data_model import get_optimisation_instances
+from optimise.routing.preprocessing.preprocess_request import preprocess_request
+from optimise.routing.solver.alternatives import assignment_distance, select_diverse_solutions
+from optimise.routing.solver.ortools_runner import solve_instances
+
+from test_routing_solvers_refactored import _load_payload
+
+
+def test_assignment_distance_counts_reassigned_orders():
+    assert assignment_distance([[1, 2], [3]], [[2, 1], [3]]) == 0.0
+    assert assignment_distance([[1, 2], [3]], [[1], [2, 3]]) == 1 / 3
+    assert assignment_distance([[1, 2], []], [[1], []]) == 1 / 2
+
+
+def test_diverse_solutions_are_picked_by_distance_then_cost():
+    pool = {
+        ((1, 2, 3, 4), ()): 100,
+        ((2, 1, 3, 4), ()): 100,
+        ((1, 2, 3), (4,)): 105,
+        ((1, 2), (3, 4)): 110,
+        ((1,), (2, 3, 4)): 200,
+    }
+    picked = select_diverse_solutions(pool, 2, max_cost_increase=0.5, incumbent=((2, 1, 3, 4), ()))
+    assert picked == [(110, [[1, 2], [3, 4]]), (105, [[1, 2, 3], [4]])]
+    assert select_diverse_solutions(pool, 1, max_cost_increase=0.05) == [(105, [[1, 2, 3], [4]])]
+    assert select_diverse_solutions({((1, 2), ()): 10, ((2, 1), ()): 12}, 3) == []
+
+
+def test_alternatives_are_returned_from_one_search():
+    payload = _load_payload()
+    template = payload["orders"][0]
+    for i in range(6):
+        order = copy.deepcopy(template)
+        order["id"] = f"WO-X{i}"
+        order["latitude"] += 0.003 * i
+        order["longitude"] -= 0.002 * i
+        payload["orders"].append(order)
+    workers = payload["teams"]["TeamA"]["workers"]
+    second = copy.deepcopy(workers[0])
+    second["e_id"] = "W-2"
+    workers.append(second)
+    payload.update(alternatives=2, time_limit=1, deterministic=False)
+
+    errors = []
+    instances = get_optimisation_instances(preprocess_request(payload, errors))
+    result = solve_instances(instances)[0]
+
+    def assignment(details):
+        return [
+            sorted(step["node"]["id"] for step in worker["tour_steps"][1:-1])
+            for worker in details["2024-01-01"]["by_worker"]
+        ]
+
+    alternatives = result.get("alternatives", [])
+    assert alternatives
+    seen = [assignment(result["details"])]
+    for alternative in alternatives:
+        assert assignment(alternative["details"]) not in seen
+        seen.append(assignment(alternative["details"]))
+        served = {order_id for worker in seen[-1] for order_id in worker}
+        assert {d["id"] for d in alternative["dropped"]}.isdisjoint(served)
+
+    # alternatives are recorded on copies, the instance keeps the chosen tours
+    kept = {"2024-01-01": {"by_worker": [worker.to_dict() for worker in instances[0].workers]}}
+    assert assignment(kept) == seen[0]
@@ -0,0 +1,59 @@
+from dataclasses import replace
+
+from optimise.routing.config.solve_profile import SolveProfile
+from optimise.routing.constraints import ArcCostConstraint, ArcPruningConstraint, TimeWindowConstraint
+from optimise.routing.input.solver_input import SolverInput
+from optimise.routing.solver.ortools_builder import DEFAULT_CONSTRAINTS, OrtoolsRoutingBuilder, OrtoolsSolver
+
+
+def _solver_input(**overrides):
+    time_matrix = [[0 if i == j else 10 for j in range(4)] for i in range(4)]
+    solver_input = SolverInput(
+        time_matrix=time_matrix,
+        distance_matrix=time_matrix,
+        time_windows=[(0, 500), (0, 60), (200, 260), (0, 500)],
+        service_durations=[0, 30, 30, 30],
+        num_vehicles=2,
+        starts=[0, 0],
+        ends=[0, 0],
+        allow_slack=500,
+        horizon=500,
+        penalties=[1000, 1000, 1000],
+        num_depots=1,
+        time_limit_seconds=1,
+        first_solution_strategy="PATH_CHEAPEST_ARC",
+        local_search_metaheuristic="GREEDY_DESCENT",
+    )
+    return replace(solver_input, **overrides)
+
+
+def _build(solver_input):
+    builder = OrtoolsRoutingBuilder(
+        constraints=[ArcCostConstraint(), TimeWindowConstraint(), ArcPruningConstraint()]
+    )
+    manager, routing, _ = builder.build(solver_input)
+    return manager, routing
+
+
+def test_arc_pruning_removes_time_infeasible_arcs():
+    manager, routing = _build(_solver_input())
+    # order 2 cannot start before 200, order 1 must start by 30
+    assert not routing.NextVar(manager.NodeToIndex(2)).Contains(manager.NodeToIndex(1))
+    assert routing.NextVar(manager.NodeToIndex(1)).Contains(manager.NodeToIndex(2))
+    assert routing.NextVar(manager.NodeToIndex(1)).Contains(manager.NodeToIndex(3))
+
+
+def test_arc_pruning_removes_arcs_between_disjoint_zones():
+    manager, routing = _build(_solver_input(allowed_vehicles_by_node={1: [0], 3: [1]}))
+    assert not routing.NextVar(manager.NodeToIndex(1)).Contains(manager.NodeToIndex(3))
+    assert not routing.NextVar(manager.NodeToIndex(3)).Contains(manager.NodeToIndex(1))
+    assert routing.NextVar(manager.NodeToIndex(1)).Contains(manager.NodeToIndex(2))
+
+
+def test_arc_pruning_keeps_the_optimum():
+    solver_input = _solver_input()
+    profile = SolveProfile.from_solver_input(solver_input)
+    pruned, _, _ = OrtoolsSolver().solve(solver_input, profile)
+    constraints = [c for c in DEFAULT_CONSTRAINTS if not isinstance(c, ArcPruningConstraint)]
+    unpruned, _, _ = OrtoolsSolver(constraints=constraints).solve(solver_input, profile)
+    assert pruned.ObjectiveValue() == unpruned.ObjectiveValue()
@@ -0,0 +1,141 @@
+import asyncio
+import json
+
+import httpx
+
+from optimise.routing import distance_matrix
+from optimise.utils.retry_budget import RetryBudget, budget_scope
+from optimise.utils.routing.client_async import AsyncClient
+from optimise.utils.routing.routers import ORS, OSRM
+
+
+def _osrm_table(request):
+    """Durations of an OSRM table request: ``100 * source + destination``."""
+    coords = request.url.path.rsplit("/", 1)[-1].split(";")
+    everyone = ";".join(str(i) for i in range(len(coords)))
+    sources = [int(i) for i in request.url.params.get("sources", everyone).split(";")]
+    destinations = [int(i) for i in request.url.params.get("destinations", everyone).split(";")]
+    durations = [[100.0 * s + d for d in destinations] for s in sources]
+    return httpx.Response(200, json={"code": "Ok", "durations": durations, "distances": durations})
+
+
+def test_osrm_matrix_async_matches_the_blocking_parse():
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_osrm_table)) as http:
+            router = OSRM(base_url="http://osrm.test")
+            router.async_client = AsyncClient.from_client(router.client, http=http)
+            return await router.matrix_async(
+                locations=[[4.35, 50.85], [4.36, 50.86], [4.37, 50.87]], sources=[1], destinations=[0, 2]
+            )
+
+    matrix = asyncio.run(run())
+    assert matrix.durations == [[100.0, 102.0]]
+    assert matrix.raw["code"] == "Ok"
+
+
+def test_ors_directions_async_posts_json_with_credentials():
+    seen = {}
+
+    def handler(request):
+        seen["auth"] = request.headers["Authorization"]
+        seen["body"] = json.loads(request.content)
+        route = {"summary": {"duration": 60.0, "distance": 500.0}, "geometry": {"coordinates": [[4.35, 50.85]]}}
+        feature = {"properties": route, "geometry": route["geometry"]}
+        return httpx.Response(200, json={"type": "FeatureCollection", "features": [feature]})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            router = ORS(api_key="secret", base_url="http://ors.test")
+            router.async_client = AsyncClient.from_client(router.client, http=http)
+            return await router.directions_async(
+                locations=[[4.35, 50.85], [4.36, 50.86]], profile="driving-car", format="geojson"
+            )
+
+    direction = asyncio.run(run())
+    assert seen["auth"] == "secret"
+    assert seen["body"]["coordinates"] == [[4.35, 50.85], [4.36, 50.86]]
+    assert direction.duration == 60
+
+
+def test_matrix_tiles_are_fetched_concurrently_within_the_bound(monkeypatch):
+    monkeypatch.setattr(distance_matrix, "ENABLE_DISTANCE_MATRIX_CACHE", False)
+    in_flight = {"now": 0, "peak": 0}
+
+    async def run():
+        async def handler(request):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return _osrm_table(request)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            router = OSRM(base_url="http://osrm.test")
+            router.async_client = AsyncClient.from_client(router.client, http=http)
+            coords = [[4.0 + i / 100, 50.0] for i in range(7)]
+            config = {"max_batch_size": 3, "profile": "driving"}
+            return await distance_matrix.get_distance_matrix_batches_async(coords, router, config, concurrency=2)
+
+    matrix = asyncio.run(run())
+    assert matrix["durations"].tolist() == [[100.0 * s + d for d in range(7)] for s in range(7)]
+    assert in_flight["peak"] == 2
+
+
+def test_async_matrix_retries_connection_errors_then_fails_over(monkeypatch):
+    monkeypatch.setattr(distance_matrix, "ENABLE_DISTANCE_MATRIX_CACHE", False)
+    calls = {"down": 0, "backup": 0}
+
+    def down(request):
+        calls["down"] += 1
+        raise httpx.ConnectError("connection refused", request=request)
+
+    def backup(request):
+        calls["backup"] += 1
+        return _osrm_table(request)
+
+    async def run():
+        handlers = {"osrm": down, "backup": backup}
+        async with httpx.AsyncClient(transport=httpx.MockTransport(lambda r: handlers[r.url.host](r))) as http:
+
+            def get_router(name, api_key=None, base_url=None):
+                router = OSRM(base_url=f"http://{'osrm' if name == 'osrm' else 'backup'}")
+                router.async_client = AsyncClient.from_client(router.client, http=http)
+                return router
+
+            monkeypatch.setattr(distance_matrix, "get_router", get_router)
+            routers = {
+                "osrm": {"api_keys": [""], "profile": "driving", "priority": 1, "max_batch_size": 4},
+                "backup": {"api_keys": ["key"], "profile": "driving", "priority": 2, "max_batch_size": 4},
+            }
+            coords = [[4.0 + i / 100, 50.0] for i in range(4)]
+            with budget_scope(RetryBudget(max_retries=1)):
+                return await distance_matrix.get_distance_matrix_with_retry_async(coords, routers)
+
+    matrix = asyncio.run(run())
+    assert matrix["durations"].tolist() == [[100.0 * s + d for d in range(4)] for s in range(4)]
+    assert calls["down"] == 2
+    assert calls["backup"] == 1
+
+
+def test_async_matrix_reads_the_cache_off_the_event_loop(monkeypatch):
+    monkeypatch.setattr(distance_matrix, "ENABLE_DISTANCE_MATRIX_CACHE", True)
+    def running_loop():
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    read, stored = [], []
+    monkeypatch.setattr(distance_matrix, "_cached_submatrix", lambda key: read.append(running_loop()))
+    monkeypatch.setattr(distance_matrix, "_store_submatrix", lambda key, matrix: stored.append(running_loop()))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_osrm_table)) as http:
+            router = OSRM(base_url="http://osrm.test")
+            router.async_client = AsyncClient.from_client(router.client, http=http)
+            return await distance_matrix.fetch_submatrix_async(router, [[4.35, 50.85], [4.36, 50.86]], [0], [1], "driving")
+
+    matrix = asyncio.run(run())
+    assert matrix.durations == [[1.0]]
+    assert read == [None]
+    assert stored == [None]
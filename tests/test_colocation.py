@@ -0,0 +1,94 @@
+import copy
+from dataclasses import replace
+
+from optimise.routing.adapter.colocation import merge_colocated_nodes
+from optimise.routing.data_model import get_optimisation_instances
+from optimise.routing.input.solver_input import SolverInput
+from optimise.routing.preprocessing.preprocess_request import preprocess_request
+from optimise.routing.solver import ortools_runner
+from optimise.routing.solver.ortools_builder import OrtoolsRoutingBuilder
+from optimise.routing.solver.ortools_runner import _solve
+from optimise.routing.solver.tours import read_tours, tour_routes
+
+from test_routing_solvers_refactored import _load_payload
+
+
+def _solver_input(**overrides):
+    # nodes 1, 2 and 3 share a location, node 4 is elsewhere
+    places = [0, 1, 1, 1, 2]
+    travel = [[0, 10, 15], [10, 0, 12], [15, 12, 0]]
+    time_matrix = [[travel[a][b] for b in places] for a in places]
+    solver_input = SolverInput(
+        time_matrix=time_matrix,
+        distance_matrix=time_matrix,
+        time_windows=[(0, 1000), (0, 200), (50, 300), (0, 1000), (0, 1000)],
+        service_durations=[0, 20, 30, 40, 20],
+        num_vehicles=2,
+        starts=[0, 0],
+        ends=[0, 0],
+        allow_slack=1000,
+        horizon=1000,
+        penalties=[1000, 2000, 3000, 4000],
+        location_priorities=[(1, 3), (2, 1), (3, 4), (4, 2)],
+        num_depots=1,
+        time_limit_seconds=1,
+        first_solution_strategy="PATH_CHEAPEST_ARC",
+    )
+    return replace(solver_input, **overrides)
+
+
+def test_colocated_orders_become_one_node():
+    result = merge_colocated_nodes(_solver_input())
+    assert result.members == [[0], [1, 3, 2], [4]]
+    merged = result.solver_input
+    assert merged.time_windows[1] == (50, 200)
+    assert merged.service_durations == [0, 90, 20]
+    assert merged.penalties == [6000, 4000]
+    assert merged.location_priorities == [(1, 1), (2, 2)]
+    assert result.expand_routes([[2, 1], []]) == [[4, 1, 3, 2], []]
+    # members are served back to back from the visit of the merged node
+    tours = result.expand_tours([[(0, 0), (1, 60), (0, 160)]], _solver_input().service_durations)
+    assert tours == [[(0, 0), (1, 60), (3, 80), (2, 120), (0, 160)]]
+
+
+def test_incompatible_orders_stay_apart():
+    solver_input = _solver_input(
+        time_windows=[(0, 1000), (0, 60), (50, 300), (0, 1000), (0, 1000)],
+        allowed_vehicles_by_node={3: [1]},
+    )
+    result = merge_colocated_nodes(solver_input)
+    assert not result.is_reduced
+    assert merge_colocated_nodes(_solver_input(precedence_constraints=[(1, 4)])).members == [
+        [0], [1], [3, 2], [4]
+    ]
+    assert not merge_colocated_nodes(_solver_input(distribute_load=True)).is_reduced
+
+
+def test_merged_tours_load_on_original_model():
+    solver_input = _solver_input()
+    result = merge_colocated_nodes(solver_input)
+    packed = _solve(result.solver_input)
+    assert packed is not None
+
+    tours = result.expand_tours(packed.tours, solver_input.service_durations)
+    routes = tour_routes(tours)
+    assert sorted(node for route in routes for node in route) == [1, 2, 3, 4]
+    manager, routing, _context = OrtoolsRoutingBuilder().build(solver_input)
+    assert read_tours(routing, manager, routes) is not None
+
+
+def test_reduced_day_loads_without_rebuilding_the_model():
+    payload = _load_payload()
+    twin = copy.deepcopy(payload["orders"][0])
+    twin["id"] = "WO-1b"
+    payload["orders"].append(twin)
+    instances = get_optimisation_instances(preprocess_request(payload, []))
+    result = ortools_runner.solve_instances(instances)[0]
+
+    steps = {
+        step["node"]["id"]: step["node"]
+        for worker in result["details"]["2024-01-01"]["by_worker"]
+        for step in worker["tour_steps"]
+    }
+    assert result["dropped"] == []
+    assert steps["WO-1b"]["service_start_time"] == steps["WO-1"]["service_end_time"]
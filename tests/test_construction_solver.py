@@ -0,0 +1,144 @@
+import random
+from dataclasses import replace
+
+from optimise.routing.input.solver_input import SolverInput
+from optimise.routing.solver.construction import ConstructionSolver
+from optimise.routing.solver.tours import assignment_tours, tour_routes
+
+
+def _solver_input(size=12, num_vehicles=2, seed=3):
+    rng = random.Random(seed)
+    points = [(rng.uniform(0, 50), rng.uniform(0, 50)) for _ in range(size)]
+    time_matrix = [
+        [int(abs(ax - bx) + abs(ay - by)) for bx, by in points] for ax, ay in points
+    ]
+    windows = [(0, 600)] + [
+        (start, start + 120) for start in (rng.randrange(0, 400) for _ in range(size - 1))
+    ]
+    return SolverInput(
+        time_matrix=time_matrix,
+        distance_matrix=time_matrix,
+        time_windows=windows,
+        service_durations=[0] + [15] * (size - 1),
+        num_vehicles=num_vehicles,
+        starts=[0] * num_vehicles,
+        ends=[0] * num_vehicles,
+        max_working_time=600,
+        allow_slack=600,
+        horizon=600,
+        penalties=[10000] * (size - 1),
+        num_depots=1,
+        time_limit_seconds=1,
+        first_solution_strategy="PATH_CHEAPEST_ARC",
+        local_search_metaheuristic="GREEDY_DESCENT",
+    )
+
+
+def _arrivals(solver_input, route):
+    time = 0
+    previous = 0
+    arrivals = []
+    for node in route:
+        time = max(
+            time + solver_input.service_durations[previous] + solver_input.time_matrix[previous][node],
+            solver_input.time_windows[node][0],
+        )
+        arrivals.append(time)
+        previous = node
+    return arrivals
+
+
+def test_construction_routes_respect_time_windows():
+    solver_input = _solver_input()
+    solver = ConstructionSolver(improvement_seconds=0.2)
+    routes = solver.construct(solver_input)
+
+    served = [node for route in routes for node in route]
+    assert len(served) == len(set(served))
+    assert len(served) >= 8
+    for route in routes:
+        for node, arrival in zip(route, _arrivals(solver_input, route)):
+            window_start, window_end = solver_input.time_windows[node]
+            assert window_start <= arrival <= window_end - solver_input.service_durations[node]
+
+
+def test_construction_solve_returns_ortools_structure():
+    solver_input = _solver_input()
+    solver = ConstructionSolver(improvement_seconds=0.2)
+    assignment, routing, manager = solver.solve(solver_input)
+
+    assert assignment is not None
+    assert tour_routes(assignment_tours(assignment, routing, manager)) == solver.routes
+    assert solver.lower_bound <= assignment.ObjectiveValue()
+
+
+def test_construction_tours_skip_the_ortools_model(monkeypatch):
+    solver_input = _solver_input()
+    solver = ConstructionSolver(improvement_seconds=0.2)
+
+    def build(_solver_input):
+        raise AssertionError("the model is only built by the fallback")
+
+    monkeypatch.setattr(solver.builder, "build", build)
+    tours, objective_value = solver.solve_tours(solver_input)
+
+    assert tour_routes(tours) == solver.routes
+    assert objective_value == round(solver.objective_value)
+    for tour in tours:
+        for node, visit_time in tour[1:-1]:
+            window_start, window_end = solver_input.time_windows[node]
+            assert window_start <= visit_time <= window_end - solver_input.service_durations[node]
+
+
+def test_construction_objective_charges_soft_windows_and_priorities():
+    solver_input = _solver_input()
+    tours, objective_value = ConstructionSolver(improvement_seconds=0).solve_tours(solver_input)
+    visits = [(node, visit_time) for tour in tours for node, visit_time in tour[1:-1]]
+    windows = solver_input.time_windows
+
+    # visits start before the window ends, so all of them are early
+    soft = replace(
+        solver_input, soft_time_windows=[None] + [(end, end + 10, 2) for _start, end in windows[1:]]
+    )
+    soft_tours, soft_objective = ConstructionSolver(improvement_seconds=0).solve_tours(soft)
+    assert soft_tours == tours
+    assert soft_objective == objective_value + sum(2 * (windows[node][1] - t) for node, t in visits)
+
+    prioritised = replace(
+        soft, account_for_priority=True, location_priorities=[(node, 1) for node in range(1, len(windows))]
+    )
+    _tours, prioritised_objective = ConstructionSolver(improvement_seconds=0).solve_tours(prioritised)
+    assert prioritised_objective == objective_value + sum(
+        2 * (windows[node][1] - t) + 4 * max(0, t - windows[node][0] - 15) for node, t in visits
+    )
+
+
+def test_construction_respects_allowed_vehicles_and_breaks():
+    solver_input = replace(
+        _solver_input(),
+        allowed_vehicles_by_node={1: [1], 2: [1]},
+        breaks=[[(0, 100, False)], [(500, 100, False)]],
+        break_day_end=600,
+    )
+    solver = ConstructionSolver(improvement_seconds=0.2)
+    assignment, routing, manager = solver.solve(solver_input)
+
+    routes = solver.routes
+    assert 1 not in routes[0] and 2 not in routes[0]
+    # the routes were accepted by the OR-Tools model, breaks included
+    assert assignment is not None
+    assert tour_routes(assignment_tours(assignment, routing, manager)) == routes
+
+
+def test_construction_falls_back_when_mandatory_order_is_unplaceable():
+    solver_input = replace(
+        _solver_input(size=4, num_vehicles=1),
+        time_windows=[(0, 600), (0, 600), (0, 600), (0, 600)],
+        penalties=[],
+        max_working_time=30,
+    )
+    solver = ConstructionSolver(improvement_seconds=0)
+    assignment, _routing, _manager = solver.solve(solver_input)
+    # three 15 minute orders cannot fit in 30 minutes and none can be dropped
+    assert assignment is None
+    assert solver.solve_tours(solver_input) is None
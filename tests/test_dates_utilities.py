@@ -1,4 +1,16 @@
-from optimise.utils.dates import convert_units, datetime_to_integer, integer_to_datetime
+from datetime import date, datetime
+
+import pytest
+
+from optimise.utils.dates import (
+    DateParseError,
+    convert_units,
+    date_from_string,
+    datetime_to_integer,
+    integer_to_datetime,
+    parse_datetime,
+    parse_field,
+)
 
 
 def test_convert_units_minutes_to_seconds():
@@ -20,3 +32,21 @@ def test_datetime_integer_roundtrip_seconds():
     )
     assert dt.hour == 10
     assert dt.minute == 30
+
+
+def test_date_parsing_fast_path_matches_strptime():
+    assert parse_datetime("2024-03-04", "%Y-%m-%d") == datetime(2024, 3, 4)
+    assert parse_datetime("2024-03-04 08:30:00", "%Y-%m-%d %H:%M:%S") == datetime(2024, 3, 4, 8, 30)
+    assert parse_datetime("08:30", "%H:%M") == datetime.strptime("08:30", "%H:%M")
+    assert parse_datetime("2024-3-4", "%Y-%m-%d") == datetime(2024, 3, 4)
+    with pytest.raises(ValueError):
+        parse_datetime("2024-13-04", "%Y-%m-%d")
+    assert date_from_string("2024-03-04 08:30:00", "%Y-%m-%d") == datetime(2024, 3, 4, 8, 30)
+    assert date_from_string("03/04/2024", "%d/%m/%Y", return_datetime=False) == date(2024, 4, 3)
+
+
+def test_invalid_field_is_named():
+    with pytest.raises(DateParseError) as error:
+        parse_field("not a date", "shift_date", "%Y-%m-%d")
+    assert error.value.field == "shift_date"
+    assert "shift_date" in str(error.value)
@@ -0,0 +1,78 @@
+import copy
+from collections import Counter
+
+from optimise.routing.adapter.day_assignment import assign_orders_to_days
+from optimise.routing.data_model import get_optimisation_instances
+from optimise.routing.preprocessing.preprocess_request import preprocess_request
+from optimise.routing.solver import ortools_runner
+
+from test_routing_solvers_refactored import _load_payload
+
+
+def _three_day_payload(priorities=(3, 3, 3, 3, 3, 3)):
+    # one worker with 8h30 of net shift time, six orders of 3h30 open all horizon
+    payload = _load_payload()
+    payload["optimization_horizon"] = 3
+    template = payload["orders"][0]
+    orders = []
+    for i, priority in enumerate(priorities):
+        order = copy.deepcopy(template)
+        order["id"] = f"WO-{i}"
+        order["priority"] = priority
+        order["work_hours"] = 3.5
+        order["latitude"] += 0.001 * i
+        for field in ("latest_end_date", "latest_machine_availability_date"):
+            order[field] = "2024-01-03"
+        orders.append(order)
+    payload["orders"] = orders
+    return payload
+
+
+def _instance(payload):
+    errors = []
+    instances = get_optimisation_instances(preprocess_request(payload, errors))
+    assert errors == []
+    return instances[0]
+
+
+def test_orders_are_spread_within_day_capacity():
+    plan = assign_orders_to_days(_instance(_three_day_payload()))
+    assert sorted(plan.days.values()) == [0, 0, 1, 1, 2, 2]
+    for load, capacity in zip(plan.load, plan.capacity):
+        assert load["electric"] <= capacity["electric"]
+
+
+def test_important_orders_come_first_and_overflow_goes_to_least_loaded_days():
+    plan = assign_orders_to_days(_instance(_three_day_payload(priorities=(5, 5, 5, 5, 1, 1, 5, 5))))
+    assert plan.days["WO-4"] == plan.days["WO-5"] == 0
+    assert len(plan.days) == 8
+    assert max(Counter(plan.days.values()).values()) == 3
+
+
+def test_day_assignment_is_opt_in():
+    instance = _instance(_three_day_payload())
+    assert ortools_runner._plan_days(instance) is None
+    assert instance.day_plan == {}
+
+
+def test_days_are_routed_with_their_planned_orders(monkeypatch):
+    monkeypatch.setattr(ortools_runner, "PARALLEL_DAY_WORKERS", 1)
+    payload = _three_day_payload()
+    payload["day_assignment"] = True
+    instance = _instance(payload)
+    result = ortools_runner.solve_instances([instance])[0]
+    planned = {
+        day: sorted(order_id for order_id, date in instance.day_plan.items() if str(date) == day)
+        for day in result["details"]
+    }
+    routed = {
+        day: sorted(
+            step["node"]["id"]
+            for worker in details["by_worker"]
+            for step in worker["tour_steps"]
+            if step["node"]["id"] in instance.day_plan
+        )
+        for day, details in result["details"].items()
+    }
+    assert routed == planned
+    assert all(len(order_ids) == 2 for order_ids in routed.values())
@@ -0,0 +1,68 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from optimise.routing import distance_matrix, route_geometry
+from optimise.routing.fake_engine import FakeRoutingEngine
+from optimise.utils.haversine_distance import haversine_distance_matrix
+from optimise.utils.routing import client_default, exceptions
+from optimise.utils.routing.routers import ORS, OSRM
+
+COORDS = [[4.35 + i / 100, 50.85 + (i % 3) / 100] for i in range(7)]
+
+
+def _haversine(coords):
+    return np.asarray(haversine_distance_matrix([[lat, lon] for lon, lat in coords]))
+
+
+def test_tiled_matrix_matches_haversine_through_the_osrm_router(monkeypatch):
+    monkeypatch.setattr(distance_matrix, "ENABLE_DISTANCE_MATRIX_CACHE", False)
+    with FakeRoutingEngine(max_matrix_size=9) as engine:
+        router = OSRM(base_url=engine.url)
+        matrix = distance_matrix.get_distance_matrix_batches(
+            COORDS, router, {"max_batch_size": 3, "profile": "driving"}
+        )
+        with pytest.raises(exceptions.RouterApiError):
+            router.matrix(locations=COORDS)
+    assert np.allclose(matrix["distances"], _haversine(COORDS), atol=0.1)
+    assert engine.stats["too_big"] == 1
+
+
+def test_ors_matrix_keeps_source_and_destination_order():
+    with FakeRoutingEngine(speed_kmh=36) as engine:
+        matrix = ORS(api_key="test", base_url=engine.url).matrix(
+            locations=COORDS[:4], profile="driving-car", sources=[2], destinations=[0, 3]
+        )
+    expected = _haversine(COORDS[:4])[2, [0, 3]]
+    assert np.allclose(matrix.distances, [expected], atol=0.1)
+    assert np.allclose(matrix.durations, [expected / 10], atol=0.1)
+
+
+def test_injected_failures_and_rate_limits_reach_the_client(monkeypatch):
+    monkeypatch.setattr(client_default.time, "sleep", lambda seconds: None)
+    with FakeRoutingEngine(error_rate=0.5, seed=3) as engine:
+        router = OSRM(base_url=engine.url)
+        with pytest.warns(UserWarning, match="Server down"):
+            for _ in range(4):
+                router.matrix(locations=COORDS[:3])
+    assert engine.stats["errors"] > 0
+    assert engine.stats["requests"] == 4 + engine.stats["errors"]
+
+    with FakeRoutingEngine(rate_limit=0.01, burst=1) as engine:
+        router = OSRM(base_url=engine.url)
+        router.matrix(locations=COORDS[:3])
+        with pytest.raises(exceptions.OverQueryLimit):
+            router.matrix(locations=COORDS[:3])
+    assert engine.stats["rate_limited"] == 1
+
+
+def test_route_geometry_is_drawn_from_the_engine():
+    route_geometry.clear_leg_cache()
+    with FakeRoutingEngine() as engine:
+        (points,) = asyncio.run(route_geometry.route_geometries([COORDS[:3]], engine.url))
+        direction = OSRM(base_url=engine.url).directions(locations=COORDS[:3], profile="driving")
+    assert np.allclose(points, COORDS[:3])
+    assert np.allclose(direction.geometry, COORDS[:3])
+    assert direction.distance == int(_haversine(COORDS[:3])[0, 1] + _haversine(COORDS[:3])[1, 2])
+    route_geometry.clear_leg_cache()
@@ -0,0 +1,37 @@
+import io
+
+import pytest
+
+from optimise.utils.gazetteer import Gazetteer
+
+GEONAMES = "".join(
+    "\t".join(values) + "\n"
+    for values in (
+        ["BE", "1000", "Bruxelles", "Bruxelles-Capitale", "BRU", "", "", "", "", "50.8466", "4.3528", "4"],
+        ["BE", "1050", "Ixelles", "Bruxelles-Capitale", "BRU", "", "", "", "", "50.8333", "4.3667", "4"],
+        ["BE", "9000", "Gent", "Vlaanderen", "VLG", "", "", "", "", "51.0543", "3.7174", "4"],
+        ["GB", "SW1A", "London", "England", "ENG", "", "", "", "", "51.5010", "-0.1416", "4"],
+    )
+)
+
+
+@pytest.fixture()
+def gazetteer(tmp_path):
+    gazetteer = Gazetteer(str(tmp_path / "gazetteer.sqlite"))
+    assert gazetteer.import_geonames(io.StringIO(GEONAMES)) == 4
+    return gazetteer
+
+
+def test_postcode_lookup_is_normalised(gazetteer):
+    location = gazetteer.lookup({"postalcode": " 1050", "city": "IXELLES", "country": "be"})
+    assert location == {"latitude": 50.8333, "longitude": 4.3667, "geocode_precision": "postcode"}
+
+
+def test_lookup_falls_back_to_prefix_then_locality(gazetteer):
+    london = gazetteer.lookup({"postalcode": "SW1A 1AA", "city": "London", "country": "GB"})
+    assert london["geocode_precision"] == "postcode_prefix"
+    assert london["latitude"] == pytest.approx(51.501)
+
+    ghent = gazetteer.lookup({"postalcode": "", "city": "Gent", "country": "BE"})
+    assert ghent["geocode_precision"] == "locality"
+    assert gazetteer.lookup({"postalcode": "75001", "city": "Paris", "country": "FR"}) is None
@@ -0,0 +1,156 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from diskcache import Cache
+
+from optimise.utils import geocoding
+from optimise.utils.decorators import TokenBucket
+from optimise.utils.gazetteer import Gazetteer
+
+
+def _address(street, city="Brussels"):
+    return {"street": street, "postalcode": "1000", "city": city, "country": "BE"}
+
+
+@pytest.fixture()
+def local_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(geocoding, "GEOLOC_CACHE_BACKEND", "local")
+    monkeypatch.setattr(geocoding, "ENABLE_GEOCODING_CACHE", True)
+    monkeypatch.setattr(geocoding, "_local_cache", Cache(str(tmp_path)))
+    monkeypatch.setattr(geocoding, "_memo", geocoding._Memo(100))
+    monkeypatch.setattr(geocoding, "geocoding_stats", geocoding.GeocodeStats())
+    gazetteer = Gazetteer(str(tmp_path / "gazetteer.sqlite"))
+    monkeypatch.setattr(geocoding, "get_gazetteer", lambda: gazetteer)
+    return geocoding._local_cache
+
+
+def test_token_bucket_allows_bursts_then_the_rate():
+    bucket = TokenBucket(rate=20, capacity=3)
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - started < 0.05
+    for _ in range(2):
+        bucket.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_token_bucket_try_acquire_never_waits():
+    bucket = TokenBucket(rate=0.01, capacity=2)
+    started = time.monotonic()
+    assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+    assert time.monotonic() - started < 0.05
+
+
+def test_token_bucket_is_shared_safely_between_threads():
+    bucket = TokenBucket(rate=50, capacity=1)
+    calls = []
+
+    def worker():
+        for _ in range(5):
+            bucket.acquire()
+            calls.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    calls.sort()
+    assert len(calls) == 20
+    assert calls[-1] - calls[0] >= 19 / 50 * 0.9
+
+
+def test_providers_have_their_own_rate_limit(monkeypatch):
+    monkeypatch.setattr(geocoding, "_buckets", {})
+    nominatim = geocoding._provider_bucket("nominatim")
+    assert (nominatim.rate, nominatim.capacity) == (1.0, 1.0)
+    assert geocoding._provider_bucket("google").rate == geocoding.RATE_LIMIT
+    assert geocoding._provider_workers("nominatim", 8) == 1
+    assert geocoding._provider_workers("google", 8) == min(8, geocoding.RATE_LIMIT)
+
+
+def test_geocode_many_deduplicates_and_caches(local_cache, monkeypatch):
+    looked_up = []
+    lock = threading.Lock()
+
+    def fake_geocode(address_dict, default_service="nominatim"):
+        with lock:
+            looked_up.append(address_dict["street"])
+        if address_dict["street"] == "Nowhere 1":
+            return None, geocoding.NOT_FOUND
+        return SimpleNamespace(latitude=50.0 + len(address_dict["street"]) / 100, longitude=4.0), None
+
+    monkeypatch.setattr(geocoding, "_geocode", fake_geocode)
+    addresses = [
+        _address("Rue Neuve 1"),
+        _address("rue  neuve 1"),
+        _address("Avenue Louise 10"),
+        _address("Nowhere 1"),
+    ]
+    locations = geocoding.geocode_many(addresses, max_workers=4)
+
+    assert sorted(looked_up) == ["Avenue Louise 10", "Nowhere 1", "Rue Neuve 1"]
+    assert locations[0] == locations[1] == {"latitude": 50.11, "longitude": 4.0, "geocode_precision": "address"}
+    assert locations[3] == {"latitude": "", "longitude": ""}
+    assert local_cache.get(geocoding.address_str(addresses[2])) == {"latitude": 50.16, "longitude": 4.0}
+
+    looked_up.clear()
+    assert geocoding.geocode_many(addresses[:3]) == locations[:3]
+    assert looked_up == []
+
+
+def test_failures_are_remembered_with_their_reason(local_cache, monkeypatch):
+    outcomes = {"Nowhere 1": (None, geocoding.NOT_FOUND), "Busy 1": (None, geocoding.PROVIDER_ERROR)}
+    calls = []
+
+    def fake_geocode(address_dict, default_service="nominatim"):
+        calls.append(address_dict["street"])
+        return outcomes[address_dict["street"]]
+
+    monkeypatch.setattr(geocoding, "_geocode", fake_geocode)
+    addresses = [_address("Nowhere 1"), _address("Busy 1")]
+    geocoding.geocode_many(addresses)
+    geocoding.geocode_many(addresses)
+    assert sorted(calls) == ["Busy 1", "Nowhere 1"]
+
+    key = geocoding.address_str(addresses[0])
+    reason, expires_at = local_cache.get("negative:" + key, expire_time=True)
+    assert reason == geocoding.NOT_FOUND
+    assert expires_at - time.time() > geocoding.GEOCODE_ERROR_TTL_SECONDS
+
+    # a new process only has the persistent store
+    monkeypatch.setattr(geocoding, "_memo", geocoding._Memo(100))
+    assert geocoding.geocode_many(addresses[:1]) == [{"latitude": "", "longitude": ""}]
+    assert geocoding.geocoding_stats.snapshot() == {
+        "memory_hits": 0,
+        "store_hits": 0,
+        "negative_hits": 3,
+        "misses": 2,
+        "gazetteer_hits": 0,
+    }
+
+
+def test_gazetteer_answers_when_providers_fail(local_cache, monkeypatch):
+    geocoding.get_gazetteer().import_rows(
+        [
+            {"country": "BE", "postal_code": "1000", "locality": "Bruxelles", "latitude": 50.84, "longitude": 4.35},
+            {"country": "BE", "postal_code": "1000", "locality": "Brussels", "latitude": 50.85, "longitude": 4.36},
+        ]
+    )
+    calls = []
+
+    def fake_geocode(address_dict, default_service="nominatim"):
+        calls.append(address_dict["street"])
+        return None, geocoding.PROVIDER_ERROR
+
+    monkeypatch.setattr(geocoding, "_geocode", fake_geocode)
+    fallback = geocoding.geocode_many([_address("Rue Neuve 1")])
+    assert fallback == [{"latitude": 50.85, "longitude": 4.36, "geocode_precision": "postcode"}]
+
+    primary = geocoding.geocode_many([_address("Rue Haute 2"), _address("Main St 3", city="Nowhere")], "gazetteer")
+    assert calls == ["Rue Neuve 1"]
+    assert primary[0]["geocode_precision"] == "postcode"
+    assert primary[1]["latitude"] == 50.845
@@ -0,0 +1,90 @@
+import copy
+from dataclasses import replace
+from datetime import datetime
+from types import SimpleNamespace
+
+from optimise.routing.data_model import get_optimisation_instances
+from optimise.routing.preprocessing.preprocess_request import preprocess_request
+from optimise.routing.solver import ortools_runner
+from optimise.routing.solver.ortools_runner import independent_day_groups
+
+from test_routing_solvers_refactored import _load_payload
+
+
+def _order(first_day, last_day, scheduled=False):
+    return SimpleNamespace(
+        earliest_start=datetime(2024, 1, first_day, 8),
+        latest_end=datetime(2024, 1, last_day, 17),
+        is_scheduled=scheduled,
+    )
+
+
+def test_days_are_grouped_by_orders_spanning_them():
+    instance = SimpleNamespace(
+        period_start=datetime(2024, 1, 1, 8),
+        optimization_horizon=6,
+        _work_orders=[
+            _order(1, 1),
+            _order(2, 3),
+            _order(3, 4),
+            _order(5, 6, scheduled=True),
+            _order(6, 9),
+        ],
+    )
+    assert independent_day_groups(instance) == [[0], [1, 2, 3], [4], [5]]
+
+
+def _fixed_date_payload():
+    payload = _load_payload()
+    payload["optimization_horizon"] = 3
+    orders = []
+    for day in range(3):
+        for order in payload["orders"]:
+            order = copy.deepcopy(order)
+            order["id"] = f"{order['id']}-{day}"
+            order["earliest_start_date"] = order["latest_end_date"] = f"2024-01-0{day + 1}"
+            orders.append(order)
+    payload["orders"] = orders
+    return payload
+
+
+def _solve(monkeypatch, workers):
+    monkeypatch.setattr(ortools_runner, "PARALLEL_DAY_WORKERS", workers)
+    monkeypatch.setattr(ortools_runner, "_day_pool", None)
+    monkeypatch.setenv("TEST_ENVIRONMENT", "1")
+    errors = []
+    instances = get_optimisation_instances(preprocess_request(_fixed_date_payload(), errors))
+    results = ortools_runner.solve_instances(instances)[0]
+    return {
+        day: [[step["node"]["id"] for step in worker["tour_steps"]] for worker in details["by_worker"]]
+        for day, details in results["details"].items()
+    }
+
+
+def test_parallel_day_groups_match_serial_solve(monkeypatch):
+    serial = _solve(monkeypatch, 1)
+    parallel = _solve(monkeypatch, 3)
+    assert list(parallel) == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert parallel == serial
+
+
+def test_parallel_days_share_one_pool_and_the_search_workers(monkeypatch):
+    profiles = []
+    solve_packed = ortools_runner.solve_packed
+
+    def spy(packed, profile=None):
+        profiles.append(profile)
+        return solve_packed(packed, replace(profile, search_workers=None))
+
+    monkeypatch.setattr(ortools_runner, "solve_packed", spy)
+    monkeypatch.setattr(ortools_runner, "SEARCH_WORKERS", 6)
+    first = _solve(monkeypatch, 3)
+    pool = ortools_runner._day_pool
+    errors = []
+    instances = get_optimisation_instances(preprocess_request(_fixed_date_payload(), errors))
+    ortools_runner.solve_instances(instances)
+
+    assert ortools_runner._day_pool is pool
+    assert len(profiles) == 2 * len(first)
+    # three days searched at once share the six search workers
+    assert {profile.search_workers for profile in profiles} == {2}
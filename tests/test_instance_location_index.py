@@ -0,0 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import patch
+
+from optimise.routing.model.instance import Instance
+from optimise.routing.model.location_index import LocationIndex
+
+
+def _fake_matrices(coordinates, sources=None, destinations=None):
+    sources = range(len(coordinates)) if sources is None else sources
+    destinations = range(len(coordinates)) if destinations is None else destinations
+    matrix = [[abs(i - j) for j in destinations] for i in sources]
+    return matrix, matrix, matrix
+
+
+def test_location_index_fetches_only_unknown_coordinates():
+    index = LocationIndex()
+    calls = []
+
+    def fetch(coordinates, sources, destinations):
+        calls.append((list(coordinates), list(sources), list(destinations)))
+        return _fake_matrices(coordinates, sources, destinations)
+
+    index.extend([(0.0, 0.0), (0.0, 1.0)], fetch)
+    index.extend([(0.0, 1.0)], fetch)
+    assert calls == [([(0.0, 0.0), (0.0, 1.0)], [0, 1], [0, 1])]
+
+    index.extend([(0.0, 2.0), (0.0, 3.0)], fetch)
+    # the new rows against every coordinate, then the known rows against the new columns
+    assert [(sources, destinations) for _coordinates, sources, destinations in calls[1:]] == [
+        ([2, 3], [0, 1, 2, 3]),
+        ([0, 1], [2, 3]),
+    ]
+
+    time_matrix, _, _ = index.submatrices([(0.0, 3.0), (0.0, 0.0), (0.0, 1.0)])
+    assert time_matrix == [[0, 3, 2], [3, 0, 1], [2, 1, 0]]
+
+
+def _worker():
+    worker = type("Worker", (), {})()
+    worker.is_working = True
+    worker.depot = {"id": "d1", "address": "Depot", "latitude": 0.0, "longitude": 0.0}
+    worker.id = "w1"
+    worker.init_worker = lambda: None
+    return worker
+
+
+class WorkOrderStub:
+    def __init__(self, address, longitude):
+        self.address = address
+        self.latitude = 0.0
+        self.longitude = longitude
+        self.work_order_duration = 10
+        self.priority = 1
+        self.soft_time_window_penalty = 0
+        self.is_eligible = True
+        self.is_scheduled = False
+
+    def get_time_constraint(self):
+        return (0, 86400)
+
+    def get_preferred_time_constraint(self):
+        return None
+
+
+def test_init_instance_reuses_matrix_across_days():
+    instance = Instance(
+        period_start=datetime(2024, 1, 1),
+        optimization_horizon=2,
+        distance_matrix_method="osm",
+    )
+    instance.add_worker(_worker())
+    first = WorkOrderStub("A", 0.01)
+    second = WorkOrderStub("B", 0.02)
+    instance.add_workorder(first)
+    instance.add_workorder(second)
+
+    def fake_fetch(coords, sources=None, destinations=None):
+        time_matrix, distance_matrix, _ = _fake_matrices(coords, sources, destinations)
+        return {"durations": time_matrix, "distances": distance_matrix}
+
+    with patch(
+        "optimise.routing.model.instance.get_distance_matrix_with_retry",
+        side_effect=fake_fetch,
+    ) as fetch:
+        instance.init_instance(datetime(2024, 1, 1))
+        assert instance.starts == [0]
+        assert instance.ends == [0]
+        assert len(instance.time_matrix) == 3
+
+        first.is_eligible = False
+        first.is_scheduled = True
+        instance.init_instance(datetime(2024, 1, 2))
+
+    assert fetch.call_count == 1
+    assert instance.service_durations == [0, second.work_order_duration]
+    assert instance.time_matrix == [[0, 2], [2, 0]]
+
+
+def test_prefetch_fetches_next_days_in_background():
+    instance = Instance(
+        period_start=datetime(2024, 1, 1),
+        optimization_horizon=2,
+        distance_matrix_method="osm",
+    )
+    instance.add_worker(_worker())
+    today = WorkOrderStub("A", 0.01)
+    today.latest_end = datetime(2024, 1, 1, 18)
+    tomorrow = WorkOrderStub("B", 0.02)
+    tomorrow.latest_end = datetime(2024, 1, 2, 18)
+    tomorrow.is_eligible = False
+    instance.add_workorder(today)
+    instance.add_workorder(tomorrow)
+
+    fetched = []
+
+    def fake_fetch(coords, sources=None, destinations=None):
+        fetched.append((len(sources), len(destinations)))
+        time_matrix, distance_matrix, _ = _fake_matrices(coords, sources, destinations)
+        return {"durations": time_matrix, "distances": distance_matrix}
+
+    with patch(
+        "optimise.routing.model.instance.get_distance_matrix_with_retry",
+        side_effect=fake_fetch,
+    ), ThreadPoolExecutor(max_workers=1) as executor:
+        instance.init_instance(datetime(2024, 1, 1), prefetch_pending=False)
+        assert fetched == [(2, 2)]
+        future = instance.prefetch_locations(datetime(2024, 1, 2), executor)
+        future.result()
+        assert fetched == [(2, 2), (1, 3), (2, 1)]
+
+        today.is_eligible = False
+        today.is_scheduled = True
+        tomorrow.is_eligible = True
+        instance.init_instance(datetime(2024, 1, 2), prefetch_pending=False)
+
+    assert fetched == [(2, 2), (1, 3), (2, 1)]
+    assert instance.time_matrix == [[0, 2], [2, 0]]
@@ -0,0 +1,74 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from optimise.routing import distance_matrix
+from optimise.utils.routing.matrix import parse_matrix_body, read_number_grid
+from optimise.utils.routing.routers import OSRM
+
+BODY = (
+    b'{"code": "Ok", "sources": [{"name": "durations"}],'
+    b' "durations": [[0, 1.5],\n [null, -2e1]], "distances": [[0, 10], [20, 0]]}'
+)
+
+
+def test_number_grids_are_read_from_the_bytes():
+    durations = read_number_grid(BODY, "durations")
+    assert durations.shape == (2, 2)
+    assert np.isnan(durations[1, 0])
+    assert durations[1, 1] == -20.0
+    assert read_number_grid(BODY, "distances").tolist() == [[0.0, 10.0], [20.0, 0.0]]
+    assert read_number_grid(BODY, "times") is None
+
+
+def test_unexpected_layouts_fall_back_to_a_full_decode():
+    with pytest.raises(ValueError):
+        read_number_grid(b'{"durations": [[1, 2, 3], [4, 5]]}', "durations")
+    matrix = parse_matrix_body(b'{"durations": [[1, 2, 3], [4, 5]], "distances": null}', "durations", "distances")
+    assert matrix.durations == [[1, 2, 3], [4, 5]]
+    assert matrix.distances is None
+    assert matrix.raw is None
+
+
+class _Session:
+    def __init__(self, body):
+        self.body = body
+
+    def get(self, url, **kwargs):
+        return SimpleNamespace(
+            status_code=200,
+            headers={"content-type": "application/json"},
+            content=self.body,
+            json=lambda: json.loads(self.body),
+            request=None,
+        )
+
+
+def test_osrm_matrix_keeps_raw_only_on_request():
+    router = OSRM(base_url="http://osrm.test", session=_Session(BODY))
+    kept = router.matrix(locations=[[4.35, 50.85], [4.36, 50.86]])
+    assert kept.raw["code"] == "Ok"
+    assert kept.durations[1][0] is None
+
+    lean = router.matrix(locations=[[4.35, 50.85], [4.36, 50.86]], keep_raw=False)
+    assert lean.raw is None
+    assert isinstance(lean.durations, np.ndarray)
+    assert lean.distances.tolist() == [[0.0, 10.0], [20.0, 0.0]]
+
+
+def test_tiles_are_placed_at_their_offset(monkeypatch):
+    monkeypatch.setattr(distance_matrix, "ENABLE_DISTANCE_MATRIX_CACHE", False)
+
+    class Router:
+        def matrix(self, locations, sources, destinations, profile, keep_raw):
+            assert keep_raw is False
+            tile = np.array([[10.0 * s + d for d in destinations] for s in sources])
+            return SimpleNamespace(durations=tile, distances=tile * 2)
+
+    coords = [[4.0 + i / 100, 50.0] for i in range(5)]
+    matrix = distance_matrix.get_distance_matrix_batches(coords, Router(), {"max_batch_size": 2, "profile": "car"})
+    expected = np.array([[10.0 * s + d for d in range(5)] for s in range(5)])
+    assert np.array_equal(matrix["durations"], expected)
+    assert np.array_equal(matrix["distances"], expected * 2)
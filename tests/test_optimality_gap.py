@@ -0,0 +1,72 @@
+from dataclasses import replace
+
+from optimise.routing.config.solve_profile import SolveProfile
+from optimise.routing.input.solver_input import SolverInput
+from optimise.routing.solver.lower_bound import arc_cost_lower_bound, optimality_gap
+from optimise.routing.solver.ortools_builder import OrtoolsSolver
+
+
+def _solver_input():
+    return SolverInput(
+        time_matrix=[[0, 10, 7], [10, 0, 4], [7, 4, 0]],
+        distance_matrix=[[0, 5, 3], [5, 0, 2], [3, 2, 0]],
+        time_windows=[(0, 100), (0, 100), (0, 100)],
+        service_durations=[0, 5, 5],
+        num_vehicles=1,
+        starts=[0],
+        ends=[0],
+        max_working_time=100,
+        allow_slack=10,
+        horizon=100,
+        penalties=[1000, 1000],
+        num_depots=1,
+        time_limit_seconds=1,
+        first_solution_strategy="PATH_CHEAPEST_ARC",
+        local_search_metaheuristic="GREEDY_DESCENT",
+    )
+
+
+def test_lower_bound_uses_cheapest_arcs_and_penalties():
+    solver_input = _solver_input()
+    assert arc_cost_lower_bound(solver_input) == 18
+    assert arc_cost_lower_bound(replace(solver_input, penalties=[5, 5])) == 10
+
+
+def test_lower_bound_never_exceeds_objective():
+    solver_input = _solver_input()
+    solver = OrtoolsSolver()
+    assignment, _routing, _manager = solver.solve(
+        solver_input, SolveProfile.from_solver_input(solver_input)
+    )
+    assert assignment is not None
+    assert solver.lower_bound <= assignment.ObjectiveValue()
+
+
+def test_lower_bound_counts_the_fixed_vehicle_cost():
+    solver_input = replace(_solver_input(), minimize_vehicles=True, vehicle_penalty=20000)
+    assert arc_cost_lower_bound(solver_input) == 2000
+    assert arc_cost_lower_bound(replace(solver_input, penalties=[50000, 50000])) == 20018
+
+    solver_input = replace(solver_input, vehicle_penalty=500)
+    solver = OrtoolsSolver()
+    assignment, _routing, _manager = solver.solve(
+        solver_input, SolveProfile.from_solver_input(solver_input)
+    )
+    assert assignment is not None
+    assert solver.lower_bound == 518
+    assert solver.lower_bound <= assignment.ObjectiveValue()
+
+
+def test_gap_target_stops_search_with_a_solution():
+    solver_input = replace(_solver_input(), optimality_gap=1.0)
+    profile = SolveProfile.from_solver_input(solver_input)
+    assert profile.optimality_gap == 1.0
+
+    assignment, _routing, _manager = OrtoolsSolver().solve(solver_input, profile)
+    assert assignment is not None
+
+
+def test_optimality_gap_helper():
+    assert optimality_gap(None, 10) is None
+    assert optimality_gap(100, 90) == 0.1
+    assert optimality_gap(0, 0) == 0.0
@@ -53,3 +53,15 @@ def test_preprocess_defaults_applied():
 
     assert instance.allow_slack == expected_allow_slack
     assert instance.time_limit == expected_time_limit
+
+
+def test_preprocess_reports_invalid_dates_by_field():
+    payload = _load_offline_request()
+    payload["orders"][0]["latest_end_date"] = "2024-02-30"
+    order_count = len(payload["orders"])
+    errors = []
+    request = preprocess_request(payload, errors)
+
+    assert len(errors) == 1
+    assert "latest_end_date" in errors[0]
+    assert len(request["orders"]) == order_count - 1
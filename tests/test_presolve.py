@@ -0,0 +1,89 @@
+from dataclasses import replace
+
+from optimise.routing.adapter.colocation import merge_colocated_nodes
+from optimise.routing.adapter.presolve import (
+    CYCLIC_DEPENDENCY,
+    DEPENDS_ON_DROPPED_TASK,
+    NO_ELIGIBLE_WORKER,
+    UNREACHABLE_IN_SHIFT,
+    WINDOW_SHORTER_THAN_SERVICE,
+    presolve_solver_input,
+)
+from optimise.routing.input.solver_input import SolverInput
+from optimise.routing.solver.ortools_runner import _expand_solution, _solve
+
+
+def _solver_input(**overrides):
+    size = 5
+    time_matrix = [[0 if i == j else 10 for j in range(size)] for i in range(size)]
+    solver_input = SolverInput(
+        time_matrix=time_matrix,
+        distance_matrix=time_matrix,
+        time_windows=[(0, 1000)] * size,
+        service_durations=[0, 20, 20, 20, 20],
+        num_vehicles=2,
+        starts=[0, 0],
+        ends=[0, 0],
+        allow_slack=1000,
+        horizon=1000,
+        penalties=[1000] * 4,
+        num_depots=1,
+        time_limit_seconds=1,
+        first_solution_strategy="PATH_CHEAPEST_ARC",
+    )
+    return replace(solver_input, **overrides)
+
+
+def test_presolve_keeps_feasible_problem_intact():
+    result = presolve_solver_input(_solver_input())
+    assert result.dropped == []
+    assert result.kept_nodes == [0, 1, 2, 3, 4]
+    # arrival from the depot takes 10, returning takes another 10 after service
+    assert result.solver_input.time_windows[1] == (10, 990)
+
+
+def test_presolve_drops_infeasible_orders_with_reason():
+    windows = [(0, 1000), (100, 110), (0, 25), (0, 1000), (0, 1000)]
+    solver_input = _solver_input(
+        time_windows=windows,
+        allowed_vehicles_by_node={3: [7]},
+    )
+    result = presolve_solver_input(solver_input)
+    reasons = {item.node: item.reason for item in result.dropped}
+    assert reasons == {
+        1: WINDOW_SHORTER_THAN_SERVICE,
+        2: UNREACHABLE_IN_SHIFT,
+        3: NO_ELIGIBLE_WORKER,
+    }
+    assert result.kept_nodes == [0, 4]
+    pruned = result.solver_input
+    assert len(pruned.time_matrix) == 2
+    assert pruned.penalties == [1000]
+    assert pruned.service_durations == [0, 20]
+
+
+def test_presolve_drops_dependency_cycles_and_linked_orders():
+    solver_input = _solver_input(precedence_constraints=[(1, 2), (2, 1), (2, 3)])
+    result = presolve_solver_input(solver_input)
+    reasons = {item.node: item.reason for item in result.dropped}
+    assert reasons[1] == CYCLIC_DEPENDENCY
+    assert reasons[2] == CYCLIC_DEPENDENCY
+    assert reasons[3] == DEPENDS_ON_DROPPED_TASK
+    assert result.solver_input.precedence_constraints == []
+
+
+def test_dropped_penalties_join_objective_and_lower_bound():
+    solver_input = _solver_input(
+        time_windows=[(0, 1000), (100, 110), (0, 1000), (0, 1000), (0, 1000)],
+        num_depots=None,
+    )
+    presolved = presolve_solver_input(solver_input)
+    merged = merge_colocated_nodes(presolved.solver_input)
+    packed = _solve(merged.solver_input)
+    assert presolved.dropped_penalty(solver_input) == 1000
+
+    expanded = _expand_solution(solver_input, presolved, merged, packed)
+    assert expanded.objective_value == packed.objective_value + 1000
+    assert expanded.lower_bound == packed.lower_bound + 1000
+    assert expanded.lower_bound <= expanded.objective_value
+    assert all(objective >= expanded.lower_bound for objective, _tours in expanded.alternatives)
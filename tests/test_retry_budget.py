@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+
+from optimise.routing import distance_matrix
+from optimise.utils import geocoding
+from optimise.utils.retry_budget import (
+    UNLIMITED,
+    DeadlineExceeded,
+    RetryBudget,
+    budget_scope,
+    current_budget,
+)
+from optimise.utils.routing import client_default, exceptions
+from optimise.utils.routing.routers import OSRM
+
+
+def test_budget_cuts_timeouts_and_caps_retries():
+    budget = RetryBudget(seconds=30, max_retries=2, min_attempt_seconds=1)
+    assert budget.attempt_timeout(60) <= 30
+    assert budget.attempt_timeout(5) == 5
+    assert budget.retry() and budget.retry()
+    assert not budget.retry()
+    assert not RetryBudget(seconds=30, max_retries=None).retry(delay=29.5)
+
+    spent = RetryBudget(seconds=0.5, min_attempt_seconds=1)
+    assert spent.expired()
+    with pytest.raises(DeadlineExceeded):
+        spent.attempt_timeout(10)
+
+
+def test_budget_scope_is_restored():
+    budget = RetryBudget(seconds=10)
+    with budget_scope(budget):
+        assert current_budget() is budget
+    assert current_budget() is UNLIMITED
+
+
+class _Unavailable:
+    def __init__(self):
+        self.timeouts = []
+
+    def get(self, url, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        return SimpleNamespace(status_code=503, headers={}, request=None)
+
+
+def test_client_retries_stop_when_the_budget_is_spent(monkeypatch):
+    monkeypatch.setattr(client_default.time, "sleep", lambda seconds: None)
+    session = _Unavailable()
+    router = OSRM(base_url="http://osrm.test", session=session)
+    with budget_scope(RetryBudget(seconds=20, max_retries=2)):
+        with pytest.warns(UserWarning), pytest.raises(exceptions.Timeout):
+            router.matrix(locations=[[4.35, 50.85], [4.36, 50.86]])
+    assert len(session.timeouts) == 3
+    assert all(timeout <= 20 for timeout in session.timeouts)
+
+
+def test_matrix_fetch_fails_fast_once_the_deadline_is_gone(monkeypatch):
+    monkeypatch.setattr(distance_matrix, "initialize_router", lambda *args: pytest.fail("router called"))
+    with budget_scope(RetryBudget(seconds=0)):
+        with pytest.raises(DeadlineExceeded):
+            distance_matrix.get_distance_matrix_with_retry([[4.35, 50.85], [4.36, 50.86]], router_name="osrm")
+
+
+def test_geocoding_skips_providers_without_remembering_the_failure(monkeypatch):
+    monkeypatch.setattr(geocoding, "ENABLE_GEOCODING_CACHE", False)
+    monkeypatch.setattr(geocoding, "GAZETTEER_MODE", "off")
+    provider = SimpleNamespace(geocode=lambda *args, **kwargs: pytest.fail("provider called"))
+    monkeypatch.setattr(geocoding, "geoloc_nominatim", provider)
+    address = {"street": "Rue Neuve 1", "postalcode": "1000", "city": "Brussels", "country": "BE"}
+
+    with budget_scope(RetryBudget(seconds=0)):
+        assert geocoding._geocode(address) == (None, geocoding.DEADLINE)
+        assert geocoding.geocode_many([address, dict(address, street="Rue Haute 2")]) == [
+            {"latitude": "", "longitude": ""},
+            {"latitude": "", "longitude": ""},
+        ]
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+from optimise.routing import route_geometry
+from optimise.utils.routing.client_async import AsyncClient
+from optimise.utils.routing.routers import OSRM
+from optimise.utils.routing.utils import decode_polyline5, encode_polyline
+
+
+@pytest.fixture(autouse=True)
+def _empty_leg_cache():
+    route_geometry.clear_leg_cache()
+    yield
+    route_geometry.clear_leg_cache()
+
+
+def test_polyline_encoding_matches_the_reference_encoder():
+    points = [(-120.2, 38.5), (-120.95, 40.7), (-126.453, 43.252)]
+    assert encode_polyline(points) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    assert decode_polyline5(encode_polyline(points)) == points
+    assert encode_polyline([(38.5, -120.2)], order="latlng") == "_p~iF~ps|U"
+
+
+def test_simplify_drops_points_within_the_tolerance():
+    # a straight street with a 1 m wobble, then a right-angle turn
+    line = np.array([[4.35, 50.85], [4.351, 50.85001], [4.352, 50.85], [4.352, 50.851]])
+    assert route_geometry.simplify(line, 0).tolist() == line.tolist()
+    assert route_geometry.simplify(line, 5).tolist() == [[4.35, 50.85], [4.352, 50.85], [4.352, 50.851]]
+
+
+def _engine(requests, down=()):
+    def handler(request):
+        coords = request.url.path.rsplit("/", 1)[-1]
+        requests.append(coords)
+        if coords in down:
+            return httpx.Response(400, json={"code": "NoRoute"})
+        start, end = ([float(v) for v in pair.split(",")] for pair in coords.split(";"))
+        middle = [round((start[0] + end[0]) / 2, 6), start[1]]
+        geometry = {"type": "LineString", "coordinates": [start, middle, end]}
+        return httpx.Response(
+            200, json={"code": "Ok", "routes": [{"geometry": geometry, "duration": 60, "distance": 500}]}
+        )
+
+    return handler
+
+
+def _route_geometries(monkeypatch, routes, requests, down=()):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_engine(requests, down))) as http:
+            router = OSRM(base_url="http://osrm.test")
+            router.async_client = AsyncClient.from_client(router.client, http=http)
+            monkeypatch.setattr(route_geometry, "get_router", lambda name, base_url=None: router)
+            return await route_geometry.route_geometries(routes, "http://osrm.test")
+
+    return asyncio.run(run())
+
+
+def test_shared_legs_are_fetched_once_and_cached(monkeypatch):
+    depot, a, b = [4.35, 50.85], [4.37, 50.86], [4.39, 50.87]
+    requests = []
+    first, second = _route_geometries(monkeypatch, [[depot, a, depot], [depot, a, b]], requests)
+    assert len(requests) == 3
+    assert first.tolist() == [depot, [4.36, 50.85], a, [4.36, 50.86], depot]
+    assert second[-1].tolist() == b
+
+    again = _route_geometries(monkeypatch, [[depot, a, b]], requests)
+    assert len(requests) == 3
+    assert again[0].tolist() == second.tolist()
+
+
+def test_routes_with_an_unroutable_leg_have_no_geometry(monkeypatch):
+    depot, a, b = [4.35, 50.85], [4.37, 50.86], [4.39, 50.87]
+    requests = []
+    down = {"4.37,50.86;4.39,50.87"}
+    full, broken, single = _route_geometries(monkeypatch, [[depot, a], [depot, a, b], [depot]], requests, down)
+    assert full is not None
+    assert broken is None
+    assert single is None
+
+    _route_geometries(monkeypatch, [[a, b]], requests, down)
+    assert requests.count("4.37,50.86;4.39,50.87") == 2
@@ -0,0 +1,116 @@
+import logging
+from dataclasses import replace
+
+from diskcache import Cache
+
+from optimise.routing.core.route_templates import (
+    RouteTemplate,
+    RouteTemplateStore,
+    order_similarity,
+    seed_routes,
+)
+from optimise.routing.data_model import get_optimisation_instances
+from optimise.routing.preprocessing.preprocess_request import preprocess_request
+from optimise.routing.config.solve_profile import SolveProfile
+from optimise.routing.input.solver_input import SolverInput
+from optimise.routing.solver import ortools_builder, ortools_runner
+
+from test_routing_solvers_refactored import _load_payload
+
+
+def test_order_similarity_counts_repeated_orders():
+    assert order_similarity(["a", "b", "c"], ["a", "b", "c"]) == 1.0
+    assert order_similarity(["a", "a", "b"], ["a", "b"]) == 2 / 3
+    assert order_similarity(["a", "b", "c", "d"], ["a", "b", "c", "e"]) == 3 / 5
+
+
+def test_store_keeps_the_cheapest_template_of_the_same_orders(tmp_path):
+    store = RouteTemplateStore(cache=Cache(str(tmp_path)))
+    template = RouteTemplate("fleet", ["a", "b"], {"W-1": ["a", "b"]}, objective_value=100)
+    assert store.record(template)
+    assert not store.record(RouteTemplate("fleet", ["b", "a"], {"W-1": ["b", "a"]}, objective_value=120))
+    assert store.match("fleet", ["a", "b"]) == template
+    assert store.match("fleet", ["a", "c"]) is None
+    assert store.match("other", ["a", "b"]) is None
+    assert store.record(RouteTemplate("fleet", ["a", "c"], {"W-1": ["c", "a"]}, objective_value=150))
+    assert store.match("fleet", ["a", "c"]).routes == {"W-1": ["c", "a"]}
+
+
+def test_seed_routes_skip_orders_that_are_gone():
+    template = RouteTemplate("fleet", [], {"W-1": ["a", "x", "b"], "W-2": ["a", "c"]})
+    routes = seed_routes(template, ["W-2", "W-1", "W-3"], {"a": [3, 4], "b": [5], "d": [6]})
+    assert routes == [[3], [4, 5], []]
+
+
+def test_solved_plan_seeds_the_next_one(tmp_path, monkeypatch):
+    store = RouteTemplateStore(cache=Cache(str(tmp_path)))
+    monkeypatch.setattr(ortools_runner, "get_route_template_store", lambda: store)
+    seeded = []
+    seed = ortools_runner._seed_from_template
+
+    def spy(*args):
+        solver_input = seed(*args)
+        seeded.append(solver_input.initial_routes)
+        return solver_input
+
+    monkeypatch.setattr(ortools_runner, "_seed_from_template", spy)
+
+    results = []
+    for _ in range(2):
+        payload = _load_payload()
+        payload["route_templates"] = True
+        errors = []
+        instances = get_optimisation_instances(preprocess_request(payload, errors))
+        results.append(ortools_runner.solve_instances(instances)[0])
+
+    assert seeded[0] == []
+    assert sorted(node for route in seeded[1] for node in route) == [1, 2]
+    day = results[0]["details"]["2024-01-01"]
+    assert results[1]["details"]["2024-01-01"]["objective_value"] == day["objective_value"]
+    assert results[1]["dropped"] == results[0]["dropped"]
+
+
+def _seeded_solve(monkeypatch, initial_routes, time_windows):
+    solver_input = SolverInput(
+        time_matrix=[[0, 10, 7], [10, 0, 4], [7, 4, 0]],
+        distance_matrix=[[0, 5, 3], [5, 0, 2], [3, 2, 0]],
+        time_windows=time_windows,
+        service_durations=[0, 5, 5],
+        num_vehicles=1,
+        starts=[0],
+        ends=[0],
+        allow_slack=10,
+        horizon=100,
+        penalties=[1000, 1000],
+        num_depots=1,
+        first_solution_strategy="PATH_CHEAPEST_ARC",
+        initial_routes=initial_routes,
+    )
+    parameters = []
+    default_parameters = ortools_builder.pywrapcp.DefaultRoutingSearchParameters
+
+    def spy():
+        parameters.append(default_parameters())
+        return parameters[-1]
+
+    monkeypatch.setattr(ortools_builder.pywrapcp, "DefaultRoutingSearchParameters", spy)
+    profile = replace(SolveProfile.from_solver_input(solver_input), time_limit_seconds=8)
+    assignment, _routing, _manager = ortools_builder.OrtoolsSolver().solve(solver_input, profile)
+    return assignment, parameters[-1].time_limit.seconds
+
+
+def test_accepted_template_shortens_the_search(monkeypatch, caplog):
+    with caplog.at_level(logging.WARNING, logger="app"):
+        assignment, seconds = _seeded_solve(monkeypatch, [[1, 2]], [(0, 100)] * 3)
+    assert assignment is not None
+    assert seconds == 2
+    assert not caplog.records
+
+
+def test_stale_template_keeps_the_full_budget(monkeypatch, caplog):
+    # node 2 can no longer be served after node 1
+    with caplog.at_level(logging.WARNING, logger="app"):
+        assignment, seconds = _seeded_solve(monkeypatch, [[1, 2]], [(0, 100), (0, 20), (0, 20)])
+    assert assignment is not None
+    assert seconds == 8
+    assert "rejected" in caplog.text
@@ -0,0 +1,60 @@
+import os
+import threading
+
+import pytest
+
+from optimise.routing import router_pool
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    router_pool.reset_router_pool()
+    yield
+    router_pool.reset_router_pool()
+
+
+def test_routers_are_shared_per_engine_url_and_key():
+    osrm = router_pool.get_router("osrm", base_url="http://osrm:5000")
+    assert router_pool.get_router("osrm", base_url="http://osrm:5000") is osrm
+    assert router_pool.get_router("osrm", base_url="http://other:5000") is not osrm
+
+    ors = router_pool.get_router("ors", api_key="key-1")
+    assert router_pool.get_router("ors", api_key="key-2") is not ors
+    assert ors.client._session is osrm.client._session is router_pool.get_session()
+    adapter = router_pool.get_session().get_adapter("https://api.openrouteservice.org")
+    assert adapter._pool_maxsize == router_pool.ROUTER_POOL_MAXSIZE
+
+    with pytest.raises(ValueError):
+        router_pool.get_router("unknown")
+
+
+def test_concurrent_callers_get_one_router():
+    routers = []
+
+    def worker():
+        routers.append(router_pool.get_router("osrm", base_url="http://osrm:5000"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(router) for router in routers}) == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_starts_with_an_empty_pool():
+    parent_session = router_pool.get_session()
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        fresh = router_pool.get_session() is not parent_session
+        os.write(write_end, b"1" if fresh else b"0")
+        os._exit(0)
+    os.close(write_end)
+    answer = os.read(read_end, 1)
+    os.close(read_end)
+    os.waitpid(pid, 0)
+    assert answer == b"1"
+    assert router_pool.get_session() is parent_session
@@ -1,5 +1,7 @@
+from optimise.routing.adapter.instance_to_solver_input import instance_to_solver_input
 from optimise.routing.data_model import get_optimisation_instances
 from optimise.routing.preprocessing.preprocess_request import preprocess_request
+from optimise.routing.solver.ortools_runner import solve_instances
 
 
 def _skill_payload():
@@ -156,3 +158,46 @@ def test_instances_split_by_skill():
         instance.init_instance(instance.period_start)
         assert all(wo.skill == instance.name for wo in instance.work_orders)
         assert all(instance.name in worker.skills for worker in instance.workers)
+
+
+def test_single_model_instance_restricts_vehicles_by_skill():
+    payload = _skill_payload()
+    payload["multi_skill_mode"] = "single_model"
+    payload["teams"]["TeamB"]["workers"][0]["skills"] = ["A", "B"]
+    errors = []
+    request = preprocess_request(payload, errors)
+    instances = get_optimisation_instances(request)
+
+    assert errors == []
+    assert len(instances) == 1
+    instance = instances[0]
+    instance.init_instance(instance.period_start)
+    assert sorted(worker.id for worker in instance.workers) == ["W-A", "W-B"]
+    assert len(instance.work_orders) == 2
+
+    solver_input = instance_to_solver_input(instance)
+    allowed = {
+        instance.work_orders[node - instance.nb_depots].skill: vehicles
+        for node, vehicles in solver_input.allowed_vehicles_by_node.items()
+    }
+    worker_b = [worker.id for worker in instance.workers].index("W-B")
+    assert allowed == {"B": [worker_b]}
+
+
+def test_single_model_schedules_each_order_with_a_skilled_worker():
+    payload = _skill_payload()
+    payload["multi_skill_mode"] = "single_model"
+    payload["time_limit"] = 1
+    errors = []
+    request = preprocess_request(payload, errors)
+    results = solve_instances(get_optimisation_instances(request))
+
+    assert len(results) == 1
+    assert results[0]["dropped"] == []
+    for day in results[0]["details"].values():
+        for worker in day["by_worker"]:
+            skills = {"W-A": "A", "W-B": "B"}
+            for step in worker["tour_steps"]:
+                order_id = step["node"]["id"]
+                if order_id.startswith("WO-"):
+                    assert order_id == f"WO-{skills[worker['id']]}"
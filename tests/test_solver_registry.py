@@ -1,6 +1,10 @@
-from optimise.routing.solver import OrtoolsSolver, registry
+from optimise.routing.solver import ConstructionSolver, OrtoolsSolver, registry
 
 
 def test_solver_registry_has_ortools():
     solver_cls = registry.get("ortools")
     assert solver_cls is OrtoolsSolver
+
+
+def test_solver_registry_has_construction_backend():
+    assert registry.get("construction") is ConstructionSolver
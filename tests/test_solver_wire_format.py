@@ -0,0 +1,67 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from optimise.routing.input.solver_input import SolverInput
+from optimise.routing.input.wire import (
+    SharedArray,
+    pack_solver_input,
+    release_segments,
+    unpack_solver_input,
+)
+from optimise.routing.solver.ortools_runner import solve_packed
+from optimise.routing.solver.tours import tour_routes
+
+
+def _solver_input():
+    return SolverInput(
+        time_matrix=[[0, 10, 7], [10, 0, 4], [7, 4, 0]],
+        distance_matrix=[[0, 5, 3], [5, 0, 2], [3, 2, 0]],
+        time_windows=[(0, 100), (0, 100), (0, 100)],
+        service_durations=[0, 5, 5],
+        num_vehicles=1,
+        starts=[0],
+        ends=[0],
+        max_working_time=100,
+        allow_slack=10,
+        horizon=100,
+        penalties=[1000, 1000],
+        num_depots=1,
+        time_limit_seconds=1,
+        first_solution_strategy="PATH_CHEAPEST_ARC",
+        local_search_metaheuristic="GREEDY_DESCENT",
+        meta={"instance_name": "wire"},
+    )
+
+
+def test_pack_roundtrip_preserves_solver_input():
+    solver_input = _solver_input()
+    packed, segments = pack_solver_input(solver_input, shared_memory_min_cells=0)
+    assert segments == []
+    assert unpack_solver_input(pickle.loads(pickle.dumps(packed))) == solver_input
+
+
+def test_large_matrices_travel_through_shared_memory():
+    solver_input = _solver_input()
+    packed, segments = pack_solver_input(solver_input, shared_memory_min_cells=9)
+    try:
+        assert isinstance(packed.arrays["time_matrix"], SharedArray)
+        assert isinstance(packed.arrays["distance_matrix"], SharedArray)
+        assert unpack_solver_input(packed) == solver_input
+    finally:
+        release_segments(segments)
+
+
+def test_solve_packed_in_subprocess():
+    solver_input = _solver_input()
+    packed, segments = pack_solver_input(solver_input, shared_memory_min_cells=9)
+    try:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            packed_solution = executor.submit(solve_packed, packed).result()
+    finally:
+        release_segments(segments)
+
+    assert packed_solution is not None
+    assert sorted(packed_solution.routes[0]) == [1, 2]
+    # the tours carry the visit times, so the parent needs no model
+    assert tour_routes(packed_solution.tours) == packed_solution.routes
+    assert packed_solution.tours[0][0] == (0, 0)
@@ -0,0 +1,47 @@
+import random
+
+from diskcache import Cache
+
+from optimise.routing.core.strategy_selector import (
+    StrategySelector,
+    instance_context,
+    strategy_reward,
+)
+from optimise.routing.input.solver_input import SolverInput
+
+COMBINATIONS = {("PATH_CHEAPEST_ARC", "GREEDY_DESCENT"), ("SAVINGS", "GUIDED_LOCAL_SEARCH")}
+
+
+def test_instance_context_buckets_size_and_constraints():
+    solver_input = SolverInput(
+        time_matrix=[[0] * 20 for _ in range(20)],
+        distance_matrix=[[0] * 20 for _ in range(20)],
+        time_windows=[],
+        service_durations=[0] * 20,
+        num_vehicles=2,
+        starts=[0, 0],
+        ends=[0, 0],
+        breaks=[[(0, 100, False)], []],
+        distribute_load=True,
+    )
+    assert instance_context(solver_input) == "32|breaks+balanced"
+
+
+def test_strategy_reward_blends_quality_and_speed():
+    assert strategy_reward(None, 10, 1.0) is None
+    assert strategy_reward(100, 100, 0.0, 10) == 1.0
+    assert strategy_reward(200, 100, 10.0, 10) == 0.4
+
+
+def test_selector_converges_to_rewarded_strategy(tmp_path):
+    selector = StrategySelector(cache=Cache(str(tmp_path)))
+    rng = random.Random(7)
+    for _ in range(40):
+        choice = selector.choose("16|plain", COMBINATIONS, rng=rng)
+        good = choice.first_solution_strategy == "SAVINGS"
+        selector.record(choice, 0.9 if good else 0.1, objective_value=100, time_to_incumbent=1.0)
+
+    stats = selector.stats("16|plain")
+    assert stats["SAVINGS/GUIDED_LOCAL_SEARCH"]["runs"] > stats["PATH_CHEAPEST_ARC/GREEDY_DESCENT"]["runs"]
+    picks = [selector.choose("16|plain", COMBINATIONS, rng=rng).first_solution_strategy for _ in range(20)]
+    assert picks.count("SAVINGS") >= 15